@@ -5,8 +5,10 @@ import (
 	"fmt"
 	"io"
 	"os"
+	"os/signal"
 	"path/filepath"
 	"strings"
+	"syscall"
 	"time"
 
 	"emby-analytics/internal/config"
@@ -150,7 +152,7 @@ func main() {
 	}
 	logger.Info("Database migrations completed", "path", absPath)
 
-	// Open database connection for verification
+	// Open the shared database pool (used for verification, then by every handler)
 	sqlDB, err := db.Open(cfg.SQLitePath)
 	if err != nil {
 		logger.Error("Failed to open database", "error", err, "path", cfg.SQLitePath)
@@ -181,16 +183,20 @@ func main() {
 		logger.Warn("Enhanced playback columns not found, migration 0005 may be needed")
 	}
 
-	// Close and reopen connection
-	sqlDB.Close()
-	sqlDB, err = db.Open(cfg.SQLitePath)
-	if err != nil {
-		logger.Error("Failed to reopen database", "error", err, "path", cfg.SQLitePath)
-		os.Exit(1)
-	}
+	// The verification handle is the process-wide pool; reopening it would only
+	// discard warm connections and rerun every pragma.
 	defer func(dbh *sql.DB) { _ = dbh.Close() }(sqlDB)
 	logger.Info("Database connection established")
 
+	// Heavy dashboard reads get their own query-only pool
+	readDB, err := db.OpenReader(cfg.SQLitePath)
+	if err != nil {
+		logger.Warn("Read-only database pool unavailable, stats share the main pool", "error", err)
+		readDB = sqlDB
+	} else {
+		defer func(dbh *sql.DB) { _ = dbh.Close() }(readDB)
+	}
+
 	// Ensure legacy Emby rows carry file paths required for multi-server stats.
 	embyServerID, embyServerType := tasks.ResolveEmbyServer(cfg, multiMgr)
 	tasks.BackfillLegacyFilePaths(sqlDB, em, embyServerID, embyServerType)
@@ -210,6 +216,7 @@ func main() {
 
 	// ---- Session Processing (Hybrid State-Polling Approach) ----
 	sessionProcessor := tasks.NewSessionProcessor(sqlDB, multiMgr)
+	defer sessionProcessor.Close()
 	logger.Info("Session processor initialized")
 
 	pollInterval := time.Duration(cfg.NowPollSec) * time.Second
@@ -274,40 +281,50 @@ func main() {
 	app.Get("/health/frontend", health.FrontendHealth(sqlDB))
 	// Version Route
 	app.Get("/version", verhandler.GetVersion())
-	// Stats API Routes
+	// Stats API Routes (aggregate endpoints share a short response cache,
+	// dropped early whenever new watch intervals are recorded)
+	// Overview and user totals are served from counts refreshed in the
+	// background every minute, after each sync and when playback is recorded,
+	// so they skip the response cache.
+	stats.StartOverviewRefresher(readDB, stats.OverviewRefreshInterval)
+	tasks.SetWatchDataChangedHook(func() {
+		stats.InvalidateWatchStats()
+		stats.RefreshOverview()
+	})
+	tasks.SetLibraryChangedHook(stats.RefreshOverview)
 	app.Get("/stats/overview", stats.Overview(sqlDB))
-	app.Get("/stats/usage", stats.Usage(sqlDB, multiMgr))
-	app.Get("/stats/top/users", stats.TopUsers(sqlDB, multiMgr))
+	app.Get("/stats/usage", stats.Cached(stats.StatsCacheTTL, stats.Usage(readDB, multiMgr)))
+	app.Get("/stats/top/users", stats.Cached(stats.StatsCacheTTL, stats.TopUsers(readDB, multiMgr)))
 
-	app.Get("/stats/top/items", stats.TopItems(sqlDB, em))
+	app.Get("/stats/top/items", stats.Cached(stats.StatsCacheTTL, stats.TopItems(sqlDB, em)))
 	// Inject manager so TopItems can enrich non-Emby items
 	stats.SetMultiServerManager(multiMgr)
-	app.Get("/stats/qualities", stats.Qualities(sqlDB))
-	app.Get("/stats/codecs", stats.Codecs(sqlDB))
-	app.Get("/stats/active-users", stats.ActiveUsersLifetime(sqlDB))
+	app.Get("/stats/qualities", stats.Cached(stats.StatsCacheTTL, stats.Qualities(readDB)))
+	app.Get("/stats/codecs", stats.Cached(stats.StatsCacheTTL, stats.Codecs(readDB)))
+	app.Get("/stats/active-users", stats.Cached(stats.StatsCacheTTL, stats.ActiveUsersLifetime(readDB)))
 	app.Get("/stats/users/total", stats.UsersTotal(sqlDB))
 	app.Get("/stats/users/:id", stats.UserDetailHandler(sqlDB, em))
 	app.Get("/stats/users/:id/watch-time", stats.UserWatchTimeHandler(sqlDB))
 	app.Get("/stats/users/watch-time", stats.AllUsersWatchTimeHandler(sqlDB))
-	app.Get("/stats/play-methods", stats.PlayMethods(sqlDB, em))
+	app.Get("/stats/play-methods", stats.Cached(stats.StatsCacheTTL, stats.PlayMethods(sqlDB, em)))
 	app.Get("/stats/items/by-codec/:codec", stats.ItemsByCodec(sqlDB))
 	app.Get("/stats/items/by-genre/:genre", stats.ItemsByGenre(sqlDB))
 	app.Get("/stats/series/by-genre/:genre", stats.SeriesByGenre(sqlDB))
 	app.Get("/stats/items/by-quality/:quality", stats.ItemsByQuality(sqlDB))
-	app.Get("/stats/movies", stats.Movies(sqlDB))
-	app.Get("/stats/series", stats.Series(sqlDB))
-	app.Get("/stats/top/series", stats.TopSeries(sqlDB))
+	app.Get("/stats/movies", stats.Cached(stats.StatsCacheTTL, stats.Movies(sqlDB)))
+	app.Get("/stats/series", stats.Cached(stats.StatsCacheTTL, stats.Series(sqlDB)))
+	app.Get("/stats/top/series", stats.Cached(stats.StatsCacheTTL, stats.TopSeries(sqlDB)))
 
 	// Storage Analytics Routes
-	app.Get("/stats/storage/stale-content", stats.StaleContent(sqlDB))
-	app.Get("/stats/storage/roi", stats.ROIAnalysis(sqlDB))
-	app.Get("/stats/storage/duplicates", stats.Duplicates(sqlDB))
-	app.Get("/stats/storage/predictions", stats.StoragePredictions(sqlDB))
+	app.Get("/stats/storage/stale-content", stats.Cached(stats.StatsCacheTTL, stats.StaleContent(sqlDB)))
+	app.Get("/stats/storage/roi", stats.Cached(stats.StatsCacheTTL, stats.ROIAnalysis(sqlDB)))
+	app.Get("/stats/storage/duplicates", stats.Cached(stats.StatsCacheTTL, stats.Duplicates(sqlDB)))
+	app.Get("/stats/storage/predictions", stats.Cached(stats.StatsCacheTTL, stats.StoragePredictions(sqlDB)))
 
 	// Backward compatibility routes (hyphenated versions)
-	app.Get("/stats/top-users", stats.TopUsers(sqlDB, multiMgr))
-	app.Get("/stats/top-items", stats.TopItems(sqlDB, em))
-	app.Get("/stats/playback-methods", stats.PlayMethods(sqlDB, em))
+	app.Get("/stats/top-users", stats.Cached(stats.StatsCacheTTL, stats.TopUsers(readDB, multiMgr)))
+	app.Get("/stats/top-items", stats.Cached(stats.StatsCacheTTL, stats.TopItems(sqlDB, em)))
+	app.Get("/stats/playback-methods", stats.Cached(stats.StatsCacheTTL, stats.PlayMethods(sqlDB, em)))
 
 	// Configuration Routes
 	app.Get("/config", configHandler.GetConfig(cfg))
@@ -315,6 +332,8 @@ func main() {
 	// Item & Image Routes
 	// Multi-server-aware items lookup (falls back to legacy where needed)
 	app.Get("/items/by-ids", items.ByIDsMS(sqlDB, multiMgr))
+	images.ConfigureDiskCache(cfg.ImgCacheDir, cfg.ImgCacheMaxMB)
+	images.ConfigureMemoryCache(cfg.ImgMemCacheMB)
 	imgOpts := images.NewOpts(cfg)
 	app.Get("/img/primary/:id", images.Primary(imgOpts))
 	app.Get("/img/backdrop/:id", images.Backdrop(imgOpts))
@@ -541,11 +560,25 @@ func main() {
 	if p := os.Getenv("PORT"); p != "" {
 		addr = ":" + p
 	}
+	// Shut down cleanly on SIGINT/SIGTERM so deferred cleanup runs
+	go func() {
+		sig := make(chan os.Signal, 1)
+		signal.Notify(sig, os.Interrupt, syscall.SIGTERM)
+		<-sig
+		logger.Info("Shutting down HTTP server")
+		_ = app.Shutdown()
+	}()
+
 	logger.Info("Starting HTTP server", "address", addr)
 	if err := app.Listen(addr); err != nil {
 		logger.Error("Failed to start HTTP server", "error", err, "address", addr)
 		os.Exit(1)
 	}
+
+	cleanupScheduler.Stop()
+	if err := db.Optimize(sqlDB); err != nil {
+		logger.Warn("PRAGMA optimize on shutdown failed", "error", err)
+	}
 }
 
 func startsWithAny(s string, prefixes ...string) bool {
@@ -592,44 +625,22 @@ func ensureAuthTables(db *sql.DB, logger logging.Logger) {
 }
 
 func ensureGenresColumn(db *sql.DB, logger logging.Logger) {
-	// Check if column exists
-	rows, err := db.Query(`PRAGMA table_info(library_item);`)
-	if err != nil {
-		logger.Warn("Failed to inspect library_item schema", "error", err)
-		return
-	}
-	defer rows.Close()
-	has := false
-	for rows.Next() {
-		var cid int
-		var name, ctype string
-		var notnull int
-		var dflt interface{}
-		var pk int
-		_ = rows.Scan(&cid, &name, &ctype, &notnull, &dflt, &pk)
-		if strings.EqualFold(name, "genres") {
-			has = true
-			break
-		}
-	}
-	if !has {
-		if _, err := db.Exec(`ALTER TABLE library_item ADD COLUMN genres TEXT;`); err != nil {
-			logger.Warn("Failed to add genres column (may already exist)", "error", err)
-		} else {
-			logger.Info("Auth: ensured library_item.genres column")
+	// Try the ALTER directly; SQLite reports "duplicate column name" when it
+	// already exists, which saves reading table_info on every startup.
+	if _, err := db.Exec(`ALTER TABLE library_item ADD COLUMN genres TEXT;`); err != nil {
+		if !strings.Contains(strings.ToLower(err.Error()), "duplicate column") {
+			logger.Warn("Failed to add genres column", "error", err)
 		}
+		return
 	}
+	logger.Info("Auth: ensured library_item.genres column")
 }
 
 func bumpLegacyMigrationVersion(db *sql.DB, logger logging.Logger) {
 	// Determine if app_user and app_session exist
 	var cnt int
-	_ = db.QueryRow(`SELECT COUNT(*) FROM sqlite_master WHERE type='table' AND name='app_user'`).Scan(&cnt)
-	if cnt == 0 {
-		return
-	}
-	_ = db.QueryRow(`SELECT COUNT(*) FROM sqlite_master WHERE type='table' AND name='app_session'`).Scan(&cnt)
-	if cnt == 0 {
+	_ = db.QueryRow(`SELECT COUNT(*) FROM sqlite_master WHERE type='table' AND name IN ('app_user', 'app_session')`).Scan(&cnt)
+	if cnt < 2 {
 		return
 	}
 	// Check migration version
@@ -47,6 +47,9 @@ type Config struct {
 	ImgQuality          int // e.g. 90
 	ImgPrimaryMaxWidth  int // e.g. 300
 	ImgBackdropMaxWidth int // e.g. 1280
+	ImgCacheDir         string
+	ImgCacheMaxMB       int // 0 disables the on-disk image cache
+	ImgMemCacheMB       int // in-memory LRU in front of the disk cache; 0 disables
 
 	// Admin refresh
 	RefreshChunkSize int // e.g. 200
@@ -101,6 +104,9 @@ func Load() Config {
 		ImgQuality:             envInt("IMG_QUALITY", 90),
 		ImgPrimaryMaxWidth:     envInt("IMG_PRIMARY_MAX_WIDTH", 300),
 		ImgBackdropMaxWidth:    envInt("IMG_BACKDROP_MAX_WIDTH", 1280),
+		ImgCacheDir:            env("IMG_CACHE_DIR", filepath.Join(filepath.Dir(dbPath), "image_cache")),
+		ImgCacheMaxMB:          envInt("IMG_CACHE_MAX_MB", 500),
+		ImgMemCacheMB:          envInt("IMG_MEM_CACHE_MB", 64),
 		RefreshChunkSize:       envInt("REFRESH_CHUNK_SIZE", 200),
 		AdminToken:             env("ADMIN_TOKEN", ""),
 		WebhookSecret:          env("WEBHOOK_SECRET", ""),
@@ -4,7 +4,6 @@ import (
 	"database/sql"
 	"fmt"
 	"strings"
-	"time"
 
 	_ "modernc.org/sqlite"
 )
@@ -13,10 +12,47 @@ const (
 	defaultBusyTimeoutMS = 45000
 )
 
+// connPragmas are applied by the driver to every pooled connection, so all of
+// them (not just the first one handed out) run with the same settings.
+var connPragmas = []string{
+	"journal_mode(WAL)",
+	"foreign_keys(ON)",
+	fmt.Sprintf("busy_timeout(%d)", defaultBusyTimeoutMS),
+	"synchronous(NORMAL)",
+	"temp_store(MEMORY)",
+	"cache_size(-64000)",
+	"mmap_size(268435456)",
+	"journal_size_limit(67108864)",
+	"wal_autocheckpoint(1000)",
+}
+
+// readPragmas configure the read-only pool: no journal changes, and
+// query_only so a stray write fails instead of contending with the writer.
+var readPragmas = []string{
+	"foreign_keys(ON)",
+	fmt.Sprintf("busy_timeout(%d)", defaultBusyTimeoutMS),
+	"temp_store(MEMORY)",
+	"cache_size(-64000)",
+	"mmap_size(268435456)",
+	"query_only(1)",
+}
+
+func pragmaQuery(pragmas []string) string {
+	parts := make([]string, len(pragmas))
+	for i, p := range pragmas {
+		parts[i] = "_pragma=" + p
+	}
+	return strings.Join(parts, "&")
+}
+
 func buildDSN(path string) string {
+	return buildDSNWith(path, connPragmas)
+}
+
+func buildDSNWith(path string, pragmas []string) string {
 	// Respect explicit DSNs (file:..., :memory:, etc.) while ensuring pragma defaults.
 	if path == "" {
-		return fmt.Sprintf("file:emby.db?_pragma=journal_mode(WAL)&_pragma=foreign_keys(ON)&_pragma=busy_timeout(%d)&_pragma=synchronous(NORMAL)", defaultBusyTimeoutMS)
+		return "file:emby.db?" + pragmaQuery(pragmas)
 	}
 
 	base := path
@@ -32,12 +68,17 @@ func buildDSN(path string) string {
 		if strings.Contains(base, "?") {
 			sep = "&"
 		}
-		base = fmt.Sprintf("%s%s_pragma=journal_mode(WAL)&_pragma=foreign_keys(ON)&_pragma=busy_timeout(%d)&_pragma=synchronous(NORMAL)", base, sep, defaultBusyTimeoutMS)
+		base = base + sep + pragmaQuery(pragmas)
 	}
 
 	return base
 }
 
+// mainPoolSize is the main pool's connection limit: four shared connections
+// plus the one the session processor holds for its tick writes for the whole
+// process lifetime.
+const mainPoolSize = 4 + 1
+
 var DB *sql.DB
 
 func Open(path string) (*sql.DB, error) {
@@ -50,14 +91,60 @@ func Open(path string) (*sql.DB, error) {
 	// - WAL enables readers during writes
 	// - busy_timeout retries briefly on lock contention instead of failing immediately
 	// - synchronous=NORMAL is a good balance for WAL
-	_, _ = db.Exec(`PRAGMA journal_mode=WAL; PRAGMA foreign_keys=ON; PRAGMA busy_timeout=45000; PRAGMA synchronous=NORMAL;`)
+	// - temp_store/cache_size/mmap_size keep sorts and the stats window queries in memory
+	// - journal_size_limit caps what a checkpointed WAL file is left at on disk
+	// The DSN already applies these per connection; this covers explicit DSNs that
+	// carry their own _pragma list.
+	_, _ = db.Exec(`PRAGMA journal_mode=WAL; PRAGMA foreign_keys=ON; PRAGMA busy_timeout=45000; PRAGMA synchronous=NORMAL; PRAGMA temp_store=MEMORY; PRAGMA cache_size=-64000; PRAGMA mmap_size=268435456; PRAGMA journal_size_limit=67108864; PRAGMA wal_autocheckpoint=1000;`)
 	// Allow a small pool so we can overlap short-lived queries without starving writes.
 	// With WAL + busy timeout the driver will wait for the writer to finish instead of
 	// returning SQLITE_BUSY immediately.
-	db.SetMaxOpenConns(4)
-	db.SetMaxIdleConns(4)
-	db.SetConnMaxIdleTime(5 * time.Minute)
-	db.SetConnMaxLifetime(time.Hour)
+	// Pooled connections are never recycled: reopening one re-runs every pragma
+	// and throws away its page cache and mmap, and a local file has no server
+	// side that would want connections rotated.
+	db.SetMaxOpenConns(mainPoolSize)
+	db.SetMaxIdleConns(mainPoolSize)
+	db.SetConnMaxIdleTime(0)
+	db.SetConnMaxLifetime(0)
 	DB = db
 	return db, nil
 }
+
+// readPoolSize is how many connections serve the heavy read-only stats
+// endpoints, separate from the main pool that background writers use.
+const readPoolSize = 4
+
+// OpenReader opens a query-only pool on the same database file, so dashboard
+// reads run alongside the session processor and sync jobs instead of waiting
+// for a slot in the main pool. WAL lets these readers proceed during writes.
+func OpenReader(path string) (*sql.DB, error) {
+	if path == ":memory:" {
+		return nil, fmt.Errorf("an in-memory database cannot be shared with a reader pool")
+	}
+	db, err := sql.Open("sqlite", readerDSN(path))
+	if err != nil {
+		return nil, err
+	}
+	db.SetMaxOpenConns(readPoolSize)
+	db.SetMaxIdleConns(readPoolSize)
+	if err := db.Ping(); err != nil {
+		_ = db.Close()
+		return nil, err
+	}
+	return db, nil
+}
+
+// readerDSN builds the reader pool DSN. An explicit DSN that carries its own
+// _pragma list does not get readPragmas, so query_only(1) is appended last in
+// any case; the driver applies pragmas in order, so it cannot be overridden.
+func readerDSN(path string) string {
+	dsn := buildDSNWith(path, readPragmas)
+	if strings.HasSuffix(dsn, "_pragma=query_only(1)") {
+		return dsn
+	}
+	sep := "?"
+	if strings.Contains(dsn, "?") {
+		sep = "&"
+	}
+	return dsn + sep + "_pragma=query_only(1)"
+}
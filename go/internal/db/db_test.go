@@ -0,0 +1,30 @@
+package db
+
+import (
+	"strings"
+	"testing"
+)
+
+func TestReaderDSNIsQueryOnly(t *testing.T) {
+	tests := []struct {
+		name string
+		path string
+	}{
+		{"default path", ""},
+		{"plain file", "/data/emby.db"},
+		{"file DSN without pragmas", "file:/data/emby.db?cache=shared"},
+		{"explicit pragma list", "file:/data/emby.db?_pragma=busy_timeout(1000)"},
+		{"explicit pragma list that disables query_only", "file:/data/emby.db?_pragma=query_only(0)&_pragma=foreign_keys(ON)"},
+	}
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			dsn := readerDSN(tt.path)
+			if !strings.HasSuffix(dsn, "_pragma=query_only(1)") {
+				t.Errorf("readerDSN(%q) = %q, want query_only(1) applied last", tt.path, dsn)
+			}
+			if strings.Count(dsn, "?") != 1 {
+				t.Errorf("readerDSN(%q) = %q, want exactly one '?'", tt.path, dsn)
+			}
+		})
+	}
+}
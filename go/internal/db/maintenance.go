@@ -0,0 +1,20 @@
+package db
+
+import "database/sql"
+
+// Optimize lets SQLite refresh planner statistics for tables whose shape has
+// changed since the last run. It is cheap when nothing needs doing, so it is
+// safe to call on a timer and at shutdown.
+func Optimize(db *sql.DB) error {
+	_, err := db.Exec(`PRAGMA optimize`)
+	return err
+}
+
+// CheckpointWAL copies the WAL back into the main database and truncates the
+// -wal file. Autocheckpoints never shrink the file, so without this it keeps
+// the size of the largest burst of writes the session processor ever made.
+// It returns the busy flag and the WAL/checkpointed page counts.
+func CheckpointWAL(db *sql.DB) (busy, logPages, checkpointed int, err error) {
+	err = db.QueryRow(`PRAGMA wal_checkpoint(TRUNCATE)`).Scan(&busy, &logPages, &checkpointed)
+	return busy, logPages, checkpointed, err
+}
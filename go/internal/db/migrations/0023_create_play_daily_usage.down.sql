@@ -0,0 +1,4 @@
+DROP TRIGGER IF EXISTS play_intervals_daily_usage_del;
+DROP TRIGGER IF EXISTS play_intervals_daily_usage_upd;
+DROP TRIGGER IF EXISTS play_intervals_daily_usage_ins;
+DROP TABLE IF EXISTS play_daily_usage;
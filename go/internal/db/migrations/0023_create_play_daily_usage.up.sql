@@ -0,0 +1,84 @@
+-- Daily watch-time rollup per user and item, keyed on the interval's start day
+-- (UTC) so /stats/usage can SUM small pre-aggregated rows instead of scanning
+-- every play_intervals row in the window.
+CREATE TABLE IF NOT EXISTS play_daily_usage (
+  day TEXT NOT NULL,            -- YYYY-MM-DD (UTC) of play_intervals.start_ts
+  user_id TEXT NOT NULL,
+  item_id TEXT NOT NULL,
+  seconds INTEGER NOT NULL DEFAULT 0,
+  PRIMARY KEY (day, user_id, item_id)
+);
+
+-- Backfill from existing intervals
+INSERT INTO play_daily_usage (day, user_id, item_id, seconds)
+SELECT
+  strftime('%Y-%m-%d', start_ts, 'unixepoch'),
+  user_id,
+  item_id,
+  SUM(MAX(0, MIN(end_ts - start_ts,
+    CASE WHEN duration_seconds IS NULL OR duration_seconds <= 0
+         THEN end_ts - start_ts
+         ELSE duration_seconds
+    END)))
+FROM play_intervals
+GROUP BY 1, 2, 3;
+
+-- Keep the rollup in step with every writer of play_intervals (session
+-- processor, intervalizer, cleanup/merge jobs, cascading deletes).
+CREATE TRIGGER IF NOT EXISTS play_intervals_daily_usage_ins
+AFTER INSERT ON play_intervals
+BEGIN
+  INSERT INTO play_daily_usage (day, user_id, item_id, seconds)
+  VALUES (
+    strftime('%Y-%m-%d', NEW.start_ts, 'unixepoch'),
+    NEW.user_id,
+    NEW.item_id,
+    MAX(0, MIN(NEW.end_ts - NEW.start_ts,
+      CASE WHEN NEW.duration_seconds IS NULL OR NEW.duration_seconds <= 0
+           THEN NEW.end_ts - NEW.start_ts
+           ELSE NEW.duration_seconds
+      END))
+  )
+  ON CONFLICT(day, user_id, item_id) DO UPDATE SET seconds = seconds + excluded.seconds;
+END;
+
+CREATE TRIGGER IF NOT EXISTS play_intervals_daily_usage_upd
+AFTER UPDATE OF start_ts, end_ts, duration_seconds, user_id, item_id ON play_intervals
+BEGIN
+  UPDATE play_daily_usage
+  SET seconds = seconds - MAX(0, MIN(OLD.end_ts - OLD.start_ts,
+      CASE WHEN OLD.duration_seconds IS NULL OR OLD.duration_seconds <= 0
+           THEN OLD.end_ts - OLD.start_ts
+           ELSE OLD.duration_seconds
+      END))
+  WHERE day = strftime('%Y-%m-%d', OLD.start_ts, 'unixepoch')
+    AND user_id = OLD.user_id
+    AND item_id = OLD.item_id;
+
+  INSERT INTO play_daily_usage (day, user_id, item_id, seconds)
+  VALUES (
+    strftime('%Y-%m-%d', NEW.start_ts, 'unixepoch'),
+    NEW.user_id,
+    NEW.item_id,
+    MAX(0, MIN(NEW.end_ts - NEW.start_ts,
+      CASE WHEN NEW.duration_seconds IS NULL OR NEW.duration_seconds <= 0
+           THEN NEW.end_ts - NEW.start_ts
+           ELSE NEW.duration_seconds
+      END))
+  )
+  ON CONFLICT(day, user_id, item_id) DO UPDATE SET seconds = seconds + excluded.seconds;
+END;
+
+CREATE TRIGGER IF NOT EXISTS play_intervals_daily_usage_del
+AFTER DELETE ON play_intervals
+BEGIN
+  UPDATE play_daily_usage
+  SET seconds = seconds - MAX(0, MIN(OLD.end_ts - OLD.start_ts,
+      CASE WHEN OLD.duration_seconds IS NULL OR OLD.duration_seconds <= 0
+           THEN OLD.end_ts - OLD.start_ts
+           ELSE OLD.duration_seconds
+      END))
+  WHERE day = strftime('%Y-%m-%d', OLD.start_ts, 'unixepoch')
+    AND user_id = OLD.user_id
+    AND item_id = OLD.item_id;
+END;
@@ -0,0 +1,3 @@
+DROP TRIGGER IF EXISTS play_daily_usage_user_upd;
+DROP TRIGGER IF EXISTS play_daily_usage_user_ins;
+DROP TABLE IF EXISTS play_daily_user_usage;
@@ -0,0 +1,40 @@
+-- Per-day, per-user totals rolled up from play_daily_usage so /stats/usage
+-- reads at most days * users rows without touching library_item.
+-- Live TV is excluded when seconds are added, mirroring the stats filters.
+CREATE TABLE IF NOT EXISTS play_daily_user_usage (
+  day TEXT NOT NULL,            -- YYYY-MM-DD (UTC)
+  user_id TEXT NOT NULL,
+  seconds INTEGER NOT NULL DEFAULT 0,
+  PRIMARY KEY (day, user_id)
+) WITHOUT ROWID;
+
+INSERT INTO play_daily_user_usage (day, user_id, seconds)
+SELECT d.day, d.user_id, SUM(d.seconds)
+FROM play_daily_usage d
+LEFT JOIN library_item li ON li.id = d.item_id
+WHERE COALESCE(li.media_type, 'Unknown') NOT IN ('TvChannel', 'LiveTv', 'Channel', 'TvProgram')
+GROUP BY d.day, d.user_id;
+
+CREATE TRIGGER IF NOT EXISTS play_daily_usage_user_ins
+AFTER INSERT ON play_daily_usage
+WHEN NOT EXISTS (
+  SELECT 1 FROM library_item li
+  WHERE li.id = NEW.item_id AND li.media_type IN ('TvChannel', 'LiveTv', 'Channel', 'TvProgram')
+)
+BEGIN
+  INSERT INTO play_daily_user_usage (day, user_id, seconds)
+  VALUES (NEW.day, NEW.user_id, NEW.seconds)
+  ON CONFLICT(day, user_id) DO UPDATE SET seconds = seconds + excluded.seconds;
+END;
+
+CREATE TRIGGER IF NOT EXISTS play_daily_usage_user_upd
+AFTER UPDATE OF seconds ON play_daily_usage
+WHEN NOT EXISTS (
+  SELECT 1 FROM library_item li
+  WHERE li.id = NEW.item_id AND li.media_type IN ('TvChannel', 'LiveTv', 'Channel', 'TvProgram')
+)
+BEGIN
+  INSERT INTO play_daily_user_usage (day, user_id, seconds)
+  VALUES (NEW.day, NEW.user_id, NEW.seconds - OLD.seconds)
+  ON CONFLICT(day, user_id) DO UPDATE SET seconds = seconds + excluded.seconds;
+END;
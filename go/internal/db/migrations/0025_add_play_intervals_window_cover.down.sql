@@ -0,0 +1,3 @@
+CREATE INDEX IF NOT EXISTS idx_play_intervals_item_end ON play_intervals(item_id, end_ts DESC);
+DROP INDEX IF EXISTS idx_play_intervals_user_window_cover;
+DROP INDEX IF EXISTS idx_play_intervals_item_window_cover;
@@ -0,0 +1,13 @@
+-- Covering indexes for the windowed top items / top users queries. Both group
+-- by their leading column and filter on end_ts, and every column they read is
+-- in the index, so the scan runs in group order without touching the table.
+
+-- Supersedes idx_play_intervals_item_end (same leading columns)
+CREATE INDEX IF NOT EXISTS idx_play_intervals_item_window_cover
+    ON play_intervals(item_id, end_ts, start_ts, duration_seconds, user_id);
+DROP INDEX IF EXISTS idx_play_intervals_item_end;
+
+CREATE INDEX IF NOT EXISTS idx_play_intervals_user_window_cover
+    ON play_intervals(user_id, end_ts, start_ts, duration_seconds, item_id);
+
+ANALYZE play_intervals;
@@ -0,0 +1,3 @@
+CREATE INDEX IF NOT EXISTS idx_play_sessions_user ON play_sessions(user_id);
+DROP INDEX IF EXISTS idx_play_sessions_user_time;
+DROP INDEX IF EXISTS idx_play_sessions_started;
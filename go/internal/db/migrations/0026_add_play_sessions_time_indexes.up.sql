@@ -0,0 +1,10 @@
+-- play_sessions windows (playmethods, debug/enrich jobs, fallbacks) filter on
+-- started_at alone; without an index each request scans the whole table.
+CREATE INDEX IF NOT EXISTS idx_play_sessions_started ON play_sessions(started_at);
+
+-- Per-user detail queries filter on user_id plus a started_at window and order
+-- by started_at. Supersedes idx_play_sessions_user (same leading column).
+CREATE INDEX IF NOT EXISTS idx_play_sessions_user_time ON play_sessions(user_id, started_at);
+DROP INDEX IF EXISTS idx_play_sessions_user;
+
+ANALYZE play_sessions;
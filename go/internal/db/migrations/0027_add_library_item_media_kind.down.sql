@@ -0,0 +1,2 @@
+DROP INDEX IF EXISTS idx_library_item_media_kind;
+ALTER TABLE library_item DROP COLUMN media_kind;
@@ -0,0 +1,16 @@
+-- media_kind is the UI bucket (Movie / Episode / Unknown) that stats queries
+-- used to derive per row with a TRIM/LOWER CASE over media_type and series_id.
+-- As an indexed generated column the movie/episode filters become index
+-- lookups instead of evaluating the expression on every library row.
+ALTER TABLE library_item ADD COLUMN media_kind TEXT GENERATED ALWAYS AS (
+  CASE
+    WHEN TRIM(COALESCE(media_type, '')) = '' AND TRIM(COALESCE(series_id, '')) <> '' THEN 'Episode'
+    WHEN LOWER(TRIM(media_type)) IN ('episode','season','series') THEN 'Episode'
+    WHEN LOWER(TRIM(media_type)) = 'movie' THEN 'Movie'
+    ELSE 'Unknown'
+  END
+) VIRTUAL;
+
+CREATE INDEX IF NOT EXISTS idx_library_item_media_kind ON library_item(media_kind);
+
+ANALYZE library_item;
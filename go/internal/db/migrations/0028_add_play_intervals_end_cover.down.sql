@@ -0,0 +1 @@
+DROP INDEX IF EXISTS idx_play_intervals_end_cover;
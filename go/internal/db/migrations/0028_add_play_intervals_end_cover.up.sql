@@ -0,0 +1,8 @@
+-- Windowed watch-time queries read intervals that started before the window
+-- but still overlap it. Those rows are found by end_ts alone (an interval can
+-- start arbitrarily long before the window), so index end_ts first and cover
+-- the columns the clipping reads.
+CREATE INDEX IF NOT EXISTS idx_play_intervals_end_cover
+    ON play_intervals(end_ts, start_ts, duration_seconds, user_id, item_id);
+
+ANALYZE play_intervals;
@@ -0,0 +1,4 @@
+DROP TRIGGER IF EXISTS library_item_user_usage_del;
+DROP TRIGGER IF EXISTS library_item_user_usage_upd;
+DROP TRIGGER IF EXISTS library_item_user_usage_ins;
+DROP INDEX IF EXISTS idx_play_daily_usage_item;
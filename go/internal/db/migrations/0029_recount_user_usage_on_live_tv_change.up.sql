@@ -0,0 +1,64 @@
+-- play_daily_user_usage leaves Live TV out based on library_item.media_type
+-- at the time an interval is written. When an item is added, reclassified or
+-- removed later and its Live TV status flips, re-aggregate every (day, user)
+-- it was watched on so /stats/usage matches the raw intervals again.
+CREATE INDEX IF NOT EXISTS idx_play_daily_usage_item ON play_daily_usage(item_id);
+
+CREATE TRIGGER IF NOT EXISTS library_item_user_usage_ins
+AFTER INSERT ON library_item
+WHEN NEW.media_type IN ('TvChannel', 'LiveTv', 'Channel', 'TvProgram')
+BEGIN
+  DELETE FROM play_daily_user_usage
+  WHERE (day, user_id) IN (SELECT day, user_id FROM play_daily_usage WHERE item_id = NEW.id);
+
+  INSERT INTO play_daily_user_usage (day, user_id, seconds)
+  SELECT d.day, d.user_id, SUM(d.seconds)
+  FROM play_daily_usage d
+  LEFT JOIN library_item li ON li.id = d.item_id
+  WHERE (d.day, d.user_id) IN (SELECT day, user_id FROM play_daily_usage WHERE item_id = NEW.id)
+    AND COALESCE(li.media_type, 'Unknown') NOT IN ('TvChannel', 'LiveTv', 'Channel', 'TvProgram')
+  GROUP BY d.day, d.user_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS library_item_user_usage_upd
+AFTER UPDATE OF media_type ON library_item
+WHEN (COALESCE(OLD.media_type, '') IN ('TvChannel', 'LiveTv', 'Channel', 'TvProgram'))
+  <> (COALESCE(NEW.media_type, '') IN ('TvChannel', 'LiveTv', 'Channel', 'TvProgram'))
+BEGIN
+  DELETE FROM play_daily_user_usage
+  WHERE (day, user_id) IN (SELECT day, user_id FROM play_daily_usage WHERE item_id = NEW.id);
+
+  INSERT INTO play_daily_user_usage (day, user_id, seconds)
+  SELECT d.day, d.user_id, SUM(d.seconds)
+  FROM play_daily_usage d
+  LEFT JOIN library_item li ON li.id = d.item_id
+  WHERE (d.day, d.user_id) IN (SELECT day, user_id FROM play_daily_usage WHERE item_id = NEW.id)
+    AND COALESCE(li.media_type, 'Unknown') NOT IN ('TvChannel', 'LiveTv', 'Channel', 'TvProgram')
+  GROUP BY d.day, d.user_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS library_item_user_usage_del
+AFTER DELETE ON library_item
+WHEN OLD.media_type IN ('TvChannel', 'LiveTv', 'Channel', 'TvProgram')
+BEGIN
+  DELETE FROM play_daily_user_usage
+  WHERE (day, user_id) IN (SELECT day, user_id FROM play_daily_usage WHERE item_id = OLD.id);
+
+  INSERT INTO play_daily_user_usage (day, user_id, seconds)
+  SELECT d.day, d.user_id, SUM(d.seconds)
+  FROM play_daily_usage d
+  LEFT JOIN library_item li ON li.id = d.item_id
+  WHERE (d.day, d.user_id) IN (SELECT day, user_id FROM play_daily_usage WHERE item_id = OLD.id)
+    AND COALESCE(li.media_type, 'Unknown') NOT IN ('TvChannel', 'LiveTv', 'Channel', 'TvProgram')
+  GROUP BY d.day, d.user_id;
+END;
+
+-- Bring existing rows in line with the current classification.
+DELETE FROM play_daily_user_usage;
+
+INSERT INTO play_daily_user_usage (day, user_id, seconds)
+SELECT d.day, d.user_id, SUM(d.seconds)
+FROM play_daily_usage d
+LEFT JOIN library_item li ON li.id = d.item_id
+WHERE COALESCE(li.media_type, 'Unknown') NOT IN ('TvChannel', 'LiveTv', 'Channel', 'TvProgram')
+GROUP BY d.day, d.user_id;
@@ -1,6 +1,7 @@
 package db
 
 import (
+	"context"
 	"database/sql"
 	"errors"
 	"strings"
@@ -15,6 +16,23 @@ const (
 	initialRetryBackoff = 25 * time.Millisecond
 )
 
+// Execer is satisfied by *sql.DB, *sql.Conn and *sql.Tx so callers can pin
+// writes to a dedicated connection or transaction.
+type Execer interface {
+	ExecContext(ctx context.Context, query string, args ...any) (sql.Result, error)
+}
+
+// QueryRower is the read-side counterpart of Execer.
+type QueryRower interface {
+	QueryRowContext(ctx context.Context, query string, args ...any) *sql.Row
+}
+
+// Querier combines Execer and QueryRower.
+type Querier interface {
+	Execer
+	QueryRower
+}
+
 // IsBusyError returns true when the error represents a transient SQLite busy/locked state.
 func IsBusyError(err error) bool {
 	if err == nil {
@@ -32,11 +50,11 @@ func IsBusyError(err error) bool {
 }
 
 // ExecWithRetry executes the statement, retrying a few times if SQLite reports a busy/locked state.
-func ExecWithRetry(db *sql.DB, query string, args ...any) (sql.Result, error) {
+func ExecWithRetry(db Execer, query string, args ...any) (sql.Result, error) {
 	var lastErr error
 	backoff := initialRetryBackoff
 	for attempt := 0; attempt < maxRetryAttempts; attempt++ {
-		res, err := db.Exec(query, args...)
+		res, err := db.ExecContext(context.Background(), query, args...)
 		if err == nil {
 			return res, nil
 		}
@@ -53,11 +71,11 @@ func ExecWithRetry(db *sql.DB, query string, args ...any) (sql.Result, error) {
 }
 
 // QueryRowWithRetry executes the query and invokes scan with retry semantics for busy errors.
-func QueryRowWithRetry(db *sql.DB, query string, args []any, scan func(*sql.Row) error) error {
+func QueryRowWithRetry(db QueryRower, query string, args []any, scan func(*sql.Row) error) error {
 	var lastErr error
 	backoff := initialRetryBackoff
 	for attempt := 0; attempt < maxRetryAttempts; attempt++ {
-		row := db.QueryRow(query, args...)
+		row := db.QueryRowContext(context.Background(), query, args...)
 		err := scan(row)
 		if err == nil || errors.Is(err, sql.ErrNoRows) {
 			return err
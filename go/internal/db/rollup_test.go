@@ -0,0 +1,181 @@
+package db
+
+import (
+	"database/sql"
+	"path/filepath"
+	"reflect"
+	"testing"
+)
+
+func openMigratedDB(t *testing.T) *sql.DB {
+	t.Helper()
+	path := filepath.Join(t.TempDir(), "test.db")
+	if err := MigrateUp("sqlite://file:" + filepath.ToSlash(path) + "?mode=rwc"); err != nil {
+		t.Fatalf("migrate: %v", err)
+	}
+	db, err := Open(path)
+	if err != nil {
+		t.Fatalf("open: %v", err)
+	}
+	t.Cleanup(func() { _ = db.Close() })
+	if _, err := db.Exec(`INSERT INTO play_sessions (id, user_id, session_id, item_id, started_at) VALUES (1, 'u1', 's1', 'i1', 0)`); err != nil {
+		t.Fatalf("seed session: %v", err)
+	}
+	return db
+}
+
+func execAll(t *testing.T, db *sql.DB, stmts []string) {
+	t.Helper()
+	for _, s := range stmts {
+		if _, err := db.Exec(s); err != nil {
+			t.Fatalf("exec %q: %v", s, err)
+		}
+	}
+}
+
+// intervalSeconds is the per-interval watch time the rollup triggers add up.
+const intervalSeconds = `MAX(0, MIN(end_ts - start_ts,
+    CASE WHEN duration_seconds IS NULL OR duration_seconds <= 0
+         THEN end_ts - start_ts ELSE duration_seconds END))`
+
+// sumsByKey runs a query returning (key, seconds) rows and drops zero totals,
+// which the rollups may keep as empty rows.
+func sumsByKey(t *testing.T, db *sql.DB, query string) map[string]int64 {
+	t.Helper()
+	rows, err := db.Query(query)
+	if err != nil {
+		t.Fatalf("query %q: %v", query, err)
+	}
+	defer rows.Close()
+	out := make(map[string]int64)
+	for rows.Next() {
+		var key string
+		var secs int64
+		if err := rows.Scan(&key, &secs); err != nil {
+			t.Fatalf("scan: %v", err)
+		}
+		if secs != 0 {
+			out[key] = secs
+		}
+	}
+	if err := rows.Err(); err != nil {
+		t.Fatalf("rows: %v", err)
+	}
+	return out
+}
+
+func TestPlayDailyUsageMatchesIntervals(t *testing.T) {
+	insert := `INSERT INTO play_intervals (id, session_fk, item_id, user_id, start_ts, end_ts, duration_seconds) VALUES `
+	tests := []struct {
+		name  string
+		stmts []string
+	}{
+		{"insert", []string{
+			insert + `(1, 1, 'i1', 'u1', 1700010000, 1700013600, 3600)`,
+			insert + `(2, 1, 'i1', 'u1', 1700020000, 1700020600, 600)`,
+			insert + `(3, 1, 'i2', 'u2', 1700100000, 1700101000, 1000)`,
+		}},
+		{"duration capped by span", []string{
+			insert + `(1, 1, 'i1', 'u1', 1700010000, 1700010100, 5000)`,
+			insert + `(2, 1, 'i1', 'u1', 1700010000, 1700010300, 0)`,
+		}},
+		{"update extends interval", []string{
+			insert + `(1, 1, 'i1', 'u1', 1700010000, 1700010600, 600)`,
+			`UPDATE play_intervals SET end_ts = 1700012000, duration_seconds = 2000 WHERE id = 1`,
+		}},
+		{"update moves interval to another day", []string{
+			insert + `(1, 1, 'i1', 'u1', 1700010000, 1700010600, 600)`,
+			`UPDATE play_intervals SET start_ts = start_ts + 86400, end_ts = end_ts + 86400 WHERE id = 1`,
+		}},
+		{"update reassigns user and item", []string{
+			insert + `(1, 1, 'i1', 'u1', 1700010000, 1700010600, 600)`,
+			insert + `(2, 1, 'i1', 'u1', 1700011000, 1700011600, 600)`,
+			`UPDATE play_intervals SET user_id = 'u2', item_id = 'i2' WHERE id = 2`,
+		}},
+		{"delete", []string{
+			insert + `(1, 1, 'i1', 'u1', 1700010000, 1700010600, 600)`,
+			insert + `(2, 1, 'i1', 'u1', 1700011000, 1700011600, 600)`,
+			`DELETE FROM play_intervals WHERE id = 1`,
+		}},
+		{"cascade from session delete", []string{
+			insert + `(1, 1, 'i1', 'u1', 1700010000, 1700010600, 600)`,
+			`DELETE FROM play_sessions WHERE id = 1`,
+		}},
+	}
+
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			db := openMigratedDB(t)
+			execAll(t, db, tt.stmts)
+
+			want := sumsByKey(t, db, `
+                SELECT strftime('%Y-%m-%d', start_ts, 'unixepoch') || '|' || user_id || '|' || item_id,
+                       SUM(`+intervalSeconds+`)
+                FROM play_intervals GROUP BY 1`)
+			got := sumsByKey(t, db, `
+                SELECT day || '|' || user_id || '|' || item_id, seconds FROM play_daily_usage`)
+			if !reflect.DeepEqual(got, want) {
+				t.Errorf("play_daily_usage = %v, want %v", got, want)
+			}
+		})
+	}
+}
+
+func TestPlayDailyUserUsageExcludesLiveTV(t *testing.T) {
+	insert := `INSERT INTO play_intervals (id, session_fk, item_id, user_id, start_ts, end_ts, duration_seconds) VALUES `
+	item := `INSERT INTO library_item (id, server_id, item_id, media_type) VALUES `
+	tests := []struct {
+		name  string
+		stmts []string
+	}{
+		{"insert, update and delete intervals", []string{
+			item + `('movie', 's1', 'movie', 'Movie'), ('live', 's1', 'live', 'TvChannel')`,
+			insert + `(1, 1, 'movie', 'u1', 1700010000, 1700013600, 3600)`,
+			insert + `(2, 1, 'live', 'u1', 1700010000, 1700013600, 3600)`,
+			insert + `(3, 1, 'unknown', 'u2', 1700100000, 1700101000, 1000)`,
+			`UPDATE play_intervals SET end_ts = end_ts + 600, duration_seconds = 4200 WHERE id IN (1, 2)`,
+			`DELETE FROM play_intervals WHERE id = 3`,
+		}},
+		{"item classified as Live TV after it was watched", []string{
+			insert + `(1, 1, 'later', 'u1', 1700010000, 1700013600, 3600)`,
+			insert + `(2, 1, 'movie', 'u1', 1700010000, 1700010600, 600)`,
+			item + `('later', 's1', 'later', 'LiveTv')`,
+		}},
+		{"item reclassified away from Live TV", []string{
+			item + `('ch', 's1', 'ch', 'Channel')`,
+			insert + `(1, 1, 'ch', 'u1', 1700010000, 1700013600, 3600)`,
+			`UPDATE library_item SET media_type = 'Episode' WHERE id = 'ch'`,
+		}},
+		{"item reclassified into Live TV", []string{
+			item + `('ep', 's1', 'ep', 'Episode')`,
+			insert + `(1, 1, 'ep', 'u1', 1700010000, 1700013600, 3600)`,
+			insert + `(2, 1, 'other', 'u1', 1700010000, 1700010600, 600)`,
+			`UPDATE library_item SET media_type = 'TvProgram' WHERE id = 'ep'`,
+		}},
+		{"Live TV item removed from the library", []string{
+			item + `('live', 's1', 'live', 'LiveTv')`,
+			insert + `(1, 1, 'live', 'u1', 1700010000, 1700013600, 3600)`,
+			`DELETE FROM library_item WHERE id = 'live'`,
+		}},
+	}
+
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			db := openMigratedDB(t)
+			execAll(t, db, tt.stmts)
+
+			want := sumsByKey(t, db, `
+                SELECT strftime('%Y-%m-%d', p.start_ts, 'unixepoch') || '|' || p.user_id,
+                       SUM(`+intervalSeconds+`)
+                FROM play_intervals p
+                LEFT JOIN library_item li ON li.id = p.item_id
+                WHERE COALESCE(li.media_type, 'Unknown') NOT IN ('TvChannel', 'LiveTv', 'Channel', 'TvProgram')
+                GROUP BY 1`)
+			got := sumsByKey(t, db, `
+                SELECT day || '|' || user_id, seconds FROM play_daily_user_usage`)
+			if !reflect.DeepEqual(got, want) {
+				t.Errorf("play_daily_user_usage = %v, want %v", got, want)
+			}
+		})
+	}
+}
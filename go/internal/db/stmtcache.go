@@ -0,0 +1,35 @@
+package db
+
+import (
+	"database/sql"
+	"sync"
+)
+
+type stmtKey struct {
+	db    *sql.DB
+	query string
+}
+
+// stmts holds statements prepared by Prepared. The set of query strings is
+// fixed by the callers, so it does not need eviction.
+var stmts sync.Map // stmtKey -> *sql.Stmt
+
+// Prepared returns a statement for query prepared once per database handle.
+// database/sql re-prepares it lazily on each pooled connection and keeps it
+// there, so hot read paths skip SQLite's parse and plan step after first use.
+// Only pass constant query text; the statement is never closed.
+func Prepared(db *sql.DB, query string) (*sql.Stmt, error) {
+	key := stmtKey{db: db, query: query}
+	if s, ok := stmts.Load(key); ok {
+		return s.(*sql.Stmt), nil
+	}
+	stmt, err := db.Prepare(query)
+	if err != nil {
+		return nil, err
+	}
+	if prev, loaded := stmts.LoadOrStore(key, stmt); loaded {
+		_ = stmt.Close()
+		return prev.(*sql.Stmt), nil
+	}
+	return stmt, nil
+}
@@ -6,12 +6,15 @@ import (
 	"encoding/json"
 	"fmt"
 	"io"
+	"net"
 	"net/http"
 	"net/url"
 	"sort"
 	"strings"
 	"sync"
 	"time"
+
+	"emby-analytics/internal/itemcache"
 )
 
 //
@@ -34,35 +37,46 @@ func normalizeToBps(v int64) int64 {
 // readJSON enforces 200 OK and JSON-decodes into dst.
 // On failure, it returns an error that includes status and a short body snippet.
 func readJSON(resp *http.Response, dst any) error {
-	defer resp.Body.Close()
+	defer func() {
+		// Drain what the decoder left so the connection can be reused.
+		_, _ = io.Copy(io.Discard, resp.Body)
+		resp.Body.Close()
+	}()
 
-	b, err := io.ReadAll(resp.Body)
-	if err != nil {
-		return fmt.Errorf("read body: %w", err)
+	if resp.StatusCode != http.StatusOK {
+		snippet, _ := io.ReadAll(io.LimitReader(resp.Body, 241))
+		return fmt.Errorf("http %d from %s: %s", resp.StatusCode, resp.Request.URL.String(), truncateSnippet(snippet))
 	}
 
-	if resp.StatusCode != http.StatusOK {
-		snippet := string(b)
-		if len(snippet) > 240 {
-			snippet = snippet[:240] + "…"
-		}
-		return fmt.Errorf("http %d from %s: %s", resp.StatusCode, resp.Request.URL.String(), snippet)
+	// Decode straight from the connection; item pages run to megabytes and
+	// buffering them first only to scan them again is wasted work. The head
+	// of the body is kept for the error message.
+	head := &headCapture{max: 241}
+	if err := json.NewDecoder(io.TeeReader(resp.Body, head)).Decode(dst); err != nil {
+		return fmt.Errorf("decode json from %s: %w; body: %q", resp.Request.URL.String(), err, truncateSnippet(head.buf))
 	}
+	return nil
+}
 
-	// Optional: check content-type is JSON-ish (don't be too strict)
-	ct := resp.Header.Get("Content-Type")
-	if ct != "" && !strings.Contains(strings.ToLower(ct), "application/json") {
-		// still try to decode, but if it fails we'll show a snippet
+// headCapture keeps the first max bytes written to it and discards the rest.
+type headCapture struct {
+	buf []byte
+	max int
+}
+
+func (h *headCapture) Write(p []byte) (int, error) {
+	if room := h.max - len(h.buf); room > 0 {
+		h.buf = append(h.buf, p[:min(room, len(p))]...)
 	}
+	return len(p), nil
+}
 
-	if err := json.Unmarshal(b, dst); err != nil {
-		snippet := string(b)
-		if len(snippet) > 240 {
-			snippet = snippet[:240] + "…"
-		}
-		return fmt.Errorf("decode json from %s: %w; body: %q", resp.Request.URL.String(), err, snippet)
+func truncateSnippet(b []byte) string {
+	snippet := string(b)
+	if len(snippet) > 240 {
+		snippet = snippet[:240] + "…"
 	}
-	return nil
+	return snippet
 }
 
 // doWithRetry performs HTTP request with exponential backoff retry
@@ -106,35 +120,42 @@ func (c *Client) doWithRetry(req *http.Request, maxRetries int) (*http.Response,
 // ---------- Client ----------
 //
 
+// maxCachedItemSets bounds the item lookup cache. Keys are id sets, so
+// without a cap it keeps growing for as long as the process runs.
+const maxCachedItemSets = 1000
+
 type Client struct {
-	BaseURL  string
-	APIKey   string
-	http     *http.Client
-	cache    sync.Map
-	cacheTTL time.Duration
+	BaseURL string
+	APIKey  string
+	http    *http.Client
+	cache   *itemcache.Cache[[]EmbyItem]
 }
 
 func New(baseURL, apiKey string) *Client {
 	return &Client{
-		BaseURL:  strings.TrimRight(baseURL, "/"),
-		APIKey:   apiKey,
-		cacheTTL: time.Hour, // 1 hour TTL
+		BaseURL: strings.TrimRight(baseURL, "/"),
+		APIKey:  apiKey,
+		cache:   itemcache.New[[]EmbyItem](time.Hour, maxCachedItemSets),
 		http: &http.Client{
 			Timeout: 30 * time.Second, // Increased from 15s to 30s
+			// Keep enough idle connections per host for concurrent page
+			// fetches and pollers; the default of 2 forces fresh handshakes.
+			// HTTP/2 has to be requested explicitly on a custom Transport; with it,
+			// HTTPS servers multiplex those requests over one connection.
 			Transport: &http.Transport{
-				MaxIdleConns:       10,
-				IdleConnTimeout:    30 * time.Second,
-				DisableCompression: false,
+				Proxy:               http.ProxyFromEnvironment,
+				ForceAttemptHTTP2:   true,
+				DialContext:         (&net.Dialer{Timeout: 5 * time.Second, KeepAlive: 30 * time.Second}).DialContext,
+				MaxIdleConns:        32,
+				MaxIdleConnsPerHost: 16,
+				IdleConnTimeout:     90 * time.Second,
+				TLSHandshakeTimeout: 10 * time.Second,
+				DisableCompression:  false,
 			},
 		},
 	}
 }
 
-type cacheEntry struct {
-	data      []EmbyItem
-	timestamp time.Time
-}
-
 //
 // ---------- Library (items, codecs, counts) ----------
 //
@@ -180,16 +201,7 @@ func (c *Client) getCachedItems(cacheKey string) ([]EmbyItem, bool) {
 		return nil, false
 	}
 
-	if entry, exists := c.cache.Load(cacheKey); exists {
-		if cached, ok := entry.(cacheEntry); ok {
-			if time.Since(cached.timestamp) < c.cacheTTL {
-				return cached.data, true
-			}
-			// Entry is expired, remove it
-			c.cache.Delete(cacheKey)
-		}
-	}
-	return nil, false
+	return c.cache.Get(cacheKey)
 }
 
 // setCachedItems stores items in cache
@@ -198,11 +210,7 @@ func (c *Client) setCachedItems(cacheKey string, items []EmbyItem) {
 		return
 	}
 
-	entry := cacheEntry{
-		data:      items,
-		timestamp: time.Now(),
-	}
-	c.cache.Store(cacheKey, entry)
+	c.cache.Set(cacheKey, items)
 }
 
 // ItemsByIDs fetches item details for a set of IDs (used to prettify Episode display)
@@ -211,6 +219,9 @@ func (c *Client) ItemsByIDs(ids []string) ([]EmbyItem, error) {
 	if c == nil || c.BaseURL == "" || c.APIKey == "" || len(ids) == 0 {
 		return []EmbyItem{}, nil
 	}
+	if len(ids) > itemsByIDsChunk {
+		return c.itemsByIDsChunked(ids)
+	}
 
 	// Generate cache key
 	cacheKey := c.generateCacheKey(ids)
@@ -256,6 +267,44 @@ func (c *Client) ItemsByIDs(ids []string) ([]EmbyItem, error) {
 	return out.Items, nil
 }
 
+const (
+	// itemsByIDsChunk keeps the Ids query parameter to a safe URL length.
+	itemsByIDsChunk = 100
+	// itemsByIDsParallel bounds concurrent chunk requests against Emby.
+	itemsByIDsParallel = 4
+)
+
+// itemsByIDsChunked splits a long id list into chunks fetched concurrently.
+// Each chunk goes through ItemsByIDs, so it is cached on its own and repeat
+// lookups of overlapping lists still hit the cache.
+func (c *Client) itemsByIDsChunked(ids []string) ([]EmbyItem, error) {
+	n := (len(ids) + itemsByIDsChunk - 1) / itemsByIDsChunk
+	results := make([][]EmbyItem, n)
+	errs := make([]error, n)
+	sem := make(chan struct{}, itemsByIDsParallel)
+	var wg sync.WaitGroup
+	for i := 0; i < n; i++ {
+		chunk := ids[i*itemsByIDsChunk : min((i+1)*itemsByIDsChunk, len(ids))]
+		wg.Add(1)
+		sem <- struct{}{}
+		go func(i int, chunk []string) {
+			defer wg.Done()
+			defer func() { <-sem }()
+			results[i], errs[i] = c.ItemsByIDs(chunk)
+		}(i, chunk)
+	}
+	wg.Wait()
+
+	out := make([]EmbyItem, 0, len(ids))
+	for i := range results {
+		if errs[i] != nil {
+			return nil, errs[i]
+		}
+		out = append(out, results[i]...)
+	}
+	return out, nil
+}
+
 // SeriesGenres fetches Genres for a given Series ID.
 func (c *Client) SeriesGenres(seriesID string) ([]string, error) {
 	if c == nil || c.BaseURL == "" || c.APIKey == "" || strings.TrimSpace(seriesID) == "" {
@@ -401,6 +450,69 @@ func (c *Client) TotalItems() (int, error) {
 	return out.Total, nil
 }
 
+// toLibraryItem flattens a detailed Emby item into one LibraryItem, taking the
+// codec and dimensions from the FIRST video stream (matches C# plugin logic).
+func toLibraryItem(item DetailedLibraryItem) LibraryItem {
+	var firstVideoCodec string
+	var firstVideoHeight *int
+	var firstVideoWidth *int
+	var firstBitrate int64
+	var firstSize int64
+
+	// Use top-level Path first (Emby API returns it here), fallback to MediaSources[0].Path
+	firstPath := item.Path
+
+sources:
+	for _, source := range item.MediaSources {
+		if firstBitrate == 0 && source.Bitrate > 0 {
+			firstBitrate = source.Bitrate
+		}
+		if firstSize == 0 && source.Size > 0 {
+			firstSize = source.Size
+		}
+		if firstPath == "" && source.Path != "" {
+			firstPath = source.Path
+		}
+		for _, stream := range source.MediaStreams {
+			if stream.Type == "Video" && stream.Codec != "" {
+				firstVideoCodec = stream.Codec
+				firstVideoHeight = stream.Height
+				firstVideoWidth = stream.Width
+				break sources
+			}
+		}
+	}
+
+	// Set codec to "Unknown" if no video stream found
+	if firstVideoCodec == "" {
+		firstVideoCodec = "Unknown"
+	}
+
+	rt := item.RunTimeTicks
+	var brPtr *int64
+	var szPtr *int64
+	if firstBitrate > 0 {
+		brPtr = &firstBitrate
+	}
+	if firstSize > 0 {
+		szPtr = &firstSize
+	}
+	return LibraryItem{
+		Id:            item.Id, // Use original ID without suffix
+		Name:          item.Name,
+		Type:          item.Type,
+		Height:        firstVideoHeight,
+		Width:         firstVideoWidth,
+		Codec:         firstVideoCodec,
+		Container:     item.Container,
+		RunTimeTicks:  &rt,
+		BitrateBps:    brPtr,
+		FileSizeBytes: szPtr,
+		FilePath:      firstPath,
+		Genres:        item.Genres,
+	}
+}
+
 // GetItemsIncremental fetches items modified since a given timestamp for incremental sync
 func (c *Client) GetItemsIncremental(limit int, minDateLastSaved *time.Time) ([]LibraryItem, int, error) {
 	u := fmt.Sprintf("%s/emby/Items", c.BaseURL)
@@ -433,72 +545,9 @@ func (c *Client) GetItemsIncremental(limit int, minDateLastSaved *time.Time) ([]
 	}
 
 	// Convert to LibraryItem format, creating ONE entry per media item
-	var result []LibraryItem
-
+	result := make([]LibraryItem, 0, len(out.Items))
 	for _, item := range out.Items {
-		var firstVideoCodec string
-		var firstVideoHeight *int
-		var firstVideoWidth *int
-		var firstBitrate int64
-		var firstSize int64
-		var firstPath string
-
-		// Use top-level Path first (Emby API returns it here), fallback to MediaSources[0].Path
-		if item.Path != "" {
-			firstPath = item.Path
-		}
-
-		// Find the FIRST video stream only (matches C# plugin logic)
-		for _, source := range item.MediaSources {
-			if firstBitrate == 0 && source.Bitrate > 0 {
-				firstBitrate = source.Bitrate
-			}
-			if firstSize == 0 && source.Size > 0 {
-				firstSize = source.Size
-			}
-			if firstPath == "" && source.Path != "" {
-				firstPath = source.Path
-			}
-			for _, stream := range source.MediaStreams {
-				if stream.Type == "Video" && stream.Codec != "" {
-					firstVideoCodec = stream.Codec
-					firstVideoHeight = stream.Height
-					firstVideoWidth = stream.Width
-					goto found // Break out of both loops
-				}
-			}
-		}
-
-	found:
-		// Set codec to "Unknown" if no video stream found
-		if firstVideoCodec == "" {
-			firstVideoCodec = "Unknown"
-		}
-
-		// Create ONE LibraryItem entry per media item
-		rt := item.RunTimeTicks
-		var brPtr *int64
-		var szPtr *int64
-		if firstBitrate > 0 {
-			brPtr = &firstBitrate
-		}
-		if firstSize > 0 {
-			szPtr = &firstSize
-		}
-		result = append(result, LibraryItem{
-			Id:            item.Id, // Use original ID without suffix
-			Name:          item.Name,
-			Type:          item.Type,
-			Height:        firstVideoHeight,
-			Width:         firstVideoWidth,
-			Codec:         firstVideoCodec,
-			Container:     item.Container,
-			RunTimeTicks:  &rt,
-			BitrateBps:    brPtr,
-			FileSizeBytes: szPtr,
-			FilePath:      firstPath,
-			Genres:        item.Genres,
-		})
+		result = append(result, toLibraryItem(item))
 	}
 
 	return result, out.TotalRecordCount, nil
@@ -531,72 +580,9 @@ func (c *Client) GetItemsChunk(limit, page int) ([]LibraryItem, error) {
 	}
 
 	// Convert to LibraryItem format, creating ONE entry per media item
-	var result []LibraryItem
-
+	result := make([]LibraryItem, 0, len(out.Items))
 	for _, item := range out.Items {
-		var firstVideoCodec string
-		var firstVideoHeight *int
-		var firstVideoWidth *int
-		var firstBitrate int64
-		var firstSize int64
-		var firstPath string
-
-		// Use top-level Path first (Emby API returns it here), fallback to MediaSources[0].Path
-		if item.Path != "" {
-			firstPath = item.Path
-		}
-
-		// Find the FIRST video stream only (matches C# plugin logic)
-		for _, source := range item.MediaSources {
-			if firstBitrate == 0 && source.Bitrate > 0 {
-				firstBitrate = source.Bitrate
-			}
-			if firstSize == 0 && source.Size > 0 {
-				firstSize = source.Size
-			}
-			if firstPath == "" && source.Path != "" {
-				firstPath = source.Path
-			}
-			for _, stream := range source.MediaStreams {
-				if stream.Type == "Video" && stream.Codec != "" {
-					firstVideoCodec = stream.Codec
-					firstVideoHeight = stream.Height
-					firstVideoWidth = stream.Width
-					goto found // Break out of both loops
-				}
-			}
-		}
-
-	found:
-		// Set codec to "Unknown" if no video stream found
-		if firstVideoCodec == "" {
-			firstVideoCodec = "Unknown"
-		}
-
-		// Create ONE LibraryItem entry per media item
-		rt := item.RunTimeTicks
-		var brPtr *int64
-		var szPtr *int64
-		if firstBitrate > 0 {
-			brPtr = &firstBitrate
-		}
-		if firstSize > 0 {
-			szPtr = &firstSize
-		}
-		result = append(result, LibraryItem{
-			Id:            item.Id, // Use original ID without suffix
-			Name:          item.Name,
-			Type:          item.Type,
-			Height:        firstVideoHeight,
-			Width:         firstVideoWidth,
-			Codec:         firstVideoCodec,
-			Container:     item.Container,
-			RunTimeTicks:  &rt,
-			BitrateBps:    brPtr,
-			FileSizeBytes: szPtr,
-			FilePath:      firstPath,
-			Genres:        item.Genres,
-		})
+		result = append(result, toLibraryItem(item))
 	}
 
 	return result, nil
@@ -775,6 +761,9 @@ func (c *Client) GetUserData(userID string) ([]UserDataItem, error) {
 	q.Set("Fields", "UserData,RunTimeTicks")
 	q.Set("IncludeItemTypes", "Movie,Episode")
 	q.Set("Filters", "IsPlayed")
+	// Only ids, names and user data are read; leaving out image tags keeps
+	// the response, and decoding it, small for users with long histories.
+	q.Set("EnableImages", "false")
 
 	req, _ := http.NewRequest("GET", u+"?"+q.Encode(), nil)
 	req.Header.Set("X-Emby-Token", c.APIKey)
@@ -951,6 +940,9 @@ func (c *Client) GetActiveSessions() ([]EmbySession, error) {
 	u := fmt.Sprintf("%s/emby/Sessions", c.BaseURL)
 	q := url.Values{}
 	q.Set("api_key", c.APIKey)
+	// Let the server drop idle registered devices before serialising; the
+	// window matches Emby's own dashboard so paused playback is kept.
+	q.Set("ActiveWithinSeconds", "960")
 
 	req, _ := http.NewRequest("GET", u+"?"+q.Encode(), nil)
 	// Some setups prefer header token; keep header for compatibility.
@@ -17,6 +17,9 @@ type CleanupResult struct {
 	UnreachableItems int `json:"unreachable_items"`
 }
 
+// guidPattern matches 8-4-4-4-12 hex digit GUIDs.
+var guidPattern = regexp.MustCompile(`^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$`)
+
 // CleanupUnknownItems removes or fixes items with missing metadata
 func CleanupUnknownItems(db *sql.DB, em *emby.Client) fiber.Handler {
 	return func(c fiber.Ctx) error {
@@ -63,9 +66,6 @@ func CleanupUnknownItems(db *sql.DB, em *emby.Client) fiber.Handler {
 		validGUIDs := make([]string, 0)
 		invalidIDs := make([]string, 0)
 
-		// GUID pattern: 8-4-4-4-12 hex digits
-		guidPattern := regexp.MustCompile(`^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$`)
-
 		for _, id := range unknownIDs {
 			if guidPattern.MatchString(id) {
 				validGUIDs = append(validGUIDs, id)
@@ -1,6 +1,8 @@
 package admin
 
 import (
+	"strconv"
+
 	"emby-analytics/internal/emby"
 
 	"github.com/gofiber/fiber/v3"
@@ -116,3 +118,16 @@ func DebugUserAllData(em *emby.Client) fiber.Handler {
 		})
 	}
 }
+
+// parseQueryInt helper function for Fiber v3 compatibility
+func parseQueryInt(c fiber.Ctx, key string, defaultValue int) int {
+	str := c.Query(key)
+	if str == "" {
+		return defaultValue
+	}
+
+	if val, err := strconv.Atoi(str); err == nil {
+		return val
+	}
+	return defaultValue
+}
@@ -3,11 +3,9 @@ package admin
 import (
 	"database/sql"
 	"emby-analytics/internal/logging"
-	"encoding/json"
 	"fmt"
 	"strings"
 	"sync"
-	"time"
 
 	"github.com/gofiber/fiber/v3"
 
@@ -61,6 +59,66 @@ func (rm *RefreshManager) StartIncremental(db *sql.DB, em *emby.Client) {
 	go rm.refreshWorker(db, em, 1000, true)
 }
 
+// libraryPage is one fetched chunk handed from the fetch loop to the writer.
+type libraryPage struct {
+	page    int
+	entries []emby.LibraryItem
+}
+
+// refreshFetchConcurrency bounds how many library pages are requested from
+// Emby at once (and so how many fetched pages can wait for the writer).
+const refreshFetchConcurrency = 4
+
+type fetchedPage struct {
+	entries []emby.LibraryItem
+	err     error
+}
+
+// pagePrefetcher fetches library pages ahead of the writer. At most
+// refreshFetchConcurrency pages are in flight or waiting to be consumed.
+type pagePrefetcher struct {
+	results []chan fetchedPage
+	window  chan struct{}
+	stop    chan struct{}
+}
+
+func prefetchLibraryPages(em *emby.Client, chunkSize, numPages int) *pagePrefetcher {
+	pf := &pagePrefetcher{
+		results: make([]chan fetchedPage, numPages),
+		window:  make(chan struct{}, refreshFetchConcurrency),
+		stop:    make(chan struct{}),
+	}
+	for i := range pf.results {
+		pf.results[i] = make(chan fetchedPage, 1)
+	}
+	go func() {
+		for page := 0; page < numPages; page++ {
+			select {
+			case pf.window <- struct{}{}:
+			case <-pf.stop:
+				return
+			}
+			go func(page int) {
+				entries, err := em.GetItemsChunk(chunkSize, page)
+				pf.results[page] <- fetchedPage{entries: entries, err: err}
+			}(page)
+		}
+	}()
+	return pf
+}
+
+// next waits for the given page and frees its slot for another fetch.
+// Pages must be consumed in order.
+func (pf *pagePrefetcher) next(page int) fetchedPage {
+	res := <-pf.results[page]
+	<-pf.window
+	return res
+}
+
+// close stops dispatching further pages; requests already in flight finish
+// into their buffered slots.
+func (pf *pagePrefetcher) close() { close(pf.stop) }
+
 func (rm *RefreshManager) refreshWorker(db *sql.DB, em *emby.Client, chunkSize int, incremental bool) {
 	defer rm.triggerMultiServerSync(db)
 
@@ -99,13 +157,19 @@ func (rm *RefreshManager) refreshWorker(db *sql.DB, em *emby.Client, chunkSize i
 
 		// Process the incremental items
 		if len(libraryEntries) > 0 {
-			dbEntriesInserted := rm.processLibraryEntries(db, em, libraryEntries)
-			logging.Debug("Processed %d items, inserted/updated %d entries", len(libraryEntries), dbEntriesInserted)
+			upserts, err := prepareLibraryUpserts(db)
+			if err != nil {
+				rm.set(Progress{Error: "Failed to prepare library upserts: " + err.Error(), Done: true})
+				return
+			}
+			dbEntriesInserted := rm.processLibraryEntries(db, em, upserts, libraryEntries)
+			upserts.Close()
+			logging.Debug("Processed library page", "items", len(libraryEntries), "upserted", dbEntriesInserted)
 		}
 
 		// Update sync timestamp
 		if err := syncpkg.UpdateSyncTime(db, syncpkg.SyncTypeLibraryIncremental, actualItemsProcessed); err != nil {
-			logging.Debug("Failed to update sync timestamp: %v", err)
+			logging.Debug("Failed to update sync timestamp", "error", err)
 		}
 
 		rm.set(Progress{
@@ -129,40 +193,84 @@ func (rm *RefreshManager) refreshWorker(db *sql.DB, em *emby.Client, chunkSize i
 		total = count
 		rm.set(Progress{Total: total, Message: "Fetching library items...", Running: true})
 
-		// Step 2: Fetch library items in chunks
-		page := 0
-		for actualItemsProcessed < total {
+		// On the initial import into an empty table, secondary indexes are
+		// rebuilt once after the bulk load instead of being maintained on
+		// every upsert. Later refreshes keep them, since stats, top-series
+		// and deletion-sync queries run against library_item meanwhile.
+		indexesDropped := false
+		if libraryItemEmpty(db) {
+			dropLibraryItemIndexes(db)
+			indexesDropped = true
+		}
+		defer func() {
+			if indexesDropped {
+				restoreLibraryItemIndexes(db)
+			}
+		}()
+
+		upserts, err := prepareLibraryUpserts(db)
+		if err != nil {
+			rm.set(Progress{Error: "Failed to prepare library upserts: " + err.Error(), Done: true})
+			return
+		}
+
+		// Step 2: Fetch library items in chunks. A single writer goroutine
+		// commits each page while the next one is being fetched from Emby.
+		pages := make(chan libraryPage, 1)
+		written := make(chan struct{})
+		go func() {
+			defer close(written)
+			processed := 0
+			for p := range pages {
+				_ = rm.processLibraryEntries(db, em, upserts, p.entries)
+				processed += len(p.entries)
+				rm.set(Progress{
+					Total:     total,
+					Processed: processed,
+					Message:   fmt.Sprintf("Processed %d / %d items", processed, total),
+					Page:      p.page,
+					Running:   true,
+				})
+			}
+		}()
+
+		// Pages are fetched a few at a time ahead of the writer but handed
+		// over in order.
+		numPages := (total + chunkSize - 1) / chunkSize
+		prefetch := prefetchLibraryPages(em, chunkSize, numPages)
+		for page := 0; page < numPages && actualItemsProcessed < total; page++ {
 			// GetItemsChunk now returns one entry per media item (1:1 mapping)
-			libraryEntries, err := em.GetItemsChunk(chunkSize, page)
-			if err != nil {
-				rm.set(Progress{Error: err.Error(), Done: true})
+			res := prefetch.next(page)
+			if res.err != nil {
+				prefetch.close()
+				close(pages)
+				<-written
+				upserts.Close()
+				rm.set(Progress{Error: res.err.Error(), Done: true})
 				return
 			}
 
-			if len(libraryEntries) == 0 {
+			if len(res.entries) == 0 {
 				break // No more items to process
 			}
 
-			// Process library entries
-			_ = rm.processLibraryEntries(db, em, libraryEntries)
+			pages <- libraryPage{page: page, entries: res.entries}
 
 			// Simple counting now that we have 1:1 mapping
-			actualItemsProcessed += len(libraryEntries)
-
-			rm.set(Progress{
-				Total:     total,
-				Processed: actualItemsProcessed,
-				Message:   fmt.Sprintf("Processed %d / %d items", actualItemsProcessed, total),
-				Page:      page,
-				Running:   true,
-			})
-			page++
-			time.Sleep(100 * time.Millisecond)
+			actualItemsProcessed += len(res.entries)
+		}
+		prefetch.close()
+		close(pages)
+		<-written
+		upserts.Close()
+		if indexesDropped {
+			restoreLibraryItemIndexes(db)
+			indexesDropped = false
 		}
 
 		// Update full sync timestamp
 		if err := syncpkg.UpdateSyncTime(db, syncpkg.SyncTypeLibraryFull, actualItemsProcessed); err != nil {
-			logging.Debug("Failed to update sync timestamp: %v", err)
+			logging.Debug("Failed to update sync timestamp", "error", err)
 		}
 	}
 
@@ -182,7 +290,7 @@ func (rm *RefreshManager) refreshWorker(db *sql.DB, em *emby.Client, chunkSize i
 			return
 		}
 
-		totalHistoryEvents := 0
+		totalHistoryItems := 0
 		for userIndex, user := range users {
 			rm.set(Progress{
 				Total:     total,
@@ -194,44 +302,25 @@ func (rm *RefreshManager) refreshWorker(db *sql.DB, em *emby.Client, chunkSize i
 			// Get unlimited history for this user (0 = all history)
 			history, err := em.GetUserPlayHistory(user.Id, 0)
 			if err != nil {
-				logging.Debug("Failed to get history for user %s: %v", user.Name, err)
+				logging.Debug("Failed to get history for user", "user", user.Name, "error", err)
 				continue // Skip user but don't fail entire refresh
 			}
 
-			userEvents := 0
-			for _, h := range history {
-				// Upsert user and item info
-				_, _ = db.Exec(`INSERT INTO emby_user (id, name) VALUES (?, ?) ON CONFLICT(id) DO UPDATE SET name=excluded.name`, user.Id, user.Name)
-				_, _ = db.Exec(`INSERT INTO library_item (id, server_id, item_id, name, media_type, created_at, updated_at) VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP) ON CONFLICT(id) DO UPDATE SET name=COALESCE(excluded.name, library_item.name), media_type=COALESCE(excluded.media_type, library_item.media_type), updated_at=CURRENT_TIMESTAMP`, h.Id, h.Id, h.Id, h.Name, h.Type)
-
-				// Convert position to milliseconds
-				posMs := int64(0)
-				if h.PlaybackPos > 0 {
-					posMs = h.PlaybackPos / 10_000
-				}
-
-				// Use historical timestamp
-				var eventTime int64 = time.Now().UnixMilli() // fallback
-				if h.DatePlayed != "" {
-					if playTime, err := time.Parse(time.RFC3339, h.DatePlayed); err == nil {
-						eventTime = playTime.UnixMilli()
-					} else if playTime, err := time.Parse("2006-01-02T15:04:05", h.DatePlayed); err == nil {
-						eventTime = playTime.UnixMilli()
-					}
-				}
+			_, _ = db.Exec(`INSERT INTO emby_user (id, name) VALUES (?, ?) ON CONFLICT(id) DO UPDATE SET name=excluded.name WHERE emby_user.name IS NOT excluded.name`, user.Id, user.Name)
 
-				// Insert play event
-				result, err := db.Exec(`INSERT OR IGNORE INTO play_event (ts, user_id, item_id, pos_ms) VALUES (?, ?, ?, ?)`, eventTime, user.Id, h.Id, posMs)
-				if err == nil {
-					if rows, _ := result.RowsAffected(); rows > 0 {
-						userEvents++
-						totalHistoryEvents++
-					}
+			userItems := 0
+			for _, h := range history {
+				// Upsert item info
+				if _, err := db.Exec(`INSERT INTO library_item (id, server_id, item_id, name, media_type, created_at, updated_at) VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP) ON CONFLICT(id) DO UPDATE SET name=COALESCE(excluded.name, library_item.name), media_type=COALESCE(excluded.media_type, library_item.media_type), updated_at=CURRENT_TIMESTAMP`, h.Id, h.Id, h.Id, h.Name, h.Type); err != nil {
+					logging.Debug("Failed to upsert history item", "item_id", h.Id, "error", err)
+					continue
 				}
+				userItems++
+				totalHistoryItems++
 			}
 
-			if userEvents > 0 {
-				logging.Debug("User %s: collected %d historical events", user.Name, userEvents)
+			if userItems > 0 {
+				logging.Debug("Upserted history items for user", "user", user.Name, "items", userItems)
 			}
 		}
 
@@ -239,7 +328,7 @@ func (rm *RefreshManager) refreshWorker(db *sql.DB, em *emby.Client, chunkSize i
 		rm.set(Progress{
 			Total:     total,
 			Processed: total,
-			Message:   fmt.Sprintf("Complete! Library: %d items, History: %d events from %d users", actualItemsProcessed, totalHistoryEvents, len(users)),
+			Message:   fmt.Sprintf("Complete! Library: %d items, History: %d items upserted from %d users", actualItemsProcessed, totalHistoryItems, len(users)),
 			Done:      true,
 			Running:   false,
 		})
@@ -259,23 +348,84 @@ func (rm *RefreshManager) triggerMultiServerSync(db *sql.DB) {
 	}()
 }
 
-// processLibraryEntries handles the insertion and enrichment of library items
-func (rm *RefreshManager) processLibraryEntries(db *sql.DB, em *emby.Client, libraryEntries []emby.LibraryItem) int {
+// Upserts used by the library refresh; see libraryUpserts.
+const upsertSeriesSQL = `
+    INSERT INTO series (id, name, year, created_at, updated_at)
+    VALUES (?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+    ON CONFLICT(id) DO UPDATE SET
+        name = COALESCE(excluded.name, series.name),
+        year = COALESCE(excluded.year, series.year),
+        updated_at = CURRENT_TIMESTAMP
+`
+
+const upsertLibraryItemSQL = `
+    INSERT INTO library_item (id, server_id, server_type, item_id, name, media_type, height, width, run_time_ticks, container, video_codec, file_size_bytes, bitrate_bps, file_path, genres, created_at, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+    ON CONFLICT(id) DO UPDATE SET
+        server_id = COALESCE(NULLIF(excluded.server_id, ''), library_item.server_id),
+        server_type = COALESCE(NULLIF(excluded.server_type, ''), library_item.server_type),
+        item_id = COALESCE(NULLIF(excluded.item_id, ''), library_item.item_id),
+        name = COALESCE(NULLIF(excluded.name, ''), library_item.name),
+        media_type = COALESCE(NULLIF(excluded.media_type, ''), library_item.media_type),
+        height = COALESCE(excluded.height, library_item.height),
+        width = COALESCE(excluded.width, library_item.width),
+        run_time_ticks = COALESCE(excluded.run_time_ticks, library_item.run_time_ticks),
+        container = COALESCE(NULLIF(excluded.container, ''), library_item.container),
+        video_codec = COALESCE(NULLIF(excluded.video_codec, ''), library_item.video_codec),
+        file_size_bytes = COALESCE(excluded.file_size_bytes, library_item.file_size_bytes),
+        bitrate_bps = COALESCE(excluded.bitrate_bps, library_item.bitrate_bps),
+        file_path = COALESCE(NULLIF(excluded.file_path, ''), library_item.file_path),
+        genres = COALESCE(NULLIF(excluded.genres, ''), library_item.genres),
+        updated_at = CURRENT_TIMESTAMP
+`
+
+// libraryUpserts holds the refresh upserts prepared once for a whole run.
+// Each page binds them to its transaction with tx.Stmt, which reuses the
+// compiled statement when the transaction lands on a connection that already
+// has it.
+type libraryUpserts struct {
+	series *sql.Stmt
+	item   *sql.Stmt
+}
+
+func prepareLibraryUpserts(db *sql.DB) (*libraryUpserts, error) {
+	series, err := db.Prepare(upsertSeriesSQL)
+	if err != nil {
+		return nil, err
+	}
+	item, err := db.Prepare(upsertLibraryItemSQL)
+	if err != nil {
+		_ = series.Close()
+		return nil, err
+	}
+	return &libraryUpserts{series: series, item: item}, nil
+}
+
+func (u *libraryUpserts) Close() {
+	_ = u.series.Close()
+	_ = u.item.Close()
+}
+
+// processLibraryEntries handles the insertion and enrichment of library items.
+// The page is written in a single transaction; episode enrichment needs Emby
+// round-trips, so it runs after commit rather than holding the write lock.
+func (rm *RefreshManager) processLibraryEntries(db *sql.DB, em *emby.Client, upserts *libraryUpserts, libraryEntries []emby.LibraryItem) int {
 	dbEntriesInserted := 0
 	serverID, serverType := tasks.ResolveEmbyServer(rm.cfg, rm.multiMgr)
-	// Cache SeriesID -> CSV genres to avoid repeated Emby lookups
-	seriesGenresCache := map[string]*string{}
+
+	tx, err := db.Begin()
+	if err != nil {
+		logging.Debug("Failed to begin library page transaction", "error", err)
+		return 0
+	}
+	seriesStmt := tx.Stmt(upserts.series)
+	itemStmt := tx.Stmt(upserts.item)
+
+	var episodes []emby.LibraryItem
 	for _, entry := range libraryEntries {
 		// Handle Series directly: upsert into series table and continue
 		if entry.Type == "Series" {
-			_, _ = db.Exec(`
-                INSERT INTO series (id, name, year, created_at, updated_at)
-                VALUES (?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
-                ON CONFLICT(id) DO UPDATE SET
-                    name = COALESCE(excluded.name, series.name),
-                    year = COALESCE(excluded.year, series.year),
-                    updated_at = CURRENT_TIMESTAMP
-            `, entry.Id, entry.Name, entry.ProductionYear)
+			_, _ = seriesStmt.Exec(entry.Id, entry.Name, entry.ProductionYear)
 			// Do not insert Series into library_item
 			continue
 		}
@@ -294,180 +444,148 @@ func (rm *RefreshManager) processLibraryEntries(db *sql.DB, em *emby.Client, lib
 			g := strings.Join(entry.Genres, ", ")
 			genresCSV = &g
 		}
-		result, err := db.Exec(`
-            INSERT INTO library_item (id, server_id, server_type, item_id, name, media_type, height, width, run_time_ticks, container, video_codec, file_size_bytes, bitrate_bps, file_path, genres, created_at, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
-            ON CONFLICT(id) DO UPDATE SET
-                server_id = COALESCE(NULLIF(excluded.server_id, ''), library_item.server_id),
-                server_type = COALESCE(NULLIF(excluded.server_type, ''), library_item.server_type),
-                item_id = COALESCE(NULLIF(excluded.item_id, ''), library_item.item_id),
-                name = COALESCE(NULLIF(excluded.name, ''), library_item.name),
-                media_type = COALESCE(NULLIF(excluded.media_type, ''), library_item.media_type),
-                height = COALESCE(excluded.height, library_item.height),
-                width = COALESCE(excluded.width, library_item.width),
-                run_time_ticks = COALESCE(excluded.run_time_ticks, library_item.run_time_ticks),
-                container = COALESCE(NULLIF(excluded.container, ''), library_item.container),
-                video_codec = COALESCE(NULLIF(excluded.video_codec, ''), library_item.video_codec),
-                file_size_bytes = COALESCE(excluded.file_size_bytes, library_item.file_size_bytes),
-                bitrate_bps = COALESCE(excluded.bitrate_bps, library_item.bitrate_bps),
-                file_path = COALESCE(NULLIF(excluded.file_path, ''), library_item.file_path),
-                genres = COALESCE(NULLIF(excluded.genres, ''), library_item.genres),
-                updated_at = CURRENT_TIMESTAMP
-        `, entry.Id, serverID, string(serverType), entry.Id, entry.Name, entry.Type, entry.Height, width, entry.RunTimeTicks, entry.Container, entry.Codec, entry.FileSizeBytes, entry.BitrateBps, nullIfEmpty(entry.FilePath), genresCSV)
-
-		// For episodes, ensure we have proper series info
-		if entry.Type == "Episode" && em != nil {
-			// Enrich episode data immediately during refresh
-			if episodeItems, err := em.ItemsByIDs([]string{entry.Id}); err == nil && len(episodeItems) > 0 {
-				ep := episodeItems[0]
-				if ep.SeriesName != "" {
-					// Build proper display name
-					display := ep.Name
-					if ep.ParentIndexNumber != nil && ep.IndexNumber != nil {
-						season := *ep.ParentIndexNumber
-						episode := *ep.IndexNumber
-						epcode := fmt.Sprintf("S%02dE%02d", season, episode)
-						if ep.SeriesName != "" && ep.Name != "" {
-							display = fmt.Sprintf("%s - %s (%s)", ep.SeriesName, ep.Name, epcode)
-						}
-					}
-					// Update the database with enriched info (+ series linkage)
-					db.Exec(`UPDATE library_item SET name = ?, series_id = COALESCE(?, series_id), series_name = COALESCE(?, series_name), updated_at = CURRENT_TIMESTAMP WHERE id = ?`,
-						display, nullIfEmpty(ep.SeriesId), nullIfEmpty(ep.SeriesName), entry.Id)
-
-					// Upsert series row when possible
-					if strings.TrimSpace(ep.SeriesId) != "" {
-						_, _ = db.Exec(`
-                            INSERT INTO series (id, name, year, created_at, updated_at)
-                            VALUES (?, ?, NULL, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
-                            ON CONFLICT(id) DO UPDATE SET
-                                name = COALESCE(excluded.name, series.name),
-                                updated_at = CURRENT_TIMESTAMP
-                        `, ep.SeriesId, ep.SeriesName)
-
-						// If this episode didn't have genres, try to populate from its Series genres
-						if genresCSV == nil && em != nil {
-							if cached, ok := seriesGenresCache[ep.SeriesId]; ok {
-								if cached != nil {
-									db.Exec(`UPDATE library_item SET genres = COALESCE(genres, ?) WHERE id = ?`, *cached, entry.Id)
-								}
-							} else {
-								if g, err := em.SeriesGenres(ep.SeriesId); err == nil && len(g) > 0 {
-									csv := strings.Join(g, ", ")
-									seriesGenresCache[ep.SeriesId] = &csv
-									db.Exec(`UPDATE library_item SET genres = COALESCE(genres, ?) WHERE id = ?`, csv, entry.Id)
-								} else {
-									seriesGenresCache[ep.SeriesId] = nil
-								}
-							}
-						}
-					}
-				}
-			}
-		}
+		result, err := itemStmt.Exec(entry.Id, serverID, string(serverType), entry.Id, entry.Name, entry.Type, entry.Height, width, entry.RunTimeTicks, entry.Container, entry.Codec, entry.FileSizeBytes, entry.BitrateBps, nullIfEmpty(entry.FilePath), genresCSV)
 
 		if err == nil {
 			if rows, _ := result.RowsAffected(); rows > 0 {
 				dbEntriesInserted++
 			}
 		}
+
+		// For episodes, ensure we have proper series info
+		if entry.Type == "Episode" {
+			episodes = append(episodes, entry)
+		}
+	}
+	if err := tx.Commit(); err != nil {
+		_ = tx.Rollback()
+		logging.Debug("Failed to commit library page", "error", err)
+		return 0
 	}
-	return dbEntriesInserted
-}
 
-// helper: convert empty string to nil for COALESCE updates
-func nullIfEmpty(s string) any {
-	if strings.TrimSpace(s) == "" {
-		return nil
+	if em != nil {
+		rm.enrichEpisodes(db, em, episodes)
 	}
-	return s
+	return dbEntriesInserted
 }
 
-// StartHandler kicks off a background refresh using the provided chunk size.
-func StartHandler(rm *RefreshManager, db *sql.DB, em *emby.Client, chunkSize int) fiber.Handler {
-	return func(c fiber.Ctx) error {
-		// Fire-and-forget
-		rm.Start(db, em, chunkSize)
-		return c.JSON(fiber.Map{"status": "started"})
+// enrichEpisodes fills in series linkage, display names and inherited genres.
+func (rm *RefreshManager) enrichEpisodes(db *sql.DB, em *emby.Client, episodes []emby.LibraryItem) {
+	// Cache SeriesID -> CSV genres to avoid repeated Emby lookups
+	seriesGenresCache := map[string]*string{}
+
+	// One batched lookup for the whole page instead of a request per episode
+	ids := make([]string, len(episodes))
+	for i, entry := range episodes {
+		ids[i] = entry.Id
+	}
+	episodeItems, err := em.ItemsByIDs(ids)
+	if err != nil {
+		logging.Debug("Failed to fetch episode details for enrichment", "error", err)
+		return
+	}
+	byID := make(map[string]emby.EmbyItem, len(episodeItems))
+	for _, it := range episodeItems {
+		byID[it.Id] = it
 	}
-}
 
-// StreamHandler sends progress events over SSE until Done=true.
-func StreamHandler(rm *RefreshManager) fiber.Handler {
-	return func(c fiber.Ctx) error {
-		logging.Debug("SSE subscriber connected")
-		defer logging.Debug("SSE subscriber disconnected")
-		c.Set("Content-Type", "text/event-stream")
-		c.Set("Cache-Control", "no-cache")
-		c.Set("Connection", "keep-alive")
-
-		// Send an initial hello so clients can attach listeners
-		if _, err := c.Write([]byte("event: hello\ndata: {}\n\n")); err != nil {
-			return nil
+	for _, entry := range episodes {
+		ep, ok := byID[entry.Id]
+		if !ok || ep.SeriesName == "" {
+			continue
 		}
-		if f, ok := c.Response().BodyWriter().(interface{ Flush() error }); ok {
-			_ = f.Flush()
+		// Build proper display name
+		display := ep.Name
+		if ep.ParentIndexNumber != nil && ep.IndexNumber != nil {
+			season := *ep.ParentIndexNumber
+			episode := *ep.IndexNumber
+			epcode := fmt.Sprintf("S%02dE%02d", season, episode)
+			if ep.SeriesName != "" && ep.Name != "" {
+				display = fmt.Sprintf("%s - %s (%s)", ep.SeriesName, ep.Name, epcode)
+			}
 		}
+		// Update the database with enriched info (+ series linkage)
+		db.Exec(`UPDATE library_item SET name = ?, series_id = COALESCE(?, series_id), series_name = COALESCE(?, series_name), updated_at = CURRENT_TIMESTAMP WHERE id = ?`,
+			display, nullIfEmpty(ep.SeriesId), nullIfEmpty(ep.SeriesName), entry.Id)
 
-		ticker := time.NewTicker(1 * time.Second)
-		defer ticker.Stop()
+		// Upsert series row when possible
+		if strings.TrimSpace(ep.SeriesId) == "" {
+			continue
+		}
+		_, _ = db.Exec(`
+            INSERT INTO series (id, name, year, created_at, updated_at)
+            VALUES (?, ?, NULL, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+            ON CONFLICT(id) DO UPDATE SET
+                name = COALESCE(excluded.name, series.name),
+                updated_at = CURRENT_TIMESTAMP
+        `, ep.SeriesId, ep.SeriesName)
 
-		for {
-			p := rm.get()
-			payload, _ := json.Marshal(p)
-			if _, err := c.Write([]byte("event: progress\ndata: " + string(payload) + "\n\n")); err != nil {
-				// client disconnected
-				return nil
-			}
-			// best-effort flush (works under Fiber v3's HTTP server)
-			if f, ok := c.Response().BodyWriter().(interface{ Flush() error }); ok {
-				_ = f.Flush()
+		// If this episode didn't have genres, try to populate from its Series genres
+		if len(entry.Genres) > 0 {
+			continue
+		}
+		if cached, ok := seriesGenresCache[ep.SeriesId]; ok {
+			if cached != nil {
+				db.Exec(`UPDATE library_item SET genres = COALESCE(genres, ?) WHERE id = ?`, *cached, entry.Id)
 			}
-
-			if p.Done {
-				return nil
+		} else {
+			if g, err := em.SeriesGenres(ep.SeriesId); err == nil && len(g) > 0 {
+				csv := strings.Join(g, ", ")
+				seriesGenresCache[ep.SeriesId] = &csv
+				db.Exec(`UPDATE library_item SET genres = COALESCE(genres, ?) WHERE id = ?`, csv, entry.Id)
+			} else {
+				seriesGenresCache[ep.SeriesId] = nil
 			}
-			<-ticker.C
 		}
 	}
 }
 
-// FullHandler starts a refresh and streams progress in the same request.
-func FullHandler(rm *RefreshManager, db *sql.DB, em *emby.Client, chunkSize int) fiber.Handler {
-	return func(c fiber.Ctx) error {
-		// Start the job
-		rm.Start(db, em, chunkSize)
+// libraryItemIndexes are the non-critical library_item indexes created by
+// migrations; keep in sync with 0010, 0015 and 0020.
+var libraryItemIndexes = []struct{ name, create string }{
+	{"idx_library_item_series_id", `CREATE INDEX IF NOT EXISTS idx_library_item_series_id ON library_item(series_id)`},
+	{"idx_library_item_server_type", `CREATE INDEX IF NOT EXISTS idx_library_item_server_type ON library_item(server_type)`},
+	{"idx_library_item_file_path", `CREATE INDEX IF NOT EXISTS idx_library_item_file_path ON library_item(file_path)`},
+}
 
-		// Then stream like StreamHandler
-		c.Set("Content-Type", "text/event-stream")
-		c.Set("Cache-Control", "no-cache")
-		c.Set("Connection", "keep-alive")
+// libraryItemEmpty reports whether library_item has no rows yet, i.e. this
+// is the first import. Errors count as non-empty so indexes are kept.
+func libraryItemEmpty(db *sql.DB) bool {
+	var empty bool
+	if err := db.QueryRow(`SELECT NOT EXISTS (SELECT 1 FROM library_item)`).Scan(&empty); err != nil {
+		logging.Debug("Failed to check library_item before refresh", "error", err)
+		return false
+	}
+	return empty
+}
 
-		if _, err := c.Write([]byte("event: hello\ndata: {}\n\n")); err != nil {
-			return nil
-		}
-		if f, ok := c.Response().BodyWriter().(interface{ Flush() error }); ok {
-			_ = f.Flush()
+func dropLibraryItemIndexes(db *sql.DB) {
+	for _, idx := range libraryItemIndexes {
+		if _, err := db.Exec(`DROP INDEX IF EXISTS ` + idx.name); err != nil {
+			logging.Debug("Failed to drop index before refresh", "index", idx.name, "error", err)
 		}
+	}
+}
 
-		ticker := time.NewTicker(1 * time.Second)
-		defer ticker.Stop()
-
-		for {
-			p := rm.get()
-			b, _ := json.Marshal(p)
-			if _, err := c.Write([]byte("event: progress\ndata: " + string(b) + "\n\n")); err != nil {
-				return nil
-			}
-			if f, ok := c.Response().BodyWriter().(interface{ Flush() error }); ok {
-				_ = f.Flush()
-			}
-			if p.Done {
-				return nil
-			}
-			<-ticker.C
+// restoreLibraryItemIndexes recreates the indexes and refreshes planner stats.
+// Also runs deferred so the indexes come back even when the refresh fails.
+func restoreLibraryItemIndexes(db *sql.DB) {
+	for _, idx := range libraryItemIndexes {
+		if _, err := db.Exec(idx.create); err != nil {
+			logging.Warn("Failed to recreate index after refresh", "index", idx.name, "error", err)
 		}
 	}
+	if _, err := db.Exec(`ANALYZE library_item`); err != nil {
+		logging.Debug("ANALYZE library_item failed", "error", err)
+	}
+}
+
+// helper: convert empty string to nil for COALESCE updates
+func nullIfEmpty(s string) any {
+	if strings.TrimSpace(s) == "" {
+		return nil
+	}
+	return s
 }
 
 // POST /admin/refresh  -> { started: true }
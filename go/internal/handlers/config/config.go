@@ -20,6 +20,7 @@ type ConfigResponse struct {
 
 // GetConfig returns client-safe configuration values including server ID
 func GetConfig(cfg config.Config) fiber.Handler {
+	em := emby.New(cfg.EmbyBaseURL, cfg.EmbyAPIKey)
 	return func(c fiber.Ctx) error {
 		response := ConfigResponse{
 			EmbyExternalURL:     cfg.EmbyExternalURL,
@@ -30,7 +31,6 @@ func GetConfig(cfg config.Config) fiber.Handler {
 		}
 
 		// Try to get server ID from Emby
-		em := emby.New(cfg.EmbyBaseURL, cfg.EmbyAPIKey)
 		if systemInfo, err := em.GetSystemInfo(); err != nil {
 			logging.Debug("Warning: Failed to fetch Emby server ID: %v", err)
 		} else {
@@ -48,14 +48,17 @@ func FrontendHealth(db *sql.DB) fiber.Handler {
 
 		// Quick check for recent data activity
 		if status.Overview {
+			// started_at is unix seconds; compare against integer cutoffs rather
+			// than datetime() text, which never matches an INTEGER column.
+			nowUnix := time.Now().Unix()
 			var recentSessions int
-			err = db.QueryRow(`SELECT COUNT(*) FROM play_sessions WHERE started_at > datetime('now', '-24 hours') AND COALESCE(item_type,'') NOT IN ('TvChannel','LiveTv','Channel','TvProgram')`).Scan(&recentSessions)
+			err = db.QueryRow(`SELECT COUNT(*) FROM play_sessions WHERE started_at > ? AND COALESCE(item_type,'') NOT IN ('TvChannel','LiveTv','Channel','TvProgram')`, nowUnix-24*3600).Scan(&recentSessions)
 			if err == nil {
 				status.SessionsData = recentSessions > 0
 			}
 
 			var activeUsers int
-			err = db.QueryRow(`SELECT COUNT(DISTINCT user_id) FROM play_sessions WHERE started_at > datetime('now', '-7 days') AND COALESCE(item_type,'') NOT IN ('TvChannel','LiveTv','Channel','TvProgram')`).Scan(&activeUsers)
+			err = db.QueryRow(`SELECT COUNT(DISTINCT user_id) FROM play_sessions WHERE started_at > ? AND COALESCE(item_type,'') NOT IN ('TvChannel','LiveTv','Channel','TvProgram')`, nowUnix-7*24*3600).Scan(&activeUsers)
 			if err == nil {
 				status.UsersData = activeUsers > 0
 			}
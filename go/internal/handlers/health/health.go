@@ -98,15 +98,15 @@ func Health(db *sql.DB) fiber.Handler {
 
 			// Check for recent activity
 			if dataOK {
-				var lastSession sql.NullString
+				// started_at is unix seconds, so the age is plain epoch arithmetic.
+				var lastSession sql.NullInt64
 				err = db.QueryRow(`SELECT MAX(started_at) FROM play_sessions WHERE started_at IS NOT NULL AND COALESCE(item_type,'') NOT IN ('TvChannel','LiveTv','Channel','TvProgram')`).Scan(&lastSession)
 				if err != nil {
 					dataOK = false
 					dataError = "Failed to get last session: " + err.Error()
 				} else if lastSession.Valid {
-					if lastTime, err := time.Parse("2006-01-02 15:04:05", lastSession.String); err == nil {
-						status.DataIntegrity.LastSessionAge = time.Since(lastTime).String()
-					}
+					age := time.Now().Unix() - lastSession.Int64
+					status.DataIntegrity.LastSessionAge = (time.Duration(age) * time.Second).String()
 				}
 			}
 
@@ -0,0 +1,198 @@
+package images
+
+import (
+	"crypto/sha256"
+	"encoding/hex"
+	"os"
+	"path/filepath"
+	"sort"
+	"strconv"
+	"strings"
+	"sync"
+	"time"
+
+	"emby-analytics/internal/logging"
+)
+
+// diskCache keeps proxied artwork on local disk so repeat poster views don't
+// round-trip to the media server. Entries are evicted oldest-first (by mtime,
+// refreshed on every hit) once the directory grows past maxBytes.
+type diskCache struct {
+	dir      string
+	maxBytes int64
+
+	mu   sync.Mutex
+	size int64
+}
+
+var imgCache *diskCache
+
+// ConfigureDiskCache enables the on-disk image cache. A maxMB of 0 or an empty
+// dir leaves caching disabled.
+func ConfigureDiskCache(dir string, maxMB int) {
+	if strings.TrimSpace(dir) == "" || maxMB <= 0 {
+		imgCache = nil
+		return
+	}
+	if err := os.MkdirAll(dir, 0755); err != nil {
+		logging.Warn("image cache disabled: cannot create directory", "dir", dir, "error", err)
+		imgCache = nil
+		return
+	}
+	dc := &diskCache{dir: dir, maxBytes: int64(maxMB) << 20}
+	entries, _ := os.ReadDir(dir)
+	for _, e := range entries {
+		if info, err := e.Info(); err == nil && !e.IsDir() {
+			dc.size += info.Size()
+		}
+	}
+	imgCache = dc
+}
+
+// cacheKey maps an upstream image URL to a file name. The URL already carries
+// server, item, variant and sizing, so hashing it keeps variants apart.
+func cacheKey(upstreamURL string) string {
+	sum := sha256.Sum256([]byte(upstreamURL))
+	return hex.EncodeToString(sum[:16])
+}
+
+func (dc *diskCache) dataPath(key string) string { return filepath.Join(dc.dir, key) }
+func (dc *diskCache) metaPath(key string) string { return filepath.Join(dc.dir, key+".meta") }
+
+// imageRevalidateAfter is how long a cached image is served without asking
+// the media server whether it changed. It matches the browser max-age.
+const imageRevalidateAfter = 24 * time.Hour
+
+// cachedMeta is what is kept next to each cached image: one header per line,
+// then the unix time the image was last fetched or revalidated.
+type cachedMeta struct {
+	contentType  string
+	etag         string
+	lastModified string
+	fetched      time.Time
+}
+
+// fresh reports whether the entry can be served without revalidating it.
+// Entries written before the fetch time was stored are always revalidated.
+func (m cachedMeta) fresh() bool {
+	return !m.fetched.IsZero() && time.Since(m.fetched) < imageRevalidateAfter
+}
+
+// lookup returns the cached file path plus the headers it was stored with.
+func (dc *diskCache) lookup(key string) (path string, meta cachedMeta, ok bool) {
+	raw, err := os.ReadFile(dc.metaPath(key))
+	if err != nil {
+		return "", cachedMeta{}, false
+	}
+	path = dc.dataPath(key)
+	if _, err := os.Stat(path); err != nil {
+		return "", cachedMeta{}, false
+	}
+	// Older entries lack the trailing Last-Modified and fetch time lines.
+	lines := strings.SplitN(string(raw), "\n", 4)
+	meta.contentType = lines[0]
+	if len(lines) > 1 {
+		meta.etag = lines[1]
+	}
+	if len(lines) > 2 {
+		meta.lastModified = lines[2]
+	}
+	if len(lines) > 3 {
+		if ts, err := strconv.ParseInt(lines[3], 10, 64); err == nil {
+			meta.fetched = time.Unix(ts, 0)
+		}
+	}
+	now := time.Now()
+	_ = os.Chtimes(path, now, now)
+	return path, meta, true
+}
+
+// create opens a temp file in the cache directory for a response being streamed.
+func (dc *diskCache) create() (*os.File, error) {
+	return os.CreateTemp(dc.dir, "tmp-*")
+}
+
+// commit moves a fully written temp file into place and enforces the size cap.
+func (dc *diskCache) commit(tmp *os.File, key string, meta cachedMeta) {
+	info, statErr := tmp.Stat()
+	if err := tmp.Close(); err != nil || statErr != nil {
+		_ = os.Remove(tmp.Name())
+		return
+	}
+	if err := dc.writeMeta(key, meta); err != nil {
+		_ = os.Remove(tmp.Name())
+		return
+	}
+	// A revalidated entry that changed upstream replaces the old file.
+	var replaced int64
+	if old, err := os.Stat(dc.dataPath(key)); err == nil {
+		replaced = old.Size()
+	}
+	if err := os.Rename(tmp.Name(), dc.dataPath(key)); err != nil {
+		_ = os.Remove(tmp.Name())
+		_ = os.Remove(dc.metaPath(key))
+		return
+	}
+
+	dc.mu.Lock()
+	dc.size += info.Size() - replaced
+	over := dc.size > dc.maxBytes
+	dc.mu.Unlock()
+	if over {
+		dc.prune()
+	}
+}
+
+// writeMeta stores the headers and fetch time for key. It also records a
+// successful revalidation of an existing entry.
+func (dc *diskCache) writeMeta(key string, meta cachedMeta) error {
+	raw := meta.contentType + "\n" + meta.etag + "\n" + meta.lastModified + "\n" + strconv.FormatInt(meta.fetched.Unix(), 10)
+	return os.WriteFile(dc.metaPath(key), []byte(raw), 0644)
+}
+
+// discard drops a temp file whose download did not complete.
+func (dc *diskCache) discard(tmp *os.File) {
+	_ = tmp.Close()
+	_ = os.Remove(tmp.Name())
+}
+
+// prune removes least recently used files until the cache is under 90% of its cap.
+func (dc *diskCache) prune() {
+	dc.mu.Lock()
+	defer dc.mu.Unlock()
+
+	entries, err := os.ReadDir(dc.dir)
+	if err != nil {
+		return
+	}
+	type file struct {
+		name  string
+		size  int64
+		mtime time.Time
+	}
+	files := make([]file, 0, len(entries))
+	var total int64
+	for _, e := range entries {
+		if e.IsDir() || strings.HasSuffix(e.Name(), ".meta") || strings.HasPrefix(e.Name(), "tmp-") {
+			continue
+		}
+		info, err := e.Info()
+		if err != nil {
+			continue
+		}
+		files = append(files, file{name: e.Name(), size: info.Size(), mtime: info.ModTime()})
+		total += info.Size()
+	}
+	sort.Slice(files, func(i, j int) bool { return files[i].mtime.Before(files[j].mtime) })
+
+	target := dc.maxBytes * 9 / 10
+	for _, f := range files {
+		if total <= target {
+			break
+		}
+		_ = os.Remove(filepath.Join(dc.dir, f.name))
+		_ = os.Remove(filepath.Join(dc.dir, f.name+".meta"))
+		total -= f.size
+	}
+	dc.size = total
+}
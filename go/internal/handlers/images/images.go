@@ -3,6 +3,7 @@ package images
 import (
 	"context"
 	"fmt"
+	"hash/fnv"
 	"io"
 	"net/http"
 	"net/url"
@@ -26,6 +27,20 @@ type Opts struct {
 	HTTPClient       *http.Client
 }
 
+// imageHTTPClient is shared by every image route so poster grids reuse
+// keep-alive connections to the media servers instead of each request
+// building its own client.
+var imageHTTPClient = &http.Client{
+	Timeout: 20 * time.Second,
+	Transport: func() *http.Transport {
+		t := http.DefaultTransport.(*http.Transport).Clone()
+		t.MaxIdleConns = 64
+		t.MaxIdleConnsPerHost = 16
+		t.IdleConnTimeout = 90 * time.Second
+		return t
+	}(),
+}
+
 func NewOpts(cfg config.Config) Opts {
 	return Opts{
 		BaseURL:          cfg.EmbyBaseURL,
@@ -33,7 +48,7 @@ func NewOpts(cfg config.Config) Opts {
 		Quality:          cfg.ImgQuality,
 		PrimaryMaxWidth:  cfg.ImgPrimaryMaxWidth,
 		BackdropMaxWidth: cfg.ImgBackdropMaxWidth,
-		HTTPClient:       &http.Client{Timeout: 20 * time.Second},
+		HTTPClient:       imageHTTPClient,
 	}
 }
 
@@ -46,31 +61,179 @@ func getenvInt(key string, def int) int {
 	return def
 }
 
+const imageCacheControl = "public, max-age=86400, s-maxage=86400"
+
 func proxyImage(c fiber.Ctx, client *http.Client, fullURL string) error {
+	cache := imgCache
+	var key string
+	// A cached copy past imageRevalidateAfter is checked with the media
+	// server before it is served again.
+	var stalePath string
+	var staleMeta cachedMeta
+	if cache != nil {
+		key = cacheKey(fullURL)
+		if mem := imgMemCache; mem != nil {
+			if e, ok := mem.get(key); ok && e.meta.fresh() {
+				if setCachedHeaders(c, e.meta) {
+					return c.SendStatus(fiber.StatusNotModified)
+				}
+				return c.Send(e.body)
+			}
+		}
+		if path, meta, ok := cache.lookup(key); ok {
+			if meta.fresh() {
+				return sendCachedImage(c, key, path, meta)
+			}
+			stalePath, staleMeta = path, meta
+		}
+	}
+
 	ctx, cancel := context.WithTimeout(context.Background(), 20*time.Second)
-	defer cancel()
 
 	req, err := http.NewRequestWithContext(ctx, "GET", fullURL, nil)
 	if err != nil {
+		cancel()
 		return c.Status(500).JSON(fiber.Map{"error": err.Error()})
 	}
+	if stalePath != "" {
+		// Derived ETags never match upstream; those entries rely on
+		// Last-Modified or are simply fetched again.
+		if staleMeta.etag != "" {
+			req.Header.Set("If-None-Match", staleMeta.etag)
+		}
+		if staleMeta.lastModified != "" {
+			req.Header.Set("If-Modified-Since", staleMeta.lastModified)
+		}
+	}
 
 	resp, err := client.Do(req)
 	if err != nil {
+		cancel()
+		if stalePath != "" {
+			// Media server unreachable: the old copy beats an error.
+			return sendCachedImage(c, key, stalePath, staleMeta)
+		}
 		return c.Status(502).JSON(fiber.Map{"error": err.Error()})
 	}
-	defer resp.Body.Close()
+	if stalePath != "" && (resp.StatusCode == http.StatusNotModified || resp.StatusCode >= 500) {
+		_ = resp.Body.Close()
+		cancel()
+		if resp.StatusCode == http.StatusNotModified {
+			staleMeta.fetched = time.Now()
+			_ = cache.writeMeta(key, staleMeta)
+		}
+		return sendCachedImage(c, key, stalePath, staleMeta)
+	}
 
 	c.Status(resp.StatusCode)
-	if ct := resp.Header.Get("Content-Type"); ct != "" {
-		c.Set("Content-Type", ct)
+	ct := resp.Header.Get("Content-Type")
+	if ct == "" {
+		ct = "image/jpeg"
+	}
+	c.Set("Content-Type", ct)
+	// Only real images get the long lifetime; errors must not stick in
+	// browsers and proxies for a day.
+	if resp.StatusCode == http.StatusOK {
+		c.Set("Cache-Control", imageCacheControl)
 	} else {
-		c.Set("Content-Type", "image/jpeg")
+		c.Set("Cache-Control", "no-store")
+	}
+	etag := resp.Header.Get("ETag")
+	lastModified := resp.Header.Get("Last-Modified")
+	if lastModified != "" {
+		c.Set("Last-Modified", lastModified)
+	}
+
+	var tmp *os.File
+	if cache != nil && resp.StatusCode == http.StatusOK {
+		tmp, _ = cache.create()
+	}
+	if tmp == nil {
+		// Nothing to cache: hand the upstream body to fasthttp so it is
+		// streamed to the client rather than buffered here first.
+		if etag != "" {
+			c.Set("ETag", etag)
+		}
+		return c.SendStream(&upstreamBody{ReadCloser: resp.Body, cancel: cancel}, int(resp.ContentLength))
 	}
-	c.Set("Cache-Control", "public, max-age=3600, s-maxage=3600")
+	defer cancel()
+	defer resp.Body.Close()
 
-	_, copyErr := io.Copy(c, resp.Body)
-	return copyErr
+	// Tee the body into the cache while it is copied to the client. Upstreams
+	// that don't send an ETag get one derived from the bytes.
+	hasher := fnv.New64a()
+	if _, copyErr := io.Copy(c, io.TeeReader(resp.Body, io.MultiWriter(tmp, hasher))); copyErr != nil {
+		cache.discard(tmp)
+		return copyErr
+	}
+	if etag == "" {
+		etag = fmt.Sprintf("\"%x\"", hasher.Sum64())
+	}
+	c.Set("ETag", etag)
+	meta := cachedMeta{contentType: ct, etag: etag, lastModified: lastModified, fetched: time.Now()}
+	cache.commit(tmp, key, meta)
+	if mem := imgMemCache; mem != nil {
+		mem.add(key, c.Response().Body(), meta)
+	}
+	return nil
+}
+
+// upstreamBody releases the request context once fasthttp has finished
+// streaming (and closes) the response body.
+type upstreamBody struct {
+	io.ReadCloser
+	cancel context.CancelFunc
+}
+
+func (b *upstreamBody) Close() error {
+	err := b.ReadCloser.Close()
+	b.cancel()
+	return err
+}
+
+// setCachedHeaders writes the stored caching headers and reports whether the
+// browser's copy is current (If-None-Match matches), in which case the caller
+// should answer 304.
+func setCachedHeaders(c fiber.Ctx, meta cachedMeta) bool {
+	c.Set("Cache-Control", imageCacheControl)
+	if meta.lastModified != "" {
+		c.Set("Last-Modified", meta.lastModified)
+	}
+	c.Set("Content-Type", meta.contentType)
+	if meta.etag == "" {
+		return false
+	}
+	c.Set("ETag", meta.etag)
+	match := c.Get(fiber.HeaderIfNoneMatch)
+	return match != "" && match == meta.etag
+}
+
+// sendCachedImage serves an image from the disk cache, answering conditional
+// requests with 304 when the browser already has it. Small files are promoted
+// into the in-memory cache on the way out.
+func sendCachedImage(c fiber.Ctx, key, path string, meta cachedMeta) error {
+	if setCachedHeaders(c, meta) {
+		return c.SendStatus(fiber.StatusNotModified)
+	}
+	f, err := os.Open(path)
+	if err != nil {
+		return c.Status(500).JSON(fiber.Map{"error": err.Error()})
+	}
+	info, err := f.Stat()
+	if err != nil {
+		_ = f.Close()
+		return c.Status(500).JSON(fiber.Map{"error": err.Error()})
+	}
+	if mem := imgMemCache; mem != nil && info.Size() <= maxMemEntryBytes {
+		body, err := io.ReadAll(f)
+		_ = f.Close()
+		if err != nil {
+			return c.Status(500).JSON(fiber.Map{"error": err.Error()})
+		}
+		mem.add(key, body, meta)
+		return c.Send(body)
+	}
+	return c.SendStream(f, int(info.Size()))
 }
 
 // GET /img/primary/:id
@@ -134,8 +297,7 @@ func MultiServerPrimary(multiServerMgr interface{}) fiber.Handler {
 			return c.Status(502).JSON(fiber.Map{"error": err.Error()})
 		}
 
-		httpClient := &http.Client{Timeout: 20 * time.Second}
-		return proxyImage(c, httpClient, imageURL)
+		return proxyImage(c, imageHTTPClient, imageURL)
 	}
 }
 
@@ -162,8 +324,7 @@ func MultiServerBackdrop(multiServerMgr interface{}) fiber.Handler {
 			return c.Status(502).JSON(fiber.Map{"error": err.Error()})
 		}
 
-		httpClient := &http.Client{Timeout: 20 * time.Second}
-		return proxyImage(c, httpClient, imageURL)
+		return proxyImage(c, imageHTTPClient, imageURL)
 	}
 }
 
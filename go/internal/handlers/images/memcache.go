@@ -0,0 +1,81 @@
+package images
+
+import (
+	"container/list"
+	"sync"
+)
+
+// maxMemEntryBytes keeps large backdrops from crowding out poster thumbnails,
+// which are what the dashboards request over and over.
+const maxMemEntryBytes = 1 << 20
+
+// memCache is a byte-bounded LRU of recently served artwork, sitting in front
+// of the disk cache so hot images skip the open/stat/read round trip.
+type memCache struct {
+	mu       sync.Mutex
+	maxBytes int64
+	size     int64
+	ll       *list.List
+	items    map[string]*list.Element
+}
+
+type memEntry struct {
+	key  string
+	body []byte
+	meta cachedMeta
+}
+
+var imgMemCache *memCache
+
+// ConfigureMemoryCache enables the in-process image LRU. A maxMB of 0 leaves
+// it disabled.
+func ConfigureMemoryCache(maxMB int) {
+	if maxMB <= 0 {
+		imgMemCache = nil
+		return
+	}
+	imgMemCache = &memCache{
+		maxBytes: int64(maxMB) << 20,
+		ll:       list.New(),
+		items:    make(map[string]*list.Element),
+	}
+}
+
+func (mc *memCache) get(key string) (memEntry, bool) {
+	mc.mu.Lock()
+	defer mc.mu.Unlock()
+	el, ok := mc.items[key]
+	if !ok {
+		return memEntry{}, false
+	}
+	mc.ll.MoveToFront(el)
+	return *el.Value.(*memEntry), true
+}
+
+// add stores a copy of body; callers may reuse their buffer afterwards.
+func (mc *memCache) add(key string, body []byte, meta cachedMeta) {
+	if len(body) == 0 || len(body) > maxMemEntryBytes {
+		return
+	}
+	entry := &memEntry{key: key, body: append([]byte(nil), body...), meta: meta}
+
+	mc.mu.Lock()
+	defer mc.mu.Unlock()
+	if el, ok := mc.items[key]; ok {
+		mc.size -= int64(len(el.Value.(*memEntry).body))
+		el.Value = entry
+		mc.ll.MoveToFront(el)
+	} else {
+		mc.items[key] = mc.ll.PushFront(entry)
+	}
+	mc.size += int64(len(body))
+	for mc.size > mc.maxBytes {
+		oldest := mc.ll.Back()
+		if oldest == nil {
+			break
+		}
+		e := mc.ll.Remove(oldest).(*memEntry)
+		delete(mc.items, e.key)
+		mc.size -= int64(len(e.body))
+	}
+}
@@ -0,0 +1,120 @@
+package images
+
+import (
+	"bytes"
+	"container/list"
+	"testing"
+)
+
+func newTestMemCache(maxBytes int64) *memCache {
+	return &memCache{maxBytes: maxBytes, ll: list.New(), items: make(map[string]*list.Element)}
+}
+
+func TestMemCacheEviction(t *testing.T) {
+	tests := []struct {
+		name     string
+		maxBytes int64
+		ops      []string // "add:k" adds 10 bytes under k, "get:k" touches k
+		present  []string
+		evicted  []string
+		wantSize int64
+	}{
+		{
+			name:     "least recently added goes first",
+			maxBytes: 30,
+			ops:      []string{"add:a", "add:b", "add:c", "add:d"},
+			present:  []string{"b", "c", "d"},
+			evicted:  []string{"a"},
+			wantSize: 30,
+		},
+		{
+			name:     "get refreshes recency",
+			maxBytes: 30,
+			ops:      []string{"add:a", "add:b", "add:c", "get:a", "add:d"},
+			present:  []string{"a", "c", "d"},
+			evicted:  []string{"b"},
+			wantSize: 30,
+		},
+		{
+			name:     "re-adding a key replaces its bytes",
+			maxBytes: 30,
+			ops:      []string{"add:a", "add:b", "add:a", "add:a"},
+			present:  []string{"a", "b"},
+			wantSize: 20,
+		},
+	}
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			mc := newTestMemCache(tt.maxBytes)
+			for _, op := range tt.ops {
+				switch op[:4] {
+				case "add:":
+					mc.add(op[4:], bytes.Repeat([]byte(op[4:]), 10), cachedMeta{contentType: "image/jpeg"})
+				case "get:":
+					mc.get(op[4:])
+				}
+			}
+			for _, k := range tt.evicted {
+				if _, ok := mc.items[k]; ok {
+					t.Errorf("expected %q evicted", k)
+				}
+			}
+			for _, k := range tt.present {
+				e, ok := mc.get(k)
+				if !ok {
+					t.Errorf("expected %q present", k)
+					continue
+				}
+				if !bytes.Equal(e.body, bytes.Repeat([]byte(k), 10)) {
+					t.Errorf("unexpected body for %q: %q", k, e.body)
+				}
+			}
+			if mc.size != tt.wantSize {
+				t.Errorf("size = %d, want %d", mc.size, tt.wantSize)
+			}
+		})
+	}
+}
+
+func TestMemCacheCapacityBound(t *testing.T) {
+	mc := newTestMemCache(1000)
+	body := make([]byte, 64)
+	for i := 0; i < 200; i++ {
+		mc.add(string(rune('A'+i%26))+string(rune('a'+i/26)), body, cachedMeta{})
+		if mc.size > mc.maxBytes {
+			t.Fatalf("size %d exceeds cap %d", mc.size, mc.maxBytes)
+		}
+		if int64(mc.ll.Len())*int64(len(body)) != mc.size || mc.ll.Len() != len(mc.items) {
+			t.Fatalf("bookkeeping drifted: size=%d list=%d map=%d", mc.size, mc.ll.Len(), len(mc.items))
+		}
+	}
+}
+
+func TestMemCacheSkipsUncacheableBodies(t *testing.T) {
+	tests := []struct {
+		name string
+		body []byte
+	}{
+		{"empty", nil},
+		{"over per-entry limit", make([]byte, maxMemEntryBytes+1)},
+	}
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			mc := newTestMemCache(4 * maxMemEntryBytes)
+			mc.add("k", tt.body, cachedMeta{})
+			if _, ok := mc.get("k"); ok || mc.size != 0 {
+				t.Errorf("expected body not cached, size = %d", mc.size)
+			}
+		})
+	}
+}
+
+func TestMemCacheCopiesBody(t *testing.T) {
+	mc := newTestMemCache(100)
+	buf := []byte("poster")
+	mc.add("k", buf, cachedMeta{})
+	copy(buf, "XXXXXX")
+	if e, _ := mc.get("k"); string(e.body) != "poster" {
+		t.Errorf("cached body changed with caller buffer: %q", e.body)
+	}
+}
@@ -2,6 +2,7 @@ package items
 
 import (
 	"database/sql"
+	"encoding/json"
 	"fmt"
 	"log"
 	"strings"
@@ -38,17 +39,7 @@ func ByIDs(db *sql.DB, em *emby.Client) fiber.Handler {
 		}
 
 		// 1) Get what we already have in SQLite
-		placeholders := strings.Repeat("?,", len(ids))
-		placeholders = placeholders[:len(placeholders)-1] // drop trailing comma
-
-		args := make([]any, len(ids))
-		for i, v := range ids {
-			args[i] = v
-		}
-
-		rows, err := db.Query(
-			`SELECT id, name, media_type FROM library_item WHERE id IN (`+placeholders+`)`, args...,
-		)
+		rows, err := queryLibraryItemsByIDs(db, ids)
 		if err != nil {
 			return c.Status(500).JSON(fiber.Map{"error": err.Error()})
 		}
@@ -218,6 +209,18 @@ func ByIDs(db *sql.DB, em *emby.Client) fiber.Handler {
 	}
 }
 
+// queryLibraryItemsByIDs loads id, name and media_type for the given ids. The
+// list is bound as a single JSON array so the statement text is the same for
+// every request size (one cached plan) and long lists are not limited by
+// SQLite's host parameter cap.
+func queryLibraryItemsByIDs(db *sql.DB, ids []string) (*sql.Rows, error) {
+	idsJSON, err := json.Marshal(ids)
+	if err != nil {
+		return nil, err
+	}
+	return db.Query(`SELECT id, name, media_type FROM library_item WHERE id IN (SELECT value FROM json_each(?))`, string(idsJSON))
+}
+
 // ByIDsMS uses the MultiServerManager to enrich items by consulting the most recent server context per item.
 func ByIDsMS(db *sql.DB, mgr *media.MultiServerManager) fiber.Handler {
 	return func(c fiber.Ctx) error {
@@ -237,14 +240,19 @@ func ByIDsMS(db *sql.DB, mgr *media.MultiServerManager) fiber.Handler {
 			return c.JSON([]ItemRow{})
 		}
 
-		// Base rows from DB
-		placeholders := strings.Repeat("?,", len(ids))
-		placeholders = placeholders[:len(placeholders)-1]
-		args := make([]any, len(ids))
-		for i, v := range ids {
-			args[i] = v
+		// Recently resolved ids are served from memory; only the rest touch
+		// the database or the media servers.
+		cached, misses := resolvedItems.partition(ids)
+		if len(misses) == 0 {
+			out := make([]ItemRow, 0, len(ids))
+			for _, id := range ids {
+				out = append(out, cached[id])
+			}
+			return c.JSON(out)
 		}
-		rows, err := db.Query(`SELECT id, name, media_type FROM library_item WHERE id IN (`+placeholders+`)`, args...)
+
+		// Base rows from DB
+		rows, err := queryLibraryItemsByIDs(db, misses)
 		if err != nil {
 			return c.Status(500).JSON(fiber.Map{"error": err.Error()})
 		}
@@ -260,27 +268,16 @@ func ByIDsMS(db *sql.DB, mgr *media.MultiServerManager) fiber.Handler {
 		}
 
 		// Resolve server context for missing/placeholder items
-		type ctx struct {
-			serverID   string
-			serverType media.ServerType
-		}
-		ctxByID := make(map[string]ctx)
-		for _, id := range ids {
-			r, ok := base[id]
-			if ok && r.Name != "" && r.Name != "Unknown" && r.Name != "Missing" {
+		unresolved := make([]string, 0, len(misses))
+		for _, id := range misses {
+			if r, ok := base[id]; ok && !isPlaceholderName(r.Name) {
 				continue
 			}
-			var sid, stype string
-			_ = db.QueryRow(`SELECT server_id, server_type FROM play_sessions WHERE item_id = ? ORDER BY started_at DESC LIMIT 1`, id).Scan(&sid, &stype)
-			if sid != "" {
-				ctxByID[id] = ctx{serverID: sid, serverType: media.ServerType(stype)}
-			}
+			unresolved = append(unresolved, id)
 		}
-
-		// Batch per server client
-		batch := make(map[string][]string)
-		for id, cxt := range ctxByID {
-			batch[cxt.serverID] = append(batch[cxt.serverID], id)
+		batch, err := latestServerByItem(db, unresolved)
+		if err != nil {
+			log.Printf("items/by-ids: server lookup failed: %v", err)
 		}
 		for serverID, idlist := range batch {
 			client, ok := mgr.GetClient(serverID)
@@ -332,8 +329,11 @@ func ByIDsMS(db *sql.DB, mgr *media.MultiServerManager) fiber.Handler {
 
 		// Build output in request order
 		out := make([]ItemRow, 0, len(ids))
+		fresh := make([]ItemRow, 0, len(misses))
 		for _, id := range ids {
-			if r, ok := base[id]; ok {
+			if r, ok := cached[id]; ok {
+				out = append(out, r)
+			} else if r, ok := base[id]; ok {
 				if r.Display == "" {
 					if r.Name != "" {
 						r.Display = r.Name
@@ -345,27 +345,58 @@ func ByIDsMS(db *sql.DB, mgr *media.MultiServerManager) fiber.Handler {
 					r.Type = "Unknown"
 				}
 				out = append(out, r)
+				fresh = append(fresh, r)
 			} else {
 				out = append(out, ItemRow{ID: id, Name: fmt.Sprintf("Missing Item (%s)", id), Type: "Unknown", Display: fmt.Sprintf("Missing Item (%s)", id)})
 			}
 		}
+		resolvedItems.store(fresh)
 		return c.JSON(out)
 	}
 }
 
-// zero-pad to 2 digits
-func two(n int) string {
-	if n < 0 {
-		return "00"
+// isPlaceholderName reports whether a stored name is a stand-in rather than
+// real metadata.
+func isPlaceholderName(name string) bool {
+	return name == "" || name == "Unknown" || name == "Missing"
+}
+
+// latestServerByItem groups ids by the server of their most recent play
+// session, in one query rather than one per id. Ids with no sessions are
+// left out.
+func latestServerByItem(db *sql.DB, ids []string) (map[string][]string, error) {
+	batch := make(map[string][]string)
+	if len(ids) == 0 {
+		return batch, nil
+	}
+	idsJSON, err := json.Marshal(ids)
+	if err != nil {
+		return batch, err
 	}
-	if n < 10 {
-		return "0" + string(rune('0'+n))
+	// One seek on idx_play_sessions_item_time per id picks the latest
+	// session, instead of ranking every session of every requested item.
+	rows, err := db.Query(`
+        SELECT j.value,
+               (SELECT ps.server_id FROM play_sessions ps
+                WHERE ps.item_id = j.value
+                ORDER BY ps.started_at DESC
+                LIMIT 1)
+        FROM (SELECT DISTINCT value FROM json_each(?)) j
+    `, string(idsJSON))
+	if err != nil {
+		return batch, err
 	}
-	if n < 100 {
-		d1 := n / 10
-		d2 := n % 10
-		return string(rune('0'+d1)) + string(rune('0'+d2))
+	defer rows.Close()
+	for rows.Next() {
+		var itemID string
+		var serverID sql.NullString
+		if err := rows.Scan(&itemID, &serverID); err != nil {
+			return batch, err
+		}
+		if serverID.String == "" {
+			continue
+		}
+		batch[serverID.String] = append(batch[serverID.String], itemID)
 	}
-	// For numbers >= 100, just return as string (shouldn't happen for season/episode numbers)
-	return string(rune('0'+(n/10)%10)) + string(rune('0'+n%10))
+	return batch, rows.Err()
 }
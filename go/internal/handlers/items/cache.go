@@ -0,0 +1,53 @@
+package items
+
+import (
+	"time"
+
+	"emby-analytics/internal/itemcache"
+)
+
+const (
+	// itemCacheTTL bounds how stale a resolved name/display may be. The
+	// dashboard re-requests the same ids on every refresh, and titles rarely
+	// change, so a few minutes removes nearly all repeat lookups.
+	itemCacheTTL = 5 * time.Minute
+
+	maxCachedItems = 50000
+)
+
+// itemCache holds resolved rows by item id. Once full, the least recently
+// used ids are evicted rather than the whole cache being dropped.
+type itemCache struct {
+	rows *itemcache.Cache[ItemRow]
+}
+
+func newItemCache(ttl time.Duration, maxEntries int) *itemCache {
+	return &itemCache{rows: itemcache.New[ItemRow](ttl, maxEntries)}
+}
+
+var resolvedItems = newItemCache(itemCacheTTL, maxCachedItems)
+
+// partition returns cached rows for the ids it has and the ids it does not.
+func (ic *itemCache) partition(ids []string) (map[string]ItemRow, []string) {
+	hits := make(map[string]ItemRow, len(ids))
+	misses := make([]string, 0, len(ids))
+	for _, id := range ids {
+		if r, ok := ic.rows.Get(id); ok {
+			hits[id] = r
+			continue
+		}
+		misses = append(misses, id)
+	}
+	return hits, misses
+}
+
+// store caches rows that were fully resolved. Placeholders are left out so
+// the next request tries to resolve them again.
+func (ic *itemCache) store(rows []ItemRow) {
+	for _, r := range rows {
+		if isPlaceholderName(r.Name) {
+			continue
+		}
+		ic.rows.Set(r.ID, r)
+	}
+}
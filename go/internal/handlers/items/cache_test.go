@@ -0,0 +1,85 @@
+package items
+
+import (
+	"reflect"
+	"sort"
+	"testing"
+	"time"
+)
+
+func TestItemCachePartition(t *testing.T) {
+	tests := []struct {
+		name       string
+		stored     []ItemRow
+		ask        []string
+		wantHits   []string
+		wantMisses []string
+	}{
+		{
+			name:       "resolved rows hit",
+			stored:     []ItemRow{{ID: "a", Name: "Alpha"}, {ID: "b", Name: "Beta"}},
+			ask:        []string{"a", "b", "c"},
+			wantHits:   []string{"a", "b"},
+			wantMisses: []string{"c"},
+		},
+		{
+			name:       "placeholders are not cached",
+			stored:     []ItemRow{{ID: "a", Name: "Unknown"}, {ID: "b", Name: ""}, {ID: "c", Name: "Missing"}},
+			ask:        []string{"a", "b", "c"},
+			wantHits:   []string{},
+			wantMisses: []string{"a", "b", "c"},
+		},
+		{
+			name:       "empty cache misses everything",
+			ask:        []string{"x"},
+			wantHits:   []string{},
+			wantMisses: []string{"x"},
+		},
+	}
+
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			ic := newItemCache(time.Minute, 10)
+			ic.store(tt.stored)
+			hits, misses := ic.partition(tt.ask)
+
+			gotHits := make([]string, 0, len(hits))
+			for id := range hits {
+				gotHits = append(gotHits, id)
+			}
+			sort.Strings(gotHits)
+			if !reflect.DeepEqual(gotHits, tt.wantHits) {
+				t.Errorf("hits = %v, want %v", gotHits, tt.wantHits)
+			}
+			if !reflect.DeepEqual(misses, tt.wantMisses) {
+				t.Errorf("misses = %v, want %v", misses, tt.wantMisses)
+			}
+		})
+	}
+}
+
+func TestItemCacheExpiry(t *testing.T) {
+	ic := newItemCache(20*time.Millisecond, 10)
+	ic.store([]ItemRow{{ID: "a", Name: "Alpha"}})
+
+	if hits, _ := ic.partition([]string{"a"}); hits["a"].Name != "Alpha" {
+		t.Fatalf("expected a fresh hit, got %+v", hits)
+	}
+	time.Sleep(40 * time.Millisecond)
+	if _, misses := ic.partition([]string{"a"}); len(misses) != 1 {
+		t.Errorf("expected the entry to expire, misses = %v", misses)
+	}
+}
+
+func TestItemCacheEvictsLeastRecentlyUsed(t *testing.T) {
+	ic := newItemCache(time.Minute, 2)
+	ic.store([]ItemRow{{ID: "a", Name: "Alpha"}, {ID: "b", Name: "Beta"}})
+	// Touch a so b becomes the least recently used entry.
+	ic.partition([]string{"a"})
+	ic.store([]ItemRow{{ID: "c", Name: "Gamma"}})
+
+	hits, misses := ic.partition([]string{"a", "b", "c"})
+	if len(hits) != 2 || !reflect.DeepEqual(misses, []string{"b"}) {
+		t.Errorf("expected b evicted, hits = %v, misses = %v", hits, misses)
+	}
+}
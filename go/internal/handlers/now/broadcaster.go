@@ -1,7 +1,9 @@
 package now
 
 import (
+	"bytes"
 	"context"
+	"encoding/json"
 	"sync"
 	"time"
 
@@ -11,16 +13,27 @@ import (
 	ws "github.com/saveblush/gofiber3-contrib/websocket"
 )
 
+// clientQueueSize is how many snapshots may wait for a slow client before
+// older ones are dropped in favour of the newest.
+const clientQueueSize = 1
+
 // Broadcaster manages a single Emby API poller and broadcasts to multiple WebSocket clients
 type Broadcaster struct {
-	mu         sync.RWMutex
-	clients    map[*ws.Conn]bool
+	mu sync.RWMutex
+	// clients maps each connection to its outbound queue, drained by that
+	// client's own writer goroutine.
+	clients    map[*ws.Conn]chan []byte
 	embyClient *emby.Client
 	interval   time.Duration
 	ctx        context.Context
 	cancel     context.CancelFunc
 	// Optional callback to run server-side processing each poll
 	SessionProcessor func()
+
+	// latest is the most recent snapshot, already JSON-encoded, so it is
+	// serialised once per poll no matter how many clients are connected.
+	latestMu sync.RWMutex
+	latest   []byte
 }
 
 // NewBroadcaster creates a new broadcaster instance
@@ -32,7 +45,7 @@ func NewBroadcaster(embyClient *emby.Client, pollInterval time.Duration) *Broadc
 	}
 
 	return &Broadcaster{
-		clients:    make(map[*ws.Conn]bool),
+		clients:    make(map[*ws.Conn]chan []byte),
 		embyClient: embyClient,
 		interval:   pollInterval,
 		ctx:        ctx,
@@ -52,10 +65,11 @@ func (b *Broadcaster) Stop() {
 	b.mu.Lock()
 	defer b.mu.Unlock()
 
-	for client := range b.clients {
+	for client, queue := range b.clients {
+		close(queue)
 		_ = client.Close()
 	}
-	b.clients = make(map[*ws.Conn]bool)
+	b.clients = make(map[*ws.Conn]chan []byte)
 }
 
 // AddClient registers a new WebSocket client for broadcasts
@@ -63,10 +77,10 @@ func (b *Broadcaster) AddClient(conn *ws.Conn) {
 	b.mu.Lock()
 	defer b.mu.Unlock()
 
-	b.clients[conn] = true
+	queue := make(chan []byte, clientQueueSize)
+	b.clients[conn] = queue
 
-	// Send immediate snapshot to new client
-	go b.sendToClient(conn)
+	go b.writeLoop(conn, queue)
 }
 
 // RemoveClient unregisters a WebSocket client
@@ -74,7 +88,10 @@ func (b *Broadcaster) RemoveClient(conn *ws.Conn) {
 	b.mu.Lock()
 	defer b.mu.Unlock()
 
-	delete(b.clients, conn)
+	if queue, ok := b.clients[conn]; ok {
+		delete(b.clients, conn)
+		close(queue)
+	}
 }
 
 // broadcastLoop is the main polling and broadcasting goroutine
@@ -90,7 +107,13 @@ func (b *Broadcaster) broadcastLoop() {
 		case <-b.ctx.Done():
 			return
 		case <-ticker.C:
+			// A slow Emby response must not be followed by a back-to-back
+			// poll from the buffered tick; restart the period instead.
+			start := time.Now()
 			b.broadcast()
+			if time.Since(start) >= b.interval {
+				ticker.Reset(b.interval)
+			}
 		}
 	}
 }
@@ -103,35 +126,82 @@ func (b *Broadcaster) broadcast() {
 		logging.Debug("failed to fetch now playing data, skipping broadcast: %v", err)
 		return // Do nothing on error
 	}
+	payload, err := json.Marshal(entries)
+	if err != nil {
+		logging.Debug("failed to encode now playing data: %v", err)
+		return
+	}
 
+	// Entries carry a poll timestamp, so an identical payload only happens
+	// when nothing is playing; clients already have it, so skip the fan-out.
+	b.latestMu.Lock()
+	unchanged := bytes.Equal(payload, b.latest)
+	b.latest = payload
+	b.latestMu.Unlock()
+	if unchanged {
+		return
+	}
+
+	// Never block on a client: if its queue still holds an unsent snapshot,
+	// replace it with this newer one. Sends happen under the read lock so
+	// RemoveClient cannot close a queue mid-send.
 	b.mu.RLock()
-	clients := make([]*ws.Conn, 0, len(b.clients))
-	for client := range b.clients {
-		clients = append(clients, client)
+	for _, queue := range b.clients {
+		select {
+		case queue <- payload:
+		default:
+			select {
+			case <-queue:
+			default:
+			}
+			select {
+			case queue <- payload:
+			default:
+			}
+		}
 	}
 	b.mu.RUnlock()
+}
 
-	for _, client := range clients {
-		go b.sendToClientWithData(client, entries)
+// sendToClient sends the latest snapshot to a newly connected client. Only
+// when nothing has been polled yet does it fall back to fetching from Emby.
+func (b *Broadcaster) sendToClient(conn *ws.Conn) {
+	b.latestMu.RLock()
+	payload := b.latest
+	b.latestMu.RUnlock()
+
+	if payload == nil {
+		entries, err := b.fetchNowPlayingEntries()
+		if err != nil {
+			logging.Debug("failed to send initial snapshot to client: %v", err)
+			// Don't send anything if the initial fetch fails
+			return
+		}
+		if payload, err = json.Marshal(entries); err != nil {
+			return
+		}
 	}
+	b.sendPayload(conn, payload)
 }
 
-// sendToClient sends current data to a specific client
-func (b *Broadcaster) sendToClient(conn *ws.Conn) {
-	entries, err := b.fetchNowPlayingEntries()
-	if err != nil {
-		logging.Debug("failed to send initial snapshot to client: %v", err)
-		// Don't send anything if the initial fetch fails
-		return
+// writeLoop is the only goroutine writing to conn: it sends the initial
+// snapshot, then each queued broadcast until the client is removed.
+func (b *Broadcaster) writeLoop(conn *ws.Conn, queue <-chan []byte) {
+	b.sendToClient(conn)
+	for payload := range queue {
+		if !b.sendPayload(conn, payload) {
+			return
+		}
 	}
-	b.sendToClientWithData(conn, entries)
 }
 
-func (b *Broadcaster) sendToClientWithData(conn *ws.Conn, entries []NowEntry) {
-	if err := conn.WriteJSON(entries); err != nil {
+func (b *Broadcaster) sendPayload(conn *ws.Conn, payload []byte) bool {
+	if err := conn.WriteMessage(ws.TextMessage, payload); err != nil {
 		b.RemoveClient(conn)
 		_ = conn.Close()
+		return false
 	}
+	return true
 }
 
 // fetchNowPlayingEntries now returns an error if it fails
@@ -150,10 +220,6 @@ func (b *Broadcaster) fetchNowPlayingEntries() ([]NowEntry, error) {
 	entries := make([]NowEntry, 0, len(sessions))
 
 	for _, s := range sessions {
-		var pct float64
-		if s.DurationTicks > 0 {
-			pct = float64(s.PosTicks) / float64(s.DurationTicks) * 100
-		}
 		entries = append(entries, NowEntry{
 			Timestamp:   nowTime,
 			Title:       s.ItemName,
@@ -165,7 +231,7 @@ func (b *Broadcaster) fetchNowPlayingEntries() ([]NowEntry, error) {
 			Audio:       audioDetailFromSession(s),
 			Subs:        s.SubLang,
 			Bitrate:     s.Bitrate,
-			ProgressPct: pct,
+			ProgressPct: progressPercent(s.PosTicks, s.DurationTicks),
 			PositionSec: func() int64 {
 				if s.PosTicks > 0 {
 					return s.PosTicks / 10_000_000
@@ -57,16 +57,7 @@ func MultiSnapshot(c fiber.Ctx) error {
 				nowMs := time.Now().UnixMilli()
 				out := make([]NowEntry, 0, len(es))
 				for _, s := range es {
-					var progressPct float64
-					if s.DurationTicks > 0 {
-						progressPct = (float64(s.PosTicks) / float64(s.DurationTicks)) * 100.0
-						if progressPct < 0 {
-							progressPct = 0
-						}
-						if progressPct > 100 {
-							progressPct = 100
-						}
-					}
+					progressPct := progressPercent(s.PosTicks, s.DurationTicks)
 					subsText := "None"
 					if s.SubsCount > 0 {
 						subsText = "1"
@@ -141,16 +132,7 @@ func MultiSnapshot(c fiber.Ctx) error {
 	nowMs := time.Now().UnixMilli()
 	out := make([]NowEntry, 0, len(sessions))
 	for _, s := range sessions {
-		var progressPct float64
-		if s.DurationMs > 0 {
-			progressPct = (float64(s.PositionMs) / float64(s.DurationMs)) * 100
-			if progressPct < 0 {
-				progressPct = 0
-			}
-			if progressPct > 100 {
-				progressPct = 100
-			}
-		}
+		progressPct := progressPercent(s.PositionMs, s.DurationMs)
 		subsText := "None"
 		if s.SubtitleCount > 0 {
 			subsText = strconv.Itoa(s.SubtitleCount)
@@ -199,10 +181,7 @@ func MultiSnapshot(c fiber.Ctx) error {
 				if s.TranscodeProgress > 0 {
 					return s.TranscodeProgress
 				}
-				if s.DurationMs > 0 {
-					return (float64(s.PositionMs) / float64(s.DurationMs)) * 100
-				}
-				return 0
+				return progressPct
 			}(),
 			IsPaused: s.IsPaused,
 		}
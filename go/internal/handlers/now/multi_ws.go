@@ -28,13 +28,25 @@ func MultiWS() func(*ws.Conn) {
 		ticker := time.NewTicker(1500 * time.Millisecond)
 		defer ticker.Stop()
 
+		// Entries carry a poll timestamp, so only an empty snapshot repeats;
+		// while nothing is playing it is sent once, and later ticks just ping
+		// so a closed connection is still noticed.
+		sentEmpty := false
 		send := func() bool {
 			entries, err := fetchMultiNowEntries(serverFilter)
-			if err != nil {
-				// best-effort: send empty payload with error as text for diagnostics
-				_ = conn.WriteJSON([]NowEntry{})
-				return true
+			if err != nil || len(entries) == 0 {
+				if sentEmpty {
+					return conn.WriteMessage(ws.PingMessage, nil) == nil
+				}
+				sentEmpty = true
+				if err != nil {
+					// best-effort: send empty payload with error as text for diagnostics
+					_ = conn.WriteJSON([]NowEntry{})
+					return true
+				}
+				return conn.WriteJSON([]NowEntry{}) == nil
 			}
+			sentEmpty = false
 			if err := conn.WriteJSON(entries); err != nil {
 				return false
 			}
@@ -86,16 +98,7 @@ func fetchMultiNowEntries(filter string) ([]NowEntry, error) {
 	nowMs := time.Now().UnixMilli()
 	out := make([]NowEntry, 0, len(sessions))
 	for _, s := range sessions {
-		var progressPct float64
-		if s.DurationMs > 0 {
-			progressPct = (float64(s.PositionMs) / float64(s.DurationMs)) * 100
-			if progressPct < 0 {
-				progressPct = 0
-			}
-			if progressPct > 100 {
-				progressPct = 100
-			}
-		}
+		progressPct := progressPercent(s.PositionMs, s.DurationMs)
 		subsText := "None"
 		if s.SubtitleCount > 0 {
 			subsText = fmt.Sprintf("%d", s.SubtitleCount)
@@ -143,10 +146,7 @@ func fetchMultiNowEntries(filter string) ([]NowEntry, error) {
 				if s.TranscodeProgress > 0 {
 					return s.TranscodeProgress
 				}
-				if s.DurationMs > 0 {
-					return (float64(s.PositionMs) / float64(s.DurationMs)) * 100
-				}
-				return 0
+				return progressPct
 			}(),
 			ServerID:   s.ServerID,
 			ServerType: string(s.ServerType),
@@ -10,6 +10,7 @@ import (
 	"os"
 	"regexp"
 	"strings"
+	"sync"
 	"time"
 	"unicode/utf8"
 
@@ -99,6 +100,27 @@ func getPosterURLLegacy(itemType, itemID, seriesID string) string {
 	return "/img/primary/" + itemID
 }
 
+// dangerousMessagePatterns are stripped from session messages; compiled once
+// rather than on every call.
+var dangerousMessagePatterns = func() []*regexp.Regexp {
+	patterns := []string{
+		`<script[^>]*>.*?</script>`,
+		`<iframe[^>]*>.*?</iframe>`,
+		`<object[^>]*>.*?</object>`,
+		`<embed[^>]*>`,
+		`<form[^>]*>.*?</form>`,
+		`javascript:`,
+		`vbscript:`,
+		`data:text/html`,
+		`<meta[^>]*>`,
+	}
+	res := make([]*regexp.Regexp, len(patterns))
+	for i, pattern := range patterns {
+		res[i] = regexp.MustCompile(`(?i)` + pattern)
+	}
+	return res
+}()
+
 // sanitizeMessageInput cleans user input to prevent injection attacks
 func sanitizeMessageInput(input string, maxLength int) string {
 	if input == "" {
@@ -127,20 +149,7 @@ func sanitizeMessageInput(input string, maxLength int) string {
 
 	// Step 4: Remove dangerous patterns that might still cause issues
 	// Remove any remaining script/HTML-like patterns (belt and suspenders)
-	patterns := []string{
-		`<script[^>]*>.*?</script>`,
-		`<iframe[^>]*>.*?</iframe>`,
-		`<object[^>]*>.*?</object>`,
-		`<embed[^>]*>`,
-		`<form[^>]*>.*?</form>`,
-		`javascript:`,
-		`vbscript:`,
-		`data:text/html`,
-		`<meta[^>]*>`,
-	}
-
-	for _, pattern := range patterns {
-		re := regexp.MustCompile(`(?i)` + pattern)
+	for _, re := range dangerousMessagePatterns {
 		input = re.ReplaceAllString(input, "")
 	}
 
@@ -156,6 +165,14 @@ func sanitizeMessageInput(input string, maxLength int) string {
 	return cleaned.String()
 }
 
+// sharedEmby is reused across requests so its connection pool stays warm;
+// it is rebuilt only if the configured server changes.
+var (
+	sharedEmbyMu  sync.Mutex
+	sharedEmby    *emby.Client
+	sharedEmbyKey string
+)
+
 // Generic env-based Emby client (keeps things portable behind any proxy).
 // Set EMBY_BASE_URL and EMBY_API_KEY in your container/env.
 func getEmbyClient() (*emby.Client, error) {
@@ -164,7 +181,13 @@ func getEmbyClient() (*emby.Client, error) {
 	if base == "" || key == "" {
 		return nil, fmt.Errorf("EMBY_BASE_URL or EMBY_API_KEY not set")
 	}
-	return emby.New(base, key), nil
+	sharedEmbyMu.Lock()
+	defer sharedEmbyMu.Unlock()
+	if sharedEmby == nil || sharedEmbyKey != base+"\x00"+key {
+		sharedEmby = emby.New(base, key)
+		sharedEmbyKey = base + "\x00" + key
+	}
+	return sharedEmby, nil
 }
 
 // videoDetailFromSession builds strings like "4K Dolby Vision HEVC"
@@ -270,6 +293,16 @@ func mbps(bps int64) string {
 	return fmt.Sprintf("%.1f Mbps", f)
 }
 
+// progressPercent returns pos/dur as a percentage clamped to 0-100 with one
+// decimal of resolution. The division is done on integers (per mille) since
+// it runs for every session on every poll.
+func progressPercent(pos, dur int64) float64 {
+	if dur <= 0 {
+		return 0
+	}
+	return float64(min(1000, max(0, pos*1000/dur))) / 10
+}
+
 // Human text for primary reason (borrowed from Emby wording)
 func reasonText(videoMethod, audioMethod string, reasons []string) string {
 	if len(reasons) == 0 {
@@ -328,16 +361,7 @@ func Snapshot(c fiber.Ctx) error {
 	nowMs := time.Now().UnixMilli()
 	out := make([]NowEntry, 0, len(sessions))
 	for _, s := range sessions {
-		var progressPct float64
-		if s.DurationTicks > 0 {
-			progressPct = (float64(s.PosTicks) / float64(s.DurationTicks)) * 100.0
-			if progressPct < 0 {
-				progressPct = 0
-			}
-			if progressPct > 100 {
-				progressPct = 100
-			}
-		}
+		progressPct := progressPercent(s.PosTicks, s.DurationTicks)
 		subsText := "None"
 		if s.SubsCount > 0 {
 			subsText = fmt.Sprintf("%d", s.SubsCount)
@@ -417,19 +441,11 @@ func Snapshot(c fiber.Ctx) error {
 					return s.TransCompletion
 				}
 				if s.TransPosTicks > 0 && s.DurationTicks > 0 {
-					p := (float64(s.TransPosTicks) / float64(s.DurationTicks)) * 100
-					if p > 100 {
-						p = 100
-					}
-					return p
+					return progressPercent(s.TransPosTicks, s.DurationTicks)
 				}
 				// fallback: match playback progress (at least shows a bar)
 				if s.DurationTicks > 0 {
-					p := (float64(s.PosTicks) / float64(s.DurationTicks)) * 100
-					if p > 100 {
-						p = 100
-					}
-					return p
+					return progressPercent(s.PosTicks, s.DurationTicks)
 				}
 				return 0
 			}(),
@@ -501,16 +517,7 @@ func Stream(c fiber.Ctx) error {
 		nowMs := time.Now().UnixMilli()
 		out := make([]NowEntry, 0, len(sessions))
 		for _, s := range sessions {
-			var progressPct float64
-			if s.DurationTicks > 0 {
-				progressPct = (float64(s.PosTicks) / float64(s.DurationTicks)) * 100.0
-				if progressPct < 0 {
-					progressPct = 0
-				}
-				if progressPct > 100 {
-					progressPct = 100
-				}
-			}
+			progressPct := progressPercent(s.PosTicks, s.DurationTicks)
 			subsText := "None"
 			if s.SubsCount > 0 {
 				subsText = fmt.Sprintf("%d", s.SubsCount)
@@ -589,18 +596,10 @@ func Stream(c fiber.Ctx) error {
 						return s.TransCompletion
 					}
 					if s.TransPosTicks > 0 && s.DurationTicks > 0 {
-						p := (float64(s.TransPosTicks) / float64(s.DurationTicks)) * 100
-						if p > 100 {
-							p = 100
-						}
-						return p
+						return progressPercent(s.TransPosTicks, s.DurationTicks)
 					}
 					if s.DurationTicks > 0 {
-						p := (float64(s.PosTicks) / float64(s.DurationTicks)) * 100
-						if p > 100 {
-							p = 100
-						}
-						return p
+						return progressPercent(s.PosTicks, s.DurationTicks)
 					}
 					return 0
 				}(),
@@ -2,6 +2,7 @@ package stats
 
 import (
 	"database/sql"
+	dbutil "emby-analytics/internal/db"
 	"emby-analytics/internal/handlers/settings"
 
 	"github.com/gofiber/fiber/v3"
@@ -14,6 +15,23 @@ type ActiveUserLifetime struct {
 	Minutes int    `json:"minutes"`
 }
 
+// activeUsersLifetimeQuery computes each user's total once, using it both
+// for ordering and for the response; users with nothing counted under the
+// current Trakt setting are left out.
+const activeUsersLifetimeQuery = `
+	SELECT u.name, t.total_ms
+	FROM (
+		SELECT user_id,
+		       CASE WHEN ? = 1 THEN COALESCE(emby_ms, 0) + COALESCE(trakt_ms, 0)
+		            ELSE COALESCE(emby_ms, 0) END AS total_ms
+		FROM lifetime_watch
+	) t
+	JOIN emby_user u ON u.id = t.user_id AND u.deleted_at IS NULL
+	WHERE t.total_ms > 0
+	ORDER BY t.total_ms DESC
+	LIMIT ?;
+`
+
 func ActiveUsersLifetime(db *sql.DB) fiber.Handler {
 	return func(c fiber.Ctx) error {
 		limit := parseQueryInt(c, "limit", 5)
@@ -24,45 +42,24 @@ func ActiveUsersLifetime(db *sql.DB) fiber.Handler {
 		// Get the setting for whether to include Trakt items
 		includeTrakt := settings.GetSettingBool(db, "include_trakt_items", false)
 
-		rows, err := db.Query(`
-			SELECT 
-				u.name,
-				COALESCE(lw.emby_ms, 0) AS emby_ms,
-				COALESCE(lw.trakt_ms, 0) AS trakt_ms
-			FROM lifetime_watch lw
-			JOIN emby_user u ON u.id = lw.user_id AND u.deleted_at IS NULL
-			WHERE lw.emby_ms > 0 OR lw.trakt_ms > 0
-			ORDER BY 
-				CASE WHEN ? = 1 THEN (COALESCE(lw.emby_ms, 0) + COALESCE(lw.trakt_ms, 0))
-				     ELSE COALESCE(lw.emby_ms, 0) END DESC
-			LIMIT ?;
-		`, includeTrakt, limit)
+		stmt, err := dbutil.Prepared(db, activeUsersLifetimeQuery)
+		if err != nil {
+			return c.Status(500).JSON(fiber.Map{"error": err.Error()})
+		}
+		rows, err := stmt.Query(includeTrakt, limit)
 		if err != nil {
 			return c.Status(500).JSON(fiber.Map{"error": err.Error()})
 		}
 		defer rows.Close()
 
-		out := []ActiveUserLifetime{}
+		out := make([]ActiveUserLifetime, 0, limit)
 		for rows.Next() {
 			var name string
-			var embyMs, traktMs int64
-			if err := rows.Scan(&name, &embyMs, &traktMs); err != nil {
+			var totalMs int64
+			if err := rows.Scan(&name, &totalMs); err != nil {
 				return c.Status(500).JSON(fiber.Map{"error": err.Error()})
 			}
-
-			// Calculate total based on setting
-			totalMs := embyMs
-			if includeTrakt {
-				totalMs += traktMs
-			}
-
-			// Convert milliseconds to days/hours/minutes
-			totalMinutes := int(totalMs / 60000)
-			days := totalMinutes / (60 * 24)
-			remainingMinutes := totalMinutes % (60 * 24)
-			hours := remainingMinutes / 60
-			minutes := remainingMinutes % 60
-
+			days, hours, minutes := splitDuration(totalMs)
 			out = append(out, ActiveUserLifetime{
 				User:    name,
 				Days:    days,
@@ -70,6 +67,15 @@ func ActiveUsersLifetime(db *sql.DB) fiber.Handler {
 				Minutes: minutes,
 			})
 		}
+		if err := rows.Err(); err != nil {
+			return c.Status(500).JSON(fiber.Map{"error": err.Error()})
+		}
 		return c.JSON(out)
 	}
 }
+
+// splitDuration breaks milliseconds into whole days, hours and minutes.
+func splitDuration(ms int64) (days, hours, minutes int) {
+	totalMinutes := int(ms / 60000)
+	return totalMinutes / 1440, totalMinutes % 1440 / 60, totalMinutes % 60
+}
@@ -0,0 +1,140 @@
+package stats
+
+import (
+	"strings"
+	"sync"
+	"time"
+
+	"github.com/gofiber/fiber/v3"
+
+	"emby-analytics/internal/queries"
+)
+
+const (
+	// StatsCacheTTL is how long a stats response is reused. Watch-time
+	// endpoints are also dropped as soon as new intervals are written (see
+	// InvalidateWatchStats), so the TTL mainly bounds library-derived stats
+	// while collapsing repeated refreshes and open tabs.
+	StatsCacheTTL = 10 * time.Second
+
+	maxCachedResponses = 256
+)
+
+type cachedResponse struct {
+	status      int
+	contentType string
+	body        []byte
+	expires     time.Time
+	// ready is closed once the first request for this key has finished;
+	// concurrent requests wait on it instead of running the query again.
+	ready chan struct{}
+	// stale marks an in-flight entry invalidated before it finished, so its
+	// result is served to that request only and not stored.
+	stale bool
+}
+
+type responseCache struct {
+	mu      sync.Mutex
+	entries map[string]*cachedResponse
+}
+
+var statsCache = &responseCache{entries: make(map[string]*cachedResponse)}
+
+// Cached wraps a stats handler with a small in-process TTL cache keyed by the
+// request path and query string. Only 200 responses are stored.
+func Cached(ttl time.Duration, h fiber.Handler) fiber.Handler {
+	return func(c fiber.Ctx) error {
+		// OriginalURL points into fasthttp's reused request buffer, so the
+		// map key must be a copy.
+		key := strings.Clone(c.OriginalURL())
+		now := time.Now()
+
+		statsCache.mu.Lock()
+		entry, ok := statsCache.entries[key]
+		if ok && entry.ready != nil {
+			statsCache.mu.Unlock()
+			<-entry.ready
+			statsCache.mu.Lock()
+			entry, ok = statsCache.entries[key]
+		}
+		if ok && entry.ready == nil && now.Before(entry.expires) {
+			statsCache.mu.Unlock()
+			c.Set(fiber.HeaderContentType, entry.contentType)
+			return c.Status(entry.status).Send(entry.body)
+		}
+		pending := &cachedResponse{ready: make(chan struct{})}
+		statsCache.entries[key] = pending
+		statsCache.mu.Unlock()
+		defer close(pending.ready)
+
+		err := h(c)
+
+		statsCache.mu.Lock()
+		resp := c.Response()
+		if err == nil && resp.StatusCode() == fiber.StatusOK && !pending.stale {
+			statsCache.entries[key] = &cachedResponse{
+				status:      resp.StatusCode(),
+				contentType: string(resp.Header.ContentType()),
+				body:        append([]byte(nil), resp.Body()...),
+				expires:     time.Now().Add(ttl),
+			}
+		} else {
+			delete(statsCache.entries, key)
+		}
+		if len(statsCache.entries) > maxCachedResponses {
+			statsCache.pruneLocked(time.Now())
+		}
+		statsCache.mu.Unlock()
+		return err
+	}
+}
+
+// pruneLocked drops expired entries, or everything finished if the cache is
+// still over capacity. Callers must hold mu.
+func (rc *responseCache) pruneLocked(now time.Time) {
+	for k, e := range rc.entries {
+		if e.ready == nil && !now.Before(e.expires) {
+			delete(rc.entries, k)
+		}
+	}
+	if len(rc.entries) <= maxCachedResponses {
+		return
+	}
+	for k, e := range rc.entries {
+		if e.ready == nil {
+			delete(rc.entries, k)
+		}
+	}
+}
+
+// watchStatsPrefixes are the cached paths derived from play_intervals.
+var watchStatsPrefixes = []string{
+	"/stats/usage",
+	"/stats/top/",
+	"/stats/top-",
+	"/stats/active-users",
+}
+
+// InvalidateWatchStats drops cached watch-time responses and the shared
+// window aggregations behind them. It is registered as the tasks package's
+// watch-data hook, so new intervals show up on the next request instead of
+// after the TTL. In-flight computations are marked stale so they are not
+// stored when they finish.
+func InvalidateWatchStats() {
+	queries.ResetWindowTotals()
+
+	statsCache.mu.Lock()
+	defer statsCache.mu.Unlock()
+	for k, e := range statsCache.entries {
+		for _, p := range watchStatsPrefixes {
+			if strings.HasPrefix(k, p) {
+				if e.ready != nil {
+					e.stale = true
+				} else {
+					delete(statsCache.entries, k)
+				}
+				break
+			}
+		}
+	}
+}
@@ -0,0 +1,188 @@
+package stats
+
+import (
+	"fmt"
+	"io"
+	"net/http/httptest"
+	"sync"
+	"sync/atomic"
+	"testing"
+	"time"
+
+	"github.com/gofiber/fiber/v3"
+)
+
+func resetStatsCache() {
+	statsCache.mu.Lock()
+	statsCache.entries = make(map[string]*cachedResponse)
+	statsCache.mu.Unlock()
+}
+
+// countingApp serves path through Cached with a handler that counts its calls
+// and, if gate is non-nil, waits on it before answering.
+func countingApp(path string, ttl time.Duration, status int, calls *atomic.Int32, gate <-chan struct{}) *fiber.App {
+	app := fiber.New()
+	app.Get(path, Cached(ttl, func(c fiber.Ctx) error {
+		n := calls.Add(1)
+		if gate != nil {
+			<-gate
+		}
+		return c.Status(status).SendString(fmt.Sprintf("call %d", n))
+	}))
+	return app
+}
+
+// fetch returns the response body for url. It reports failures with Errorf
+// so it can be used from the test's own goroutines.
+func fetch(t *testing.T, app *fiber.App, url string) string {
+	t.Helper()
+	resp, err := app.Test(httptest.NewRequest("GET", url, nil))
+	if err != nil {
+		t.Errorf("GET %s: %v", url, err)
+		return ""
+	}
+	defer resp.Body.Close()
+	body, err := io.ReadAll(resp.Body)
+	if err != nil {
+		t.Errorf("read %s: %v", url, err)
+	}
+	return string(body)
+}
+
+func TestCachedReuse(t *testing.T) {
+	tests := []struct {
+		name      string
+		status    int
+		ttl       time.Duration
+		urls      []string
+		sleep     time.Duration // between the last two requests
+		wantCalls int32
+	}{
+		{"same url within ttl", fiber.StatusOK, time.Minute, []string{"/stats/x", "/stats/x", "/stats/x"}, 0, 1},
+		{"query string is part of the key", fiber.StatusOK, time.Minute, []string{"/stats/x?days=7", "/stats/x?days=30", "/stats/x?days=7"}, 0, 2},
+		{"expired after ttl", fiber.StatusOK, 20 * time.Millisecond, []string{"/stats/x", "/stats/x"}, 40 * time.Millisecond, 2},
+		{"errors are not stored", fiber.StatusInternalServerError, time.Minute, []string{"/stats/x", "/stats/x"}, 0, 2},
+	}
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			resetStatsCache()
+			var calls atomic.Int32
+			app := countingApp("/stats/x", tt.ttl, tt.status, &calls, nil)
+			for i, u := range tt.urls {
+				if i == len(tt.urls)-1 && tt.sleep > 0 {
+					time.Sleep(tt.sleep)
+				}
+				fetch(t, app, u)
+			}
+			if got := calls.Load(); got != tt.wantCalls {
+				t.Errorf("handler ran %d times, want %d", got, tt.wantCalls)
+			}
+		})
+	}
+}
+
+func TestCachedSingleFlight(t *testing.T) {
+	resetStatsCache()
+	var calls atomic.Int32
+	gate := make(chan struct{})
+	app := countingApp("/stats/x", time.Minute, fiber.StatusOK, &calls, gate)
+
+	const n = 5
+	bodies := make([]string, n)
+	var wg sync.WaitGroup
+	for i := 0; i < n; i++ {
+		wg.Add(1)
+		go func(i int) {
+			defer wg.Done()
+			bodies[i] = fetch(t, app, "/stats/x")
+		}(i)
+	}
+	// Let the requests pile up behind the first one, then release it.
+	time.Sleep(50 * time.Millisecond)
+	close(gate)
+	wg.Wait()
+
+	if got := calls.Load(); got != 1 {
+		t.Errorf("handler ran %d times, want 1", got)
+	}
+	for i, b := range bodies {
+		if b != "call 1" {
+			t.Errorf("request %d got %q, want the shared result", i, b)
+		}
+	}
+}
+
+func TestInvalidateWatchStats(t *testing.T) {
+	tests := []struct {
+		path      string
+		wantCalls int32
+	}{
+		{"/stats/usage", 2},
+		{"/stats/top/users", 2},
+		{"/stats/active-users", 2},
+		{"/stats/qualities", 1},
+	}
+	for _, tt := range tests {
+		t.Run(tt.path, func(t *testing.T) {
+			resetStatsCache()
+			var calls atomic.Int32
+			app := countingApp(tt.path, time.Minute, fiber.StatusOK, &calls, nil)
+			fetch(t, app, tt.path)
+			InvalidateWatchStats()
+			fetch(t, app, tt.path)
+			if got := calls.Load(); got != tt.wantCalls {
+				t.Errorf("handler ran %d times, want %d", got, tt.wantCalls)
+			}
+		})
+	}
+}
+
+func TestInvalidateDiscardsInFlightResult(t *testing.T) {
+	resetStatsCache()
+	var calls atomic.Int32
+	gate := make(chan struct{})
+	app := countingApp("/stats/usage", time.Minute, fiber.StatusOK, &calls, gate)
+
+	done := make(chan string)
+	go func() { done <- fetch(t, app, "/stats/usage") }()
+	for calls.Load() == 0 {
+		time.Sleep(time.Millisecond)
+	}
+	InvalidateWatchStats()
+	close(gate)
+	if b := <-done; b != "call 1" {
+		t.Errorf("in-flight request got %q, want its own result", b)
+	}
+
+	if b := fetch(t, app, "/stats/usage"); b != "call 2" {
+		t.Errorf("next request got %q, want a fresh computation", b)
+	}
+}
+
+func TestCachedKeysSurviveRequestReuse(t *testing.T) {
+	resetStatsCache()
+	app := fiber.New()
+	app.Get("/stats/x", Cached(time.Minute, func(c fiber.Ctx) error {
+		return c.SendString("days=" + c.Query("days"))
+	}))
+
+	// Same-length URLs, so a reused request buffer would overwrite a stored
+	// key in place.
+	urls := []string{"/stats/x?days=07", "/stats/x?days=14", "/stats/x?days=30"}
+	for round := 0; round < 2; round++ {
+		for _, u := range urls {
+			want := "days=" + u[len("/stats/x?days="):]
+			if got := fetch(t, app, u); got != want {
+				t.Errorf("round %d: GET %s = %q, want %q", round, u, got, want)
+			}
+		}
+	}
+
+	statsCache.mu.Lock()
+	defer statsCache.mu.Unlock()
+	for _, u := range urls {
+		if _, ok := statsCache.entries[u]; !ok {
+			t.Errorf("no cache entry under %q; keys changed after the request", u)
+		}
+	}
+}
@@ -23,6 +23,11 @@ func Codecs(db *sql.DB) fiber.Handler {
 
 		condition := excludeLiveTvFilterAlias("li")
 		condition, args := appendServerFilter(condition, "li", serverType, serverID)
+		// limit counts codecs, not (codec, media type) rows, so a codec is never
+		// cut off halfway. Codecs are ranked by their total across both types.
+		if limit <= 0 || limit > 100 {
+			limit = -1 // SQLite: no limit
+		}
 		q := fmt.Sprintf(`
 			WITH base AS (
 				SELECT
@@ -30,26 +35,34 @@ func Codecs(db *sql.DB) fiber.Handler {
 					%s AS media_type
 				FROM library_item li
 				WHERE %s
+			),
+			agg AS (
+				SELECT
+					codec,
+					media_type,
+					COUNT(*) AS count
+				FROM base
+				WHERE media_type IN ('Movie', 'Episode')
+				GROUP BY codec, media_type
+			),
+			ranked AS (
+				SELECT
+					codec,
+					media_type,
+					count,
+					DENSE_RANK() OVER (ORDER BY codec_total DESC, codec) AS codec_rank
+				FROM (
+					SELECT agg.*, SUM(count) OVER (PARTITION BY codec) AS codec_total
+					FROM agg
+				)
 			)
-			SELECT
-				codec,
-				media_type,
-				COUNT(*) AS count
-			FROM base
-			WHERE media_type IN ('Movie', 'Episode')
-			GROUP BY codec, media_type
-			ORDER BY count DESC
+			SELECT codec, media_type, count
+			FROM ranked
+			WHERE ? < 0 OR codec_rank <= ?
 			`, normalizedMediaTypeExpr("li"), condition)
+		args = append(args, limit, limit)
 
-		var rows *sql.Rows
-		var err error
-		if limit > 0 && limit <= 100 {
-			q = q + " LIMIT ?"
-			args = append(args, limit)
-			rows, err = db.Query(q, args...)
-		} else {
-			rows, err = db.Query(q, args...)
-		}
+		rows, err := db.Query(q, args...)
 		if err != nil {
 			return c.Status(fiber.StatusInternalServerError).JSON(fiber.Map{"error": err.Error()})
 		}
@@ -27,17 +27,12 @@ func excludeLiveTvFilterAlias(alias string) string {
 	return fmt.Sprintf("%s NOT IN ('TvChannel', 'LiveTv', 'Channel', 'TvProgram')", col)
 }
 
-// normalizedMediaTypeExpr returns a CASE expression that collapses assorted media_type values
-// (or missing metadata) into the buckets used by the UI.
+// normalizedMediaTypeExpr returns the column that collapses assorted media_type values
+// (or missing metadata) into the buckets used by the UI. media_kind is an indexed
+// generated column on library_item (migration 0027), so filters on it can use the
+// index instead of evaluating the bucketing CASE per row.
 func normalizedMediaTypeExpr(alias string) string {
-	mediaTypeCol := columnWithAlias(alias, "media_type")
-	seriesIDCol := columnWithAlias(alias, "series_id")
-	return fmt.Sprintf(`CASE
-        WHEN TRIM(COALESCE(%s, '')) = '' AND TRIM(COALESCE(%s, '')) <> '' THEN 'Episode'
-        WHEN LOWER(TRIM(%s)) IN ('episode','season','series') THEN 'Episode'
-        WHEN LOWER(TRIM(%s)) = 'movie' THEN 'Movie'
-        ELSE 'Unknown'
-    END`, mediaTypeCol, seriesIDCol, mediaTypeCol, mediaTypeCol)
+	return columnWithAlias(alias, "media_kind")
 }
 
 func movieMediaPredicate(alias string) string {
@@ -4,6 +4,7 @@ import (
 	"fmt"
 	"strconv"
 	"strings"
+	"time"
 
 	"github.com/gofiber/fiber/v3"
 )
@@ -18,24 +19,45 @@ func parseQueryInt(c fiber.Ctx, key string, def int) int {
 	return def
 }
 
-// parseTimeframeToDays is also defined only once here.
+// parseTimeframeToDays is also defined only once here. Timeframes are "<n>d"
+// (e.g. "7d", "90d") or "all-time"; anything else falls back to 14 days.
 func parseTimeframeToDays(timeframe string) int {
-	switch timeframe {
-	case "1d":
-		return 1
-	case "3d":
-		return 3
-	case "7d":
-		return 7
-	case "14d":
-		return 14
-	case "30d":
-		return 30
-	case "all-time":
+	if timeframe == "all-time" {
 		return 0 // Special case
-	default:
-		return 14 // Default fallback
 	}
+	if num, ok := strings.CutSuffix(timeframe, "d"); ok {
+		if days, err := strconv.Atoi(num); err == nil && days > 0 && days <= maxTimeframeDays {
+			return days
+		}
+	}
+	return 14 // Default fallback
+}
+
+// maxTimeframeDays caps "<n>d" timeframes at roughly ten years.
+const maxTimeframeDays = 3650
+
+// parseWatchWindow resolves the timeframe (or legacy days) query parameters
+// into unix-second bounds once, so handlers and queries compare plain
+// integers. All-time spans from the epoch to well past now.
+func parseWatchWindow(c fiber.Ctx) (allTime bool, winStart, winEnd int64) {
+	timeframe := c.Query("timeframe", "")
+	if timeframe == "" {
+		// Fallback to days parameter if timeframe not provided
+		switch days := parseQueryInt(c, "days", 14); {
+		case days <= 0:
+			timeframe = "all-time"
+		case days == 1, days == 3, days == 7, days == 14:
+			timeframe = strconv.Itoa(days) + "d"
+		default:
+			timeframe = "30d" // Default for large day values
+		}
+	}
+
+	now := time.Now().UTC()
+	if timeframe == "all-time" {
+		return true, 0, now.AddDate(100, 0, 0).Unix()
+	}
+	return false, now.AddDate(0, 0, -parseTimeframeToDays(timeframe)).Unix(), now.Unix()
 }
 
 func normalizeServerParam(raw string) (serverType string, serverID string) {
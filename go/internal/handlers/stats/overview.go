@@ -2,11 +2,14 @@ package stats
 
 import (
 	"database/sql"
+	"errors"
 	"fmt"
 	"log"
+	"sync"
 	"time"
 
 	"emby-analytics/internal/handlers/admin"
+	"emby-analytics/internal/logging"
 
 	"github.com/gofiber/fiber/v3"
 )
@@ -18,70 +21,176 @@ type OverviewData struct {
 	UniquePlays int `json:"unique_plays"`
 }
 
-func Overview(db *sql.DB) fiber.Handler {
-	return func(c fiber.Ctx) error {
-		start := time.Now()
-		data := OverviewData{}
+// OverviewRefreshInterval is how often the overview counts are recomputed in
+// the background. Syncs, library ingests and new watch intervals also trigger
+// a refresh.
+const OverviewRefreshInterval = 60 * time.Second
 
-		// Count users (exclude soft-deleted users)
-		err := db.QueryRow(`SELECT COUNT(*) FROM emby_user WHERE deleted_at IS NULL`).Scan(&data.TotalUsers)
-		if err != nil {
-			log.Printf("[overview] Error counting users: %v", err)
-			return c.Status(500).JSON(fiber.Map{"error": "Failed to count users"})
-		}
+// overviewMinRefreshGap spaces out triggered refreshes, so a burst of
+// playback events recomputes the counts once rather than back to back.
+const overviewMinRefreshGap = 5 * time.Second
 
-		// Count unique library items using normalized paths and including pathless items
-		// Uses the same normalization as other stats endpoints for consistency
-		normalizedPath := normalizedFilePathExpr("")
-		query := fmt.Sprintf(`
-			SELECT COUNT(*) FROM (
-				-- Items with file paths: dedupe by normalized path
-				SELECT DISTINCT 'path:' || (%s) AS dedupe_key
-				FROM library_item
-				WHERE media_type NOT IN ('TvChannel', 'LiveTv', 'Channel', 'TvProgram')
-					AND file_path IS NOT NULL
-					AND TRIM(file_path) != ''
-				UNION
-				-- Items without file paths: count by ID (no cross-server deduplication possible)
-				SELECT DISTINCT 'id:' || id AS dedupe_key
-				FROM library_item
-				WHERE media_type NOT IN ('TvChannel', 'LiveTv', 'Channel', 'TvProgram')
-					AND (file_path IS NULL OR TRIM(file_path) = '')
-			)
-		`, normalizedPath)
-		
-		err = db.QueryRow(query).Scan(&data.TotalItems)
-		if err != nil {
-			log.Printf("[overview] Error counting library items: %v", err)
-			return c.Status(500).JSON(fiber.Map{"error": "Failed to count library items"})
+// Overview count failures. computeOverview logs the cause; Overview maps
+// these to the messages clients see.
+var (
+	errCountUsers       = errors.New("count users")
+	errCountItems       = errors.New("count library items")
+	errCountPlays       = errors.New("count play sessions")
+	errCountUniquePlays = errors.New("count unique plays")
+)
+
+func overviewErrorMessage(err error) string {
+	switch {
+	case errors.Is(err, errCountUsers):
+		return "Failed to count users"
+	case errors.Is(err, errCountItems):
+		return "Failed to count library items"
+	case errors.Is(err, errCountPlays):
+		return "Failed to count play sessions"
+	case errors.Is(err, errCountUniquePlays):
+		return "Failed to count unique plays"
+	default:
+		return "Failed to load overview"
+	}
+}
+
+// overviewSnapshot holds the latest background-computed counts served by
+// Overview and UsersTotal.
+var overviewSnapshot struct {
+	mu         sync.RWMutex
+	data       *OverviewData
+	usersTotal int
+}
+
+var overviewRefresh = make(chan struct{}, 1)
+
+// StartOverviewRefresher computes the overview counts now and then every
+// interval, or sooner when RefreshOverview is called.
+func StartOverviewRefresher(db *sql.DB, interval time.Duration) {
+	go func() {
+		ticker := time.NewTicker(interval)
+		defer ticker.Stop()
+		for {
+			refreshOverview(db)
+			last := time.Now()
+			select {
+			case <-ticker.C:
+			case <-overviewRefresh:
+				if wait := overviewMinRefreshGap - time.Since(last); wait > 0 {
+					time.Sleep(wait)
+				}
+			}
 		}
+	}()
+}
 
-		// Count total play sessions (exclude Live TV)
-		err = db.QueryRow(`SELECT COUNT(*) FROM play_sessions WHERE started_at IS NOT NULL AND COALESCE(item_type,'') NOT IN ('TvChannel','LiveTv','Channel','TvProgram')`).Scan(&data.TotalPlays)
-		if err != nil {
-			log.Printf("[overview] Error counting play sessions: %v", err)
-			return c.Status(500).JSON(fiber.Map{"error": "Failed to count play sessions"})
+// RefreshOverview asks the background refresher to recompute the overview
+// counts. It never blocks.
+func RefreshOverview() {
+	select {
+	case overviewRefresh <- struct{}{}:
+	default:
+	}
+}
+
+func refreshOverview(db *sql.DB) {
+	data, err := computeOverview(db)
+	if err != nil {
+		return
+	}
+	var usersTotal int
+	if err := db.QueryRow(`SELECT COUNT(*) FROM emby_user`).Scan(&usersTotal); err != nil {
+		log.Printf("[overview] Error counting all users: %v", err)
+		return
+	}
+	overviewSnapshot.mu.Lock()
+	overviewSnapshot.data = &data
+	overviewSnapshot.usersTotal = usersTotal
+	overviewSnapshot.mu.Unlock()
+}
+
+func Overview(db *sql.DB) fiber.Handler {
+	return func(c fiber.Ctx) error {
+		overviewSnapshot.mu.RLock()
+		snap := overviewSnapshot.data
+		overviewSnapshot.mu.RUnlock()
+		if snap != nil {
+			return c.JSON(*snap)
 		}
 
-		// Count unique items played (exclude Live TV)
-		err = db.QueryRow(`SELECT COUNT(DISTINCT item_id) FROM play_sessions WHERE started_at IS NOT NULL AND COALESCE(item_type,'') NOT IN ('TvChannel','LiveTv','Channel','TvProgram')`).Scan(&data.UniquePlays)
+		// Nothing computed yet (or the refresher isn't running): query directly.
+		data, err := computeOverview(db)
 		if err != nil {
-			log.Printf("[overview] Error counting unique plays: %v", err)
-			return c.Status(500).JSON(fiber.Map{"error": "Failed to count unique plays"})
+			return c.Status(500).JSON(fiber.Map{"error": overviewErrorMessage(err)})
 		}
+		return c.JSON(data)
+	}
+}
 
-		duration := time.Since(start)
-		isSlowQuery := duration > 1*time.Second
-		if isSlowQuery {
-			log.Printf("[overview] WARNING: Slow query took %v", duration)
-		}
+// computeOverview runs the overview counts. Errors are logged here; the
+// returned error identifies which count failed.
+func computeOverview(db *sql.DB) (OverviewData, error) {
+	start := time.Now()
+	data := OverviewData{}
 
-		// Track metrics
-		admin.IncrementQueryMetrics(duration, isSlowQuery)
+	// Count users (exclude soft-deleted users)
+	err := db.QueryRow(`SELECT COUNT(*) FROM emby_user WHERE deleted_at IS NULL`).Scan(&data.TotalUsers)
+	if err != nil {
+		log.Printf("[overview] Error counting users: %v", err)
+		return data, errCountUsers
+	}
 
-		log.Printf("[overview] Successfully fetched data in %v: users=%d, items=%d, plays=%d, unique=%d",
-			duration, data.TotalUsers, data.TotalItems, data.TotalPlays, data.UniquePlays)
+	// Count unique library items using normalized paths and including pathless items
+	// Uses the same normalization as other stats endpoints for consistency
+	normalizedPath := normalizedFilePathExpr("")
+	query := fmt.Sprintf(`
+		SELECT COUNT(*) FROM (
+			-- Items with file paths: dedupe by normalized path
+			SELECT DISTINCT 'path:' || (%s) AS dedupe_key
+			FROM library_item
+			WHERE media_type NOT IN ('TvChannel', 'LiveTv', 'Channel', 'TvProgram')
+				AND file_path IS NOT NULL
+				AND TRIM(file_path) != ''
+			UNION
+			-- Items without file paths: count by ID (no cross-server deduplication possible)
+			SELECT DISTINCT 'id:' || id AS dedupe_key
+			FROM library_item
+			WHERE media_type NOT IN ('TvChannel', 'LiveTv', 'Channel', 'TvProgram')
+				AND (file_path IS NULL OR TRIM(file_path) = '')
+		)
+	`, normalizedPath)
 
-		return c.JSON(data)
+	err = db.QueryRow(query).Scan(&data.TotalItems)
+	if err != nil {
+		log.Printf("[overview] Error counting library items: %v", err)
+		return data, errCountItems
 	}
+
+	// Count total play sessions (exclude Live TV)
+	err = db.QueryRow(`SELECT COUNT(*) FROM play_sessions WHERE started_at IS NOT NULL AND COALESCE(item_type,'') NOT IN ('TvChannel','LiveTv','Channel','TvProgram')`).Scan(&data.TotalPlays)
+	if err != nil {
+		log.Printf("[overview] Error counting play sessions: %v", err)
+		return data, errCountPlays
+	}
+
+	// Count unique items played (exclude Live TV)
+	err = db.QueryRow(`SELECT COUNT(DISTINCT item_id) FROM play_sessions WHERE started_at IS NOT NULL AND COALESCE(item_type,'') NOT IN ('TvChannel','LiveTv','Channel','TvProgram')`).Scan(&data.UniquePlays)
+	if err != nil {
+		log.Printf("[overview] Error counting unique plays: %v", err)
+		return data, errCountUniquePlays
+	}
+
+	duration := time.Since(start)
+	isSlowQuery := duration > 1*time.Second
+	if isSlowQuery {
+		log.Printf("[overview] WARNING: Slow query took %v", duration)
+	}
+
+	// Track metrics
+	admin.IncrementQueryMetrics(duration, isSlowQuery)
+
+	logging.Debug("Overview counts computed", "duration", duration, "users", data.TotalUsers,
+		"items", data.TotalItems, "plays", data.TotalPlays, "unique", data.UniquePlays)
+
+	return data, nil
 }
@@ -4,10 +4,14 @@ import (
 	"database/sql"
 	"fmt"
 	"regexp"
+	"strings"
 
 	"github.com/gofiber/fiber/v3"
 )
 
+// qualityTitleRe is compiled once; getQualityLabel runs for every row of /stats/qualities.
+var qualityTitleRe = regexp.MustCompile(`(?i)\b(8k|4k|2160p|1440p|1080p|720p|576p|540p|480p|360p)\b`)
+
 // getQualityLabel now classifies by WIDTH to match the Emby plugin logic.
 // It also falls back to DisplayTitle parsing if width is absent.
 func getQualityLabel(width sql.NullInt64, displayTitle sql.NullString) string {
@@ -31,9 +35,8 @@ func getQualityLabel(width sql.NullInt64, displayTitle sql.NullString) string {
 
 	// Fallback: infer from DisplayTitle (e.g., "8K", "4K", "2160p", "1080p", "720p", "576p/540p/480p/360p").
 	if displayTitle.Valid && displayTitle.String != "" {
-		re := regexp.MustCompile(`(?i)\b(8k|4k|2160p|1440p|1080p|720p|576p|540p|480p|360p)\b`)
-		if m := re.FindStringSubmatch(displayTitle.String); len(m) > 0 {
-			switch m[1] {
+		if m := qualityTitleRe.FindStringSubmatch(displayTitle.String); len(m) > 0 {
+			switch strings.ToLower(m[1]) {
 			case "8k":
 				return "8K"
 			case "4k", "2160p":
@@ -61,10 +64,14 @@ func Qualities(db *sql.DB) fiber.Handler {
 
 		condition := excludeLiveTvFilter()
 		condition, args := appendServerFilter(condition, "", serverType, serverID)
+		// Rows are grouped by raw width, so one row comes back per distinct
+		// resolution, and labelled in Go by getQualityLabel; the width ranges
+		// live in one place. Items without a usable width are grouped by
+		// display_title instead and labelled from the title.
 		q := fmt.Sprintf(`
 			WITH base AS (
 				SELECT
-					width,
+					CASE WHEN width BETWEEN 1 AND 7680 THEN width END AS width,
 					display_title,
 					%s AS media_type
 				FROM library_item
@@ -72,12 +79,12 @@ func Qualities(db *sql.DB) fiber.Handler {
 			)
 			SELECT
 				width,
-				display_title,
-				media_type,
-				COUNT(*) AS count
+				CASE WHEN width IS NULL THEN display_title END AS title,
+				SUM(media_type = 'Movie') AS movies,
+				SUM(media_type = 'Episode') AS episodes
 			FROM base
 			WHERE media_type IN ('Movie', 'Episode')
-			GROUP BY width, display_title, media_type
+			GROUP BY width, title
 		`, normalizedMediaTypeExpr(""), condition)
 
 		rows, err := db.Query(q, args...)
@@ -89,35 +96,25 @@ func Qualities(db *sql.DB) fiber.Handler {
 		}
 		defer rows.Close()
 
-		// NOTE: MediaTypeCounts is assumed to be defined in this package (same as codecs endpoint).
-		// If it isn't, define it as:
-		// type MediaTypeCounts struct { Movie int `json:"movie"`; Episode int `json:"episode"` }
 		buckets := make(map[string]MediaTypeCounts)
 
 		for rows.Next() {
 			var width sql.NullInt64
 			var displayTitle sql.NullString
-			var mediaType string
-			var count int
+			var movies, episodes int
 
-			if err := rows.Scan(&width, &displayTitle, &mediaType, &count); err != nil {
+			if err := rows.Scan(&width, &displayTitle, &movies, &episodes); err != nil {
 				return c.Status(fiber.StatusInternalServerError).JSON(fiber.Map{
 					"error":   "scan failed",
 					"details": err.Error(),
 				})
 			}
 
-			label := getQualityLabel(width, displayTitle)
-			b := buckets[label] // zero-value if missing
-
-			switch mediaType {
-			case "Movie":
-				b.Movie += count
-			case "Episode":
-				b.Episode += count
-			}
-
-			buckets[label] = b
+			key := getQualityLabel(width, displayTitle)
+			b := buckets[key] // zero-value if missing
+			b.Movie += movies
+			b.Episode += episodes
+			buckets[key] = b
 		}
 
 		if err := rows.Err(); err != nil {
@@ -9,7 +9,6 @@ import (
 	"fmt"
 	"sort"
 	"strings"
-	"time"
 
 	"github.com/gofiber/fiber/v3"
 )
@@ -44,45 +43,13 @@ func TopItems(db *sql.DB, em *emby.Client) fiber.Handler {
 	return func(c fiber.Ctx) error {
 		rawServer := c.Query("server", "")
 		serverTypeFilter, serverIDFilter := normalizeServerParam(rawServer)
-		timeframe := c.Query("timeframe", "")
-		if timeframe == "" {
-			// Fallback to days parameter if timeframe not provided
-			days := parseQueryInt(c, "days", 14)
-			if days <= 0 {
-				timeframe = "all-time"
-			} else if days == 1 {
-				timeframe = "1d"
-			} else if days == 3 {
-				timeframe = "3d"
-			} else if days == 7 {
-				timeframe = "7d"
-			} else if days == 14 {
-				timeframe = "14d"
-			} else if days == 30 {
-				timeframe = "30d"
-			} else {
-				timeframe = "30d" // Default for large day values
-			}
-		}
-		if timeframe == "" {
-			timeframe = "14d" // Final fallback
-		}
+		_, winStart, winEnd := parseWatchWindow(c)
 
 		limit := parseQueryInt(c, "limit", 10)
 		if limit <= 0 || limit > 100 {
 			limit = 10
 		}
 
-		days := parseTimeframeToDays(timeframe)
-		now := time.Now().UTC()
-		winEnd := now.Unix()
-		winStart := now.AddDate(0, 0, -days).Unix()
-
-		if timeframe == "all-time" {
-			winStart = 0
-			winEnd = now.AddDate(100, 0, 0).Unix()
-		}
-
 		// 1. Get historical data (broad candidate set)
 		historicalRows, err := queries.TopItemsByWatchSeconds(c, db, winStart, winEnd, 1000)
 		// If the primary query errors, don't fail hard; attempt fallback path below
@@ -137,14 +104,15 @@ func TopItems(db *sql.DB, em *emby.Client) fiber.Handler {
 			candidateIDs[row.ItemID] = struct{}{}
 		}
 
-		// 2.5. Always supplement from play_intervals to include items missing from library_item.
-		// This is a broad query to ensure any item with any watch history is a candidate.
+		// 2.5. Always supplement from the daily rollup to include items missing from library_item.
+		// Any item watched in the window is a candidate, including ones whose only
+		// in-window time comes from an interval that started well before it; the
+		// bounds are shared with the window totals in the queries package.
 		// The exact time clamping is handled robustly in computeExactItemHours.
 		{
-			intervalRows, err := db.Query(`
-                SELECT DISTINCT l.item_id, 0.0 as hours
-                FROM play_intervals l
-            `)
+			// Names and types come back with the ids in the same pass instead
+			// of one library_item lookup per id.
+			intervalRows, err := db.Query(queries.WindowItemsQuery, queries.WindowWatchArgs(winStart, winEnd)...)
 
 			if err == nil {
 				defer intervalRows.Close()
@@ -152,20 +120,19 @@ func TopItems(db *sql.DB, em *emby.Client) fiber.Handler {
 
 				for intervalRows.Next() {
 					var itemID string
-					var hours float64
-					if err := intervalRows.Scan(&itemID, &hours); err == nil {
+					var name, itemType sql.NullString
+					if err := intervalRows.Scan(&itemID, &name, &itemType); err == nil {
 						// Track as candidate; exact computation performed below
 						candidateIDs[itemID] = struct{}{}
 
 						// Ensure we have details; if missing in library_item, mark for fetch
 						if _, ok := itemDetails[itemID]; !ok {
-							var name, itemType string
-							scanErr := db.QueryRow("SELECT name, media_type FROM library_item WHERE id = ?", itemID).Scan(&name, &itemType)
-							if scanErr != nil {
+							// NULLs mean no library_item row (or an incomplete one)
+							if !name.Valid || !itemType.Valid {
 								missingItemIDs = append(missingItemIDs, itemID)
 								itemDetails[itemID] = TopItem{ItemID: itemID, Name: "Loading...", Type: "Unknown"}
 							} else {
-								itemDetails[itemID] = TopItem{ItemID: itemID, Name: name, Type: itemType}
+								itemDetails[itemID] = TopItem{ItemID: itemID, Name: name.String, Type: itemType.String}
 							}
 						}
 					}
@@ -378,15 +345,16 @@ func computeExactItemHours(db *sql.DB, itemIDs []string, winStart, winEnd int64)
 		return out, nil
 	}
 
+	placeholders := make([]string, len(itemIDs))
+	args := make([]any, 0, len(itemIDs)+2)
+	for i, id := range itemIDs {
+		placeholders[i] = "?"
+		args = append(args, id)
+	}
+
 	// Fetch runtime per item (seconds) if available to cap per-session durations for Movies
 	runtimeSec := make(map[string]float64)
 	{
-		placeholders := make([]string, len(itemIDs))
-		args := make([]any, 0, len(itemIDs))
-		for i, id := range itemIDs {
-			placeholders[i] = "?"
-			args = append(args, id)
-		}
 		q := fmt.Sprintf(`SELECT id, COALESCE(run_time_ticks,0) FROM library_item WHERE id IN (%s)`, strings.Join(placeholders, ","))
 		rows, err := db.Query(q, args...)
 		if err == nil {
@@ -403,25 +371,18 @@ func computeExactItemHours(db *sql.DB, itemIDs []string, winStart, winEnd int64)
 		}
 	}
 
-	// Build IN clause placeholders
-	placeholders := make([]string, len(itemIDs))
-	args := make([]any, 0, len(itemIDs)+2)
-	for i, id := range itemIDs {
-		placeholders[i] = "?"
-		args = append(args, id)
-	}
-	args = append(args, winEnd, winStart) // for clamp and filter
-
+	// Only per-interval sums are taken below, so rows can come back in index
+	// order: no session join and no ORDER BY means the covering
+	// (item_id, end_ts, start_ts, duration_seconds) index answers the query
+	// without a temp sort.
 	query := fmt.Sprintf(`
-        SELECT pi.item_id, ps.session_id, pi.start_ts, pi.end_ts, pi.duration_seconds
+        SELECT pi.item_id, pi.start_ts, pi.end_ts, pi.duration_seconds
         FROM play_intervals pi
-        JOIN play_sessions ps ON ps.id = pi.session_fk
         WHERE pi.item_id IN (%s)
           AND pi.start_ts <= ? AND pi.end_ts >= ?
-        ORDER BY pi.item_id, ps.session_id, pi.start_ts, pi.end_ts
     `, strings.Join(placeholders, ","))
 
-	rows, err := db.Query(query, args...)
+	rows, err := db.Query(query, append(args, winEnd, winStart)...)
 	if err != nil {
 		return nil, err
 	}
@@ -431,10 +392,9 @@ func computeExactItemHours(db *sql.DB, itemIDs []string, winStart, winEnd int64)
 	// Accumulate per item using per-interval capped seconds; no need to merge
 	for rows.Next() {
 		var item string
-		var sess string
 		var s, e int64
 		var dur int64
-		if err := rows.Scan(&item, &sess, &s, &e, &dur); err != nil {
+		if err := rows.Scan(&item, &s, &e, &dur); err != nil {
 			return nil, err
 		}
 		// Clamp to window
@@ -2,7 +2,6 @@ package stats
 
 import (
 	"database/sql"
-	"time"
 
 	"github.com/gofiber/fiber/v3"
 )
@@ -16,39 +15,12 @@ type TopSeriesRow struct {
 // TopSeries aggregates watch time per series across episodes within a time window.
 func TopSeries(db *sql.DB) fiber.Handler {
 	return func(c fiber.Ctx) error {
-		timeframe := c.Query("timeframe", "")
-		if timeframe == "" {
-			days := parseQueryInt(c, "days", 14)
-			switch {
-			case days <= 0:
-				timeframe = "all-time"
-			case days == 1:
-				timeframe = "1d"
-			case days == 3:
-				timeframe = "3d"
-			case days == 7:
-				timeframe = "7d"
-			case days == 14:
-				timeframe = "14d"
-			case days == 30:
-				timeframe = "30d"
-			default:
-				timeframe = "30d"
-			}
-		}
+		_, winStart, winEnd := parseWatchWindow(c)
 		limit := parseQueryInt(c, "limit", 10)
 		if limit <= 0 || limit > 100 {
 			limit = 10
 		}
 
-		now := time.Now().UTC()
-		winEnd := now.Unix()
-		winStart := now.AddDate(0, 0, -parseTimeframeToDays(timeframe)).Unix()
-		if timeframe == "all-time" {
-			winStart = 0
-			winEnd = now.AddDate(100, 0, 0).Unix()
-		}
-
 		// Prefer series_id grouping when available, otherwise group by derived series name.
 		// Sum overlap within window using MIN/MAX clamp.
 		rows, err := db.Query(`
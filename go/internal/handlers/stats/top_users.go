@@ -7,7 +7,7 @@ import (
 	"emby-analytics/internal/queries"
 	"emby-analytics/internal/tasks"
 	"sort"
-	"time"
+	"strings"
 
 	"github.com/gofiber/fiber/v3"
 )
@@ -23,29 +23,7 @@ type TopUser struct {
 func TopUsers(db *sql.DB, mgr *media.MultiServerManager) fiber.Handler {
 	return func(c fiber.Ctx) error {
 		// --- Parameter Parsing ---
-		timeframe := c.Query("timeframe", "")
-		if timeframe == "" {
-			// Fallback to days parameter if timeframe not provided
-			days := parseQueryInt(c, "days", 14)
-			if days <= 0 {
-				timeframe = "all-time"
-			} else if days == 1 {
-				timeframe = "1d"
-			} else if days == 3 {
-				timeframe = "3d"
-			} else if days == 7 {
-				timeframe = "7d"
-			} else if days == 14 {
-				timeframe = "14d"
-			} else if days == 30 {
-				timeframe = "30d"
-			} else {
-				timeframe = "30d" // Default for large day values
-			}
-		}
-		if timeframe == "" {
-			timeframe = "14d" // Final fallback
-		}
+		allTime, winStart, winEnd := parseWatchWindow(c)
 
 		limit := parseQueryInt(c, "limit", 10)
 		if limit <= 0 || limit > 100 {
@@ -53,7 +31,7 @@ func TopUsers(db *sql.DB, mgr *media.MultiServerManager) fiber.Handler {
 		}
 
 		// --- "All-Time" Logic with dynamic Trakt calculation ---
-		if timeframe == "all-time" {
+		if allTime {
 			// Get the setting for whether to include Trakt items
 			includeTrakt := settings.GetSettingBool(db, "include_trakt_items", false)
 
@@ -96,11 +74,6 @@ func TopUsers(db *sql.DB, mgr *media.MultiServerManager) fiber.Handler {
 		}
 
 		// --- Live-Aware Time-Windowed Logic ---
-		days := parseTimeframeToDays(timeframe)
-		now := time.Now().UTC()
-		winEnd := now.Unix()
-		winStart := now.AddDate(0, 0, -days).Unix()
-
 		// 1. Get historical data from the database (fetch a high number to merge before limiting)
 		historicalRows, err := queries.TopUsersByWatchSeconds(c, db, winStart, winEnd, 1000)
 		if err != nil {
@@ -113,13 +86,14 @@ func TopUsers(db *sql.DB, mgr *media.MultiServerManager) fiber.Handler {
         SELECT 
             u.id, 
             u.name, 
+            u.server_id,
             COUNT(DISTINCT ps.id) * 0.5 as hours
         FROM emby_user u
         LEFT JOIN play_sessions ps ON ps.user_id = u.id
         LEFT JOIN library_item li ON li.id = ps.item_id
         WHERE ps.started_at >= ? AND ps.started_at <= ?
           AND (li.id IS NULL OR `+excludeLiveTvFilter()+`)
-        GROUP BY u.id, u.name
+        GROUP BY u.id, u.name, u.server_id
         ORDER BY hours DESC
         LIMIT ?
     `, winStart, winEnd, 1000)
@@ -136,50 +110,78 @@ func TopUsers(db *sql.DB, mgr *media.MultiServerManager) fiber.Handler {
 			}
 		}
 
-		// 2. Prepare to combine historical and live data
-		combinedHours := make(map[string]float64)
-		userNames := make(map[string]string)
-		userServers := make(map[string]string)
-
+		// 2. Build the response rows directly from the historical data, keeping
+		// an index so live watch time can be merged in place.
+		finalResult := make([]TopUser, 0, len(historicalRows))
+		byUser := make(map[string]int, len(historicalRows))
 		for _, row := range historicalRows {
-			combinedHours[row.UserID] += row.Hours
-			userNames[row.UserID] = row.Name
-			userServers[row.UserID] = row.ServerID
+			if i, ok := byUser[row.UserID]; ok {
+				finalResult[i].Hours += row.Hours
+				continue
+			}
+			byUser[row.UserID] = len(finalResult)
+			finalResult = append(finalResult, TopUser{
+				UserID:   row.UserID,
+				Name:     row.Name,
+				ServerID: row.ServerID,
+				Hours:    row.Hours,
+			})
 		}
 
 		// 3. Get live data from the Intervalizer and merge it
 		// Live contribution (exclude LiveTV)
 		liveWatchTimes := tasks.GetLiveUserWatchTimesExcludingLiveTV() // Returns seconds
+		var liveOnly []string
 		for userID, seconds := range liveWatchTimes {
-			combinedHours[userID] += seconds / 3600.0 // Convert seconds to hours
-			// Ensure we have a username, even if the user only has a live session
-			if _, ok := userNames[userID]; !ok {
-				var name string
-				// This query is fast and only runs for new users with live sessions
-				_ = db.QueryRow("SELECT name FROM emby_user WHERE id = ?", userID).Scan(&name)
-				userNames[userID] = name
+			if i, ok := byUser[userID]; ok {
+				finalResult[i].Hours += seconds / 3600.0 // Convert seconds to hours
+				continue
+			}
+			byUser[userID] = len(finalResult)
+			finalResult = append(finalResult, TopUser{UserID: userID, Hours: seconds / 3600.0})
+			liveOnly = append(liveOnly, userID)
+		}
+		// Users who only have a live session are looked up in one query.
+		if len(liveOnly) > 0 {
+			placeholders := make([]string, len(liveOnly))
+			args := make([]any, len(liveOnly))
+			for i, id := range liveOnly {
+				placeholders[i] = "?"
+				args[i] = id
+			}
+			rows, err := db.Query(`SELECT id, name, server_id FROM emby_user WHERE id IN (`+strings.Join(placeholders, ",")+`)`, args...)
+			if err == nil {
+				for rows.Next() {
+					var id, name string
+					var serverID sql.NullString
+					if rows.Scan(&id, &name, &serverID) == nil {
+						u := &finalResult[byUser[id]]
+						u.Name = name
+						u.ServerID = serverID.String
+					}
+				}
+				err = rows.Err()
+				rows.Close()
+				if err != nil {
+					return c.Status(500).JSON(fiber.Map{"error": err.Error()})
+				}
 			}
 		}
 
-		// 4. Convert the combined map back to a slice for sorting
+		// 4. Drop users we have no name for and resolve server names
 		configs := mgr.GetServerConfigs()
-		finalResult := make([]TopUser, 0, len(combinedHours))
-		for userID, hours := range combinedHours {
-			if userNames[userID] != "" { // Only include users we have a name for
-				serverID := userServers[userID]
-				serverName := serverID
-				if cfg, ok := configs[serverID]; ok {
-					serverName = cfg.Name
-				}
-				finalResult = append(finalResult, TopUser{
-					UserID:     userID,
-					Name:       userNames[userID],
-					ServerID:   serverID,
-					ServerName: serverName,
-					Hours:      hours,
-				})
+		named := finalResult[:0]
+		for _, u := range finalResult {
+			if u.Name == "" { // Only include users we have a name for
+				continue
+			}
+			u.ServerName = u.ServerID
+			if cfg, ok := configs[u.ServerID]; ok {
+				u.ServerName = cfg.Name
 			}
+			named = append(named, u)
 		}
+		finalResult = named
 
 		// 5. Sort the final combined list by hours, descending
 		sort.Slice(finalResult, func(i, j int) bool {
@@ -6,6 +6,7 @@ import (
 
 	"github.com/gofiber/fiber/v3"
 
+	dbutil "emby-analytics/internal/db"
 	"emby-analytics/internal/media"
 )
 
@@ -17,6 +18,25 @@ type UsageRow struct {
 	Hours      float64 `json:"hours"`
 }
 
+// usageQuery reads play_daily_user_usage, a per-day, per-user rollup of
+// play_intervals maintained by triggers (migrations 0023/0024/0029), bucketed
+// by interval start day with Live TV already excluded, including items
+// classified after they were watched. It is constant so the prepared
+// statement can be reused.
+const usageQuery = `
+    SELECT
+        d.day,
+        u.name,
+        u.server_id,
+        SUM(d.seconds) / 3600.0 AS hours
+    FROM play_daily_user_usage d
+    JOIN emby_user u ON u.id = d.user_id AND u.deleted_at IS NULL
+    WHERE d.day >= strftime('%Y-%m-%d', ?, 'unixepoch')
+    GROUP BY d.day, u.name, u.server_id
+    HAVING hours > 0
+    ORDER BY d.day ASC, u.name ASC;
+`
+
 func Usage(db *sql.DB, mgr *media.MultiServerManager) fiber.Handler {
 	return func(c fiber.Ctx) error {
 		days := parseQueryInt(c, "days", 14)
@@ -24,62 +44,35 @@ func Usage(db *sql.DB, mgr *media.MultiServerManager) fiber.Handler {
 			days = 14
 		}
 
-		now := time.Now().UTC()
-		winEnd := now.Unix()
-		winStart := now.AddDate(0, 0, -days).Unix()
-
-		// CORRECTED & SIMPLIFIED: This query correctly calculates the overlap
-		// duration for each interval within the window and then sums it up per day and user.
-		query := `
-            SELECT
-                strftime('%Y-%m-%d', datetime(pi.start_ts, 'unixepoch')) AS day,
-                u.name,
-                u.server_id,
-                SUM(
-                    MAX(
-                        0,
-                        MIN(
-                            MIN(pi.end_ts, ?) - MAX(pi.start_ts, ?),
-                            CASE WHEN pi.duration_seconds IS NULL OR pi.duration_seconds <= 0
-                                 THEN (pi.end_ts - pi.start_ts)
-                                 ELSE pi.duration_seconds
-                            END
-                        )
-                    )
-                ) / 3600.0 AS hours
-            FROM play_intervals pi
-            JOIN emby_user u ON u.id = pi.user_id AND u.deleted_at IS NULL
-            LEFT JOIN library_item li ON li.id = pi.item_id
-            WHERE
-                pi.start_ts <= ? AND pi.end_ts >= ?
-                AND COALESCE(li.media_type, 'Unknown') NOT IN ('TvChannel', 'LiveTv', 'Channel', 'TvProgram')
-            GROUP BY day, u.name, u.server_id
-            ORDER BY day ASC, u.name ASC;
-        `
+		winStart := time.Now().UTC().AddDate(0, 0, -days).Unix()
 
-		rows, err := db.Query(query, winEnd, winStart, winEnd, winStart)
+		stmt, err := dbutil.Prepared(db, usageQuery)
+		if err != nil {
+			return c.Status(500).JSON(fiber.Map{"error": "usage query failed: " + err.Error()})
+		}
+		rows, err := stmt.Query(winStart)
 		if err != nil {
 			return c.Status(500).JSON(fiber.Map{"error": "usage query failed: " + err.Error()})
 		}
 		defer rows.Close()
 
-		out := []UsageRow{}
+		// Resolve server names while scanning so rows are only walked once.
+		configs := mgr.GetServerConfigs()
+		out := make([]UsageRow, 0, days*4)
 		for rows.Next() {
 			var r UsageRow
 			if err := rows.Scan(&r.Day, &r.User, &r.ServerID, &r.Hours); err != nil {
 				return c.Status(500).JSON(fiber.Map{"error": "failed to scan usage row: " + err.Error()})
 			}
-		    out = append(out, r)
-		}
-		
-		// Fill in server names
-		configs := mgr.GetServerConfigs()
-		for i := range out {
-			if cfg, ok := configs[out[i].ServerID]; ok {
-				out[i].ServerName = cfg.Name
+			if cfg, ok := configs[r.ServerID]; ok {
+				r.ServerName = cfg.Name
 			} else {
-				out[i].ServerName = out[i].ServerID
+				r.ServerName = r.ServerID
 			}
+			out = append(out, r)
+		}
+		if err := rows.Err(); err != nil {
+			return c.Status(500).JSON(fiber.Map{"error": "usage query failed: " + err.Error()})
 		}
 
 		return c.JSON(out)
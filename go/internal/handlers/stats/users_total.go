@@ -8,8 +8,12 @@ import (
 
 func UsersTotal(db *sql.DB) fiber.Handler {
 	return func(c fiber.Ctx) error {
-		total := 0
-		_ = db.QueryRow(`SELECT COUNT(*) FROM emby_user`).Scan(&total)
+		overviewSnapshot.mu.RLock()
+		total, ok := overviewSnapshot.usersTotal, overviewSnapshot.data != nil
+		overviewSnapshot.mu.RUnlock()
+		if !ok {
+			_ = db.QueryRow(`SELECT COUNT(*) FROM emby_user`).Scan(&total)
+		}
 		return c.JSON(fiber.Map{"total_users": total})
 	}
 }
@@ -0,0 +1,72 @@
+package itemcache
+
+import (
+	"container/list"
+	"sync"
+	"time"
+)
+
+// Cache is a size-bounded LRU with a per-entry TTL. The media server clients
+// use it for item lookups keyed by arbitrary id sets, which would otherwise
+// grow without limit over a long uptime.
+type Cache[V any] struct {
+	mu         sync.Mutex
+	ttl        time.Duration
+	maxEntries int
+	ll         *list.List
+	items      map[string]*list.Element
+}
+
+type entry[V any] struct {
+	key    string
+	value  V
+	stored time.Time
+}
+
+// New creates a cache holding at most maxEntries values for ttl each.
+func New[V any](ttl time.Duration, maxEntries int) *Cache[V] {
+	return &Cache[V]{
+		ttl:        ttl,
+		maxEntries: maxEntries,
+		ll:         list.New(),
+		items:      make(map[string]*list.Element),
+	}
+}
+
+// Get returns the value for key if it is present and not expired, marking it
+// as recently used. Expired entries are removed.
+func (c *Cache[V]) Get(key string) (V, bool) {
+	var zero V
+	c.mu.Lock()
+	defer c.mu.Unlock()
+	el, ok := c.items[key]
+	if !ok {
+		return zero, false
+	}
+	e := el.Value.(*entry[V])
+	if time.Since(e.stored) >= c.ttl {
+		c.ll.Remove(el)
+		delete(c.items, key)
+		return zero, false
+	}
+	c.ll.MoveToFront(el)
+	return e.value, true
+}
+
+// Set stores value under key, evicting the least recently used entries once
+// the cache is over capacity.
+func (c *Cache[V]) Set(key string, value V) {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+	if el, ok := c.items[key]; ok {
+		el.Value = &entry[V]{key: key, value: value, stored: time.Now()}
+		c.ll.MoveToFront(el)
+		return
+	}
+	c.items[key] = c.ll.PushFront(&entry[V]{key: key, value: value, stored: time.Now()})
+	for c.ll.Len() > c.maxEntries {
+		oldest := c.ll.Back()
+		c.ll.Remove(oldest)
+		delete(c.items, oldest.Value.(*entry[V]).key)
+	}
+}
@@ -0,0 +1,125 @@
+package itemcache
+
+import (
+	"strconv"
+	"testing"
+	"time"
+)
+
+func TestGetSet(t *testing.T) {
+	tests := []struct {
+		name    string
+		set     map[string]int
+		key     string
+		want    int
+		wantHit bool
+	}{
+		{"hit", map[string]int{"a": 1}, "a", 1, true},
+		{"miss", map[string]int{"a": 1}, "b", 0, false},
+		{"empty", nil, "a", 0, false},
+	}
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			c := New[int](time.Minute, 10)
+			for k, v := range tt.set {
+				c.Set(k, v)
+			}
+			got, ok := c.Get(tt.key)
+			if ok != tt.wantHit || got != tt.want {
+				t.Errorf("Get(%q) = %d, %v; want %d, %v", tt.key, got, ok, tt.want, tt.wantHit)
+			}
+		})
+	}
+}
+
+func TestTTLExpiry(t *testing.T) {
+	c := New[string](20*time.Millisecond, 10)
+	c.Set("a", "x")
+	if _, ok := c.Get("a"); !ok {
+		t.Fatal("expected a fresh entry")
+	}
+	time.Sleep(40 * time.Millisecond)
+	if _, ok := c.Get("a"); ok {
+		t.Error("expected the entry to expire")
+	}
+	if c.ll.Len() != 0 || len(c.items) != 0 {
+		t.Errorf("expired entry not removed: list=%d map=%d", c.ll.Len(), len(c.items))
+	}
+
+	// Overwriting an entry restarts its TTL.
+	c = New[string](100*time.Millisecond, 10)
+	c.Set("b", "1")
+	time.Sleep(60 * time.Millisecond)
+	c.Set("b", "2")
+	time.Sleep(60 * time.Millisecond)
+	if v, ok := c.Get("b"); !ok || v != "2" {
+		t.Errorf("Get(b) = %q, %v; want 2, true", v, ok)
+	}
+}
+
+func TestLRUEviction(t *testing.T) {
+	tests := []struct {
+		name    string
+		ops     []string // "set:k" or "get:k"
+		present []string
+		evicted []string
+	}{
+		{
+			name:    "oldest insert goes first",
+			ops:     []string{"set:a", "set:b", "set:c", "set:d"},
+			present: []string{"b", "c", "d"},
+			evicted: []string{"a"},
+		},
+		{
+			name:    "get refreshes recency",
+			ops:     []string{"set:a", "set:b", "set:c", "get:a", "set:d"},
+			present: []string{"a", "c", "d"},
+			evicted: []string{"b"},
+		},
+		{
+			name:    "overwrite refreshes recency",
+			ops:     []string{"set:a", "set:b", "set:c", "set:a", "set:d", "set:e"},
+			present: []string{"a", "d", "e"},
+			evicted: []string{"b", "c"},
+		},
+	}
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			c := New[string](time.Minute, 3)
+			for _, op := range tt.ops {
+				switch op[:4] {
+				case "set:":
+					c.Set(op[4:], op[4:])
+				case "get:":
+					c.Get(op[4:])
+				}
+			}
+			for _, k := range tt.evicted {
+				if _, ok := c.items[k]; ok {
+					t.Errorf("expected %q evicted", k)
+				}
+			}
+			for _, k := range tt.present {
+				if _, ok := c.Get(k); !ok {
+					t.Errorf("expected %q present", k)
+				}
+			}
+		})
+	}
+}
+
+func TestCapacityBound(t *testing.T) {
+	const capacity = 50
+	c := New[int](time.Minute, capacity)
+	for i := 0; i < 10*capacity; i++ {
+		c.Set(strconv.Itoa(i), i)
+		if c.ll.Len() > capacity || len(c.items) > capacity {
+			t.Fatalf("cache grew past %d entries: list=%d map=%d", capacity, c.ll.Len(), len(c.items))
+		}
+	}
+	for i := 9 * capacity; i < 10*capacity; i++ {
+		if v, ok := c.Get(strconv.Itoa(i)); !ok || v != i {
+			t.Errorf("expected recent key %d present", i)
+		}
+	}
+}
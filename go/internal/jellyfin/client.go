@@ -5,17 +5,22 @@ import (
 	"encoding/json"
 	"fmt"
 	"io"
+	"net"
 	"net/http"
 	"net/url"
 	"sort"
 	"strconv"
 	"strings"
-	"sync"
 	"time"
 
+	"emby-analytics/internal/itemcache"
 	"emby-analytics/internal/media"
 )
 
+// maxCachedItemSets bounds the item lookup cache. Keys are id sets, so
+// without a cap it keeps growing for as long as the process runs.
+const maxCachedItemSets = 1000
+
 // Client represents a Jellyfin Media Server client
 type Client struct {
 	serverID    string
@@ -24,8 +29,7 @@ type Client struct {
 	apiKey      string
 	externalURL string
 	http        *http.Client
-	cache       sync.Map
-	cacheTTL    time.Duration
+	cache       *itemcache.Cache[[]media.MediaItem]
 }
 
 // New creates a new Jellyfin client
@@ -36,13 +40,22 @@ func New(config media.ServerConfig) *Client {
 		baseURL:     strings.TrimRight(config.BaseURL, "/"),
 		apiKey:      config.APIKey,
 		externalURL: config.ExternalURL,
-		cacheTTL:    time.Hour,
+		cache:       itemcache.New[[]media.MediaItem](time.Hour, maxCachedItemSets),
 		http: &http.Client{
 			Timeout: 30 * time.Second,
+			// Keep enough idle connections per host for concurrent page
+			// fetches and pollers; the default of 2 forces fresh handshakes.
+			// HTTP/2 has to be requested explicitly on a custom Transport; with it,
+			// HTTPS servers multiplex those requests over one connection.
 			Transport: &http.Transport{
-				MaxIdleConns:       10,
-				IdleConnTimeout:    30 * time.Second,
-				DisableCompression: false,
+				Proxy:               http.ProxyFromEnvironment,
+				ForceAttemptHTTP2:   true,
+				DialContext:         (&net.Dialer{Timeout: 5 * time.Second, KeepAlive: 30 * time.Second}).DialContext,
+				MaxIdleConns:        32,
+				MaxIdleConnsPerHost: 16,
+				IdleConnTimeout:     90 * time.Second,
+				TLSHandshakeTimeout: 10 * time.Second,
+				DisableCompression:  false,
 			},
 		},
 	}
@@ -232,30 +245,46 @@ func (c *Client) doWithRetry(req *http.Request, maxRetries int) (*http.Response,
 
 // readJSON reads and parses JSON response
 func readJSON(resp *http.Response, dst interface{}) error {
-	defer resp.Body.Close()
+	defer func() {
+		// Drain what the decoder left so the connection can be reused.
+		_, _ = io.Copy(io.Discard, resp.Body)
+		resp.Body.Close()
+	}()
 
-	body, err := io.ReadAll(resp.Body)
-	if err != nil {
-		return fmt.Errorf("read body: %w", err)
+	if resp.StatusCode != http.StatusOK {
+		snippet, _ := io.ReadAll(io.LimitReader(resp.Body, 241))
+		return fmt.Errorf("http %d from %s: %s", resp.StatusCode, resp.Request.URL.String(), truncateSnippet(snippet))
 	}
 
-	if resp.StatusCode != http.StatusOK {
-		snippet := string(body)
-		if len(snippet) > 240 {
-			snippet = snippet[:240] + "…"
-		}
-		return fmt.Errorf("http %d from %s: %s", resp.StatusCode, resp.Request.URL.String(), snippet)
+	// Decode straight from the connection; item pages run to megabytes and
+	// buffering them first only to scan them again is wasted work. The head
+	// of the body is kept for the error message.
+	head := &headCapture{max: 241}
+	if err := json.NewDecoder(io.TeeReader(resp.Body, head)).Decode(dst); err != nil {
+		return fmt.Errorf("decode json from %s: %w; body: %q", resp.Request.URL.String(), err, truncateSnippet(head.buf))
 	}
+	return nil
+}
 
-	if err := json.Unmarshal(body, dst); err != nil {
-		snippet := string(body)
-		if len(snippet) > 240 {
-			snippet = snippet[:240] + "…"
-		}
-		return fmt.Errorf("decode json from %s: %w; body: %q", resp.Request.URL.String(), err, snippet)
+// headCapture keeps the first max bytes written to it and discards the rest.
+type headCapture struct {
+	buf []byte
+	max int
+}
+
+func (h *headCapture) Write(p []byte) (int, error) {
+	if room := h.max - len(h.buf); room > 0 {
+		h.buf = append(h.buf, p[:min(room, len(p))]...)
 	}
+	return len(p), nil
+}
 
-	return nil
+func truncateSnippet(b []byte) string {
+	snippet := string(b)
+	if len(snippet) > 240 {
+		snippet = snippet[:240] + "…"
+	}
+	return snippet
 }
 
 // GetActiveSessions returns active Jellyfin sessions
@@ -263,6 +292,9 @@ func (c *Client) GetActiveSessions() ([]media.Session, error) {
 	u := fmt.Sprintf("%s/Sessions", c.baseURL)
 	q := url.Values{}
 	q.Set("api_key", c.apiKey)
+	// Skip idle registered devices server-side; paused playback still reports
+	// well within this window.
+	q.Set("activeWithinSeconds", "960")
 
 	req, _ := http.NewRequest("GET", u+"?"+q.Encode(), nil)
 	req.Header.Set("X-Emby-Token", c.apiKey)
@@ -825,6 +857,9 @@ func (c *Client) GetUserData(userID string) ([]media.UserDataItem, error) {
 	q.Set("Fields", "UserData,RunTimeTicks")
 	q.Set("IncludeItemTypes", "Movie,Episode")
 	q.Set("Filters", "IsPlayed")
+	// Only ids, names and user data are read; leaving out image tags keeps
+	// the response, and decoding it, small for users with long histories.
+	q.Set("EnableImages", "false")
 
 	req, _ := http.NewRequest("GET", u+"?"+q.Encode(), nil)
 	req.Header.Set("X-Emby-Token", c.apiKey)
@@ -995,25 +1030,12 @@ func (c *Client) generateCacheKey(ids []string) string {
 	return fmt.Sprintf("jellyfin_items_%x", h.Sum(nil))
 }
 
-type cacheEntry struct {
-	data      []media.MediaItem
-	timestamp time.Time
-}
-
 func (c *Client) getCachedItems(cacheKey string) ([]media.MediaItem, bool) {
 	if cacheKey == "" {
 		return nil, false
 	}
 
-	if entry, exists := c.cache.Load(cacheKey); exists {
-		if cached, ok := entry.(cacheEntry); ok {
-			if time.Since(cached.timestamp) < c.cacheTTL {
-				return cached.data, true
-			}
-			c.cache.Delete(cacheKey)
-		}
-	}
-	return nil, false
+	return c.cache.Get(cacheKey)
 }
 
 func (c *Client) setCachedItems(cacheKey string, items []media.MediaItem) {
@@ -1021,9 +1043,5 @@ func (c *Client) setCachedItems(cacheKey string, items []media.MediaItem) {
 		return
 	}
 
-	entry := cacheEntry{
-		data:      items,
-		timestamp: time.Now(),
-	}
-	c.cache.Store(cacheKey, entry)
+	c.cache.Set(cacheKey, items)
 }
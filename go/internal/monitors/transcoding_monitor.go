@@ -154,11 +154,12 @@ func (tm *TranscodingMonitor) is4KContent(session emby.EmbySession) bool {
 	return false
 }
 
+// fourKMarkerPattern matches 4K resolution indicators in titles and paths.
+var fourKMarkerPattern = regexp.MustCompile(`\b(4k|2160p)\b`)
+
 // contains4KMarker checks if a string contains 4K resolution markers
 func (tm *TranscodingMonitor) contains4KMarker(text string) bool {
-	// Regex to match 4K resolution indicators
-	pattern := regexp.MustCompile(`\b(4k|2160p)\b`)
-	return pattern.MatchString(text)
+	return fourKMarkerPattern.MatchString(text)
 }
 
 // isVideoTranscoding determines if video is being transcoded in the session
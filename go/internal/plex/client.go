@@ -5,16 +5,21 @@ import (
 	"encoding/xml"
 	"fmt"
 	"io"
+	"net"
 	"net/http"
 	"net/url"
 	"sort"
 	"strings"
-	"sync"
 	"time"
 
+	"emby-analytics/internal/itemcache"
 	"emby-analytics/internal/media"
 )
 
+// maxCachedItemSets bounds the item lookup cache. Keys are id sets, so
+// without a cap it keeps growing for as long as the process runs.
+const maxCachedItemSets = 1000
+
 // Client represents a Plex Media Server client
 type Client struct {
 	serverID    string
@@ -23,8 +28,7 @@ type Client struct {
 	token       string
 	externalURL string
 	http        *http.Client
-	cache       sync.Map
-	cacheTTL    time.Duration
+	cache       *itemcache.Cache[[]media.MediaItem]
 }
 
 // New creates a new Plex client
@@ -35,13 +39,22 @@ func New(config media.ServerConfig) *Client {
 		baseURL:     strings.TrimRight(config.BaseURL, "/"),
 		token:       config.APIKey,
 		externalURL: config.ExternalURL,
-		cacheTTL:    time.Hour,
+		cache:       itemcache.New[[]media.MediaItem](time.Hour, maxCachedItemSets),
 		http: &http.Client{
 			Timeout: 30 * time.Second,
+			// Keep enough idle connections per host for concurrent page
+			// fetches and pollers; the default of 2 forces fresh handshakes.
+			// HTTP/2 has to be requested explicitly on a custom Transport; with it,
+			// HTTPS servers multiplex those requests over one connection.
 			Transport: &http.Transport{
-				MaxIdleConns:       10,
-				IdleConnTimeout:    30 * time.Second,
-				DisableCompression: false,
+				Proxy:               http.ProxyFromEnvironment,
+				ForceAttemptHTTP2:   true,
+				DialContext:         (&net.Dialer{Timeout: 5 * time.Second, KeepAlive: 30 * time.Second}).DialContext,
+				MaxIdleConns:        32,
+				MaxIdleConnsPerHost: 16,
+				IdleConnTimeout:     90 * time.Second,
+				TLSHandshakeTimeout: 10 * time.Second,
+				DisableCompression:  false,
 			},
 		},
 	}
@@ -373,26 +386,36 @@ func (c *Client) convertSession(plexSess plexSession) media.Session {
 		if media.Bitrate > 0 {
 			bps = media.Bitrate * 1000
 		}
-		// If missing, derive from selected streams (sum of selected video+audio); fallback to max per type
+		// If missing, derive from selected streams (sum of selected video+audio); fallback to max per type.
+		// The same pass picks up the selected audio/subtitle details and counts subtitles.
 		var selVideoKbps, selAudioKbps int64
 		var maxVideoKbps, maxAudioKbps int64
-		if len(media.Part) > 0 {
-			for _, part := range media.Part {
-				for _, stream := range part.Stream {
-					if stream.StreamType == 1 { // video
-						if stream.Bitrate > maxVideoKbps {
-							maxVideoKbps = stream.Bitrate
-						}
-						if stream.Selected && stream.Bitrate > selVideoKbps {
-							selVideoKbps = stream.Bitrate
-						}
-					} else if stream.StreamType == 2 { // audio
-						if stream.Bitrate > maxAudioKbps {
-							maxAudioKbps = stream.Bitrate
-						}
-						if stream.Selected && stream.Bitrate > selAudioKbps {
+		for _, part := range media.Part {
+			for _, stream := range part.Stream {
+				switch stream.StreamType {
+				case 1: // Video
+					if stream.Bitrate > maxVideoKbps {
+						maxVideoKbps = stream.Bitrate
+					}
+					if stream.Selected && stream.Bitrate > selVideoKbps {
+						selVideoKbps = stream.Bitrate
+					}
+				case 2: // Audio
+					if stream.Bitrate > maxAudioKbps {
+						maxAudioKbps = stream.Bitrate
+					}
+					if stream.Selected {
+						if stream.Bitrate > selAudioKbps {
 							selAudioKbps = stream.Bitrate
 						}
+						session.AudioLanguage = stream.Language
+						session.AudioDefault = true
+					}
+				case 3: // Subtitle
+					session.SubtitleCount++
+					if stream.Selected {
+						session.SubtitleLanguage = stream.Language
+						session.SubtitleCodec = strings.ToUpper(stream.Codec)
 					}
 				}
 			}
@@ -420,24 +443,6 @@ func (c *Client) convertSession(plexSess plexSession) media.Session {
 			}
 		}
 
-		// Extract stream details
-		for _, part := range media.Part {
-			for _, stream := range part.Stream {
-				if stream.Selected {
-					switch stream.StreamType {
-					case 2: // Audio
-						session.AudioLanguage = stream.Language
-						session.AudioDefault = true
-					case 3: // Subtitle
-						session.SubtitleLanguage = stream.Language
-						session.SubtitleCodec = strings.ToUpper(stream.Codec)
-					}
-				}
-				if stream.StreamType == 3 { // Count subtitles
-					session.SubtitleCount++
-				}
-			}
-		}
 	}
 
 	// Handle transcode session
@@ -938,25 +943,12 @@ func (c *Client) generateCacheKey(ids []string) string {
 	return fmt.Sprintf("plex_items_%x", h.Sum(nil))
 }
 
-type cacheEntry struct {
-	data      []media.MediaItem
-	timestamp time.Time
-}
-
 func (c *Client) getCachedItems(cacheKey string) ([]media.MediaItem, bool) {
 	if cacheKey == "" {
 		return nil, false
 	}
 
-	if entry, exists := c.cache.Load(cacheKey); exists {
-		if cached, ok := entry.(cacheEntry); ok {
-			if time.Since(cached.timestamp) < c.cacheTTL {
-				return cached.data, true
-			}
-			c.cache.Delete(cacheKey)
-		}
-	}
-	return nil, false
+	return c.cache.Get(cacheKey)
 }
 
 func (c *Client) setCachedItems(cacheKey string, items []media.MediaItem) {
@@ -964,9 +956,5 @@ func (c *Client) setCachedItems(cacheKey string, items []media.MediaItem) {
 		return
 	}
 
-	entry := cacheEntry{
-		data:      items,
-		timestamp: time.Now(),
-	}
-	c.cache.Store(cacheKey, entry)
+	c.cache.Set(cacheKey, items)
 }
@@ -3,6 +3,11 @@ package queries
 import (
 	"context"
 	"database/sql"
+	"sort"
+	"sync"
+	"time"
+
+	dbutil "emby-analytics/internal/db"
 )
 
 type TopUserRow struct {
@@ -20,98 +25,263 @@ type TopItemRow struct {
 	Display string  `json:"display"`
 }
 
-// TopUsersByWatchSeconds calculates top users based on interval overlap in a time window.
-func TopUsersByWatchSeconds(ctx context.Context, db *sql.DB, winStart, winEnd int64, limit int) ([]TopUserRow, error) {
-	// Sum overlapped duration across all intervals in the window
-	query := `
+// windowWatchSeconds yields (user_id, item_id, seconds) rows covering a time
+// window. Whole days come from the play_daily_usage rollup (keyed on interval
+// start day); intervals that started before the first whole day but still
+// overlap the window are read from play_intervals and clipped to it exactly.
+// There is no lower bound on start_ts, since an interval can run for longer
+// than a day; idx_play_intervals_end_cover keeps the end_ts range cheap.
+// Arguments: firstFullDay, winEnd, winEnd, winStart, winStart, firstFullDay.
+const windowWatchSeconds = `
+        SELECT user_id, item_id, seconds
+        FROM play_daily_usage
+        WHERE day >= strftime('%Y-%m-%d', ?, 'unixepoch')
+          AND day <= strftime('%Y-%m-%d', ?, 'unixepoch')
+        UNION ALL
         SELECT
             l.user_id,
-            u.name,
-            u.server_id,
-            SUM(
-                MAX(
-                    0,
-                    MIN(
-                        MIN(l.end_ts, ?) - MAX(l.start_ts, ?),
-                        CASE WHEN l.duration_seconds IS NULL OR l.duration_seconds <= 0
-                             THEN (l.end_ts - l.start_ts)
-                             ELSE l.duration_seconds
-                        END
-                    )
+            l.item_id,
+            MAX(
+                0,
+                MIN(
+                    MIN(l.end_ts, ?) - MAX(l.start_ts, ?),
+                    CASE WHEN l.duration_seconds IS NULL OR l.duration_seconds <= 0
+                         THEN (l.end_ts - l.start_ts)
+                         ELSE l.duration_seconds
+                    END
                 )
-            ) / 3600.0 AS hours
+            )
         FROM play_intervals l
-        JOIN emby_user u ON u.id = l.user_id AND u.deleted_at IS NULL
-        JOIN library_item li ON li.id = l.item_id
-        WHERE
-            l.start_ts <= ? AND l.end_ts >= ?
-            AND COALESCE(li.media_type, 'Unknown') NOT IN ('TvChannel', 'LiveTv', 'Channel', 'TvProgram')
-        GROUP BY l.user_id, u.name, u.server_id
-        HAVING hours > 0
-        ORDER BY hours DESC
-        LIMIT ?;
+        WHERE l.end_ts >= ? AND l.start_ts < ?`
+
+// windowWatchArgs returns the bind arguments for windowWatchSeconds.
+func windowWatchArgs(winStart, winEnd int64) []any {
+	const day = 86400
+	firstFullDay := (winStart/day + 1) * day
+	return []any{firstFullDay, winEnd, winEnd, winStart, winStart, firstFullDay}
+}
+
+// WindowItemsQuery selects each item with watch time in a window, using the
+// same rollup-plus-overlap bounds as the top users and top items totals. Name
+// and media type are NULL when the item has no library_item row. Bind it with
+// WindowWatchArgs.
+const WindowItemsQuery = `
+        SELECT d.item_id, li.name, li.media_type
+        FROM (
+            SELECT DISTINCT item_id FROM (` + windowWatchSeconds + `)
+            WHERE seconds > 0
+        ) d
+        LEFT JOIN library_item li ON li.id = d.item_id`
+
+// WindowWatchArgs returns the bind arguments for WindowItemsQuery.
+func WindowWatchArgs(winStart, winEnd int64) []any {
+	return windowWatchArgs(winStart, winEnd)
+}
+
+// windowTotalsTTL bounds how long one window aggregation is shared. The
+// top-users and top-items panels load together, so both read the same
+// computation instead of each scanning the window.
+const windowTotalsTTL = 5 * time.Second
+
+// watchTotal is one (user, item) aggregate for a window, Live TV excluded.
+type watchTotal struct {
+	userID  string
+	itemID  string
+	name    string
+	typ     string
+	seconds float64
+}
+
+type windowTotalsEntry struct {
+	at    time.Time
+	rows  []watchTotal
+	err   error
+	ready chan struct{}
+	// stale is set under windowTotals.mu when a reset lands while the
+	// computation is still running; its result is then not reused.
+	stale bool
+}
+
+var windowTotals = struct {
+	mu      sync.Mutex
+	entries map[int64]*windowTotalsEntry
+}{entries: make(map[int64]*windowTotalsEntry)}
+
+// ResetWindowTotals drops shared window aggregations so the next request
+// recomputes them, e.g. after new intervals were written. Computations still
+// in flight finish for their own callers but are not kept.
+func ResetWindowTotals() {
+	windowTotals.mu.Lock()
+	for k, e := range windowTotals.entries {
+		select {
+		case <-e.ready:
+			delete(windowTotals.entries, k)
+		default:
+			e.stale = true
+		}
+	}
+	windowTotals.mu.Unlock()
+}
+
+// windowWatchTotals returns per-(user, item) watch seconds for the window.
+// Results are keyed by window length and reused for windowTotalsTTL;
+// concurrent callers wait for the computation already in flight.
+func windowWatchTotals(ctx context.Context, db *sql.DB, winStart, winEnd int64) ([]watchTotal, error) {
+	key := winEnd - winStart
+	windowTotals.mu.Lock()
+	if e, ok := windowTotals.entries[key]; ok {
+		windowTotals.mu.Unlock()
+		<-e.ready
+		windowTotals.mu.Lock()
+		if e.err == nil && !e.stale && time.Since(e.at) < windowTotalsTTL {
+			windowTotals.mu.Unlock()
+			return e.rows, nil
+		}
+		if cur, ok := windowTotals.entries[key]; ok && cur != e {
+			// Someone else already started a fresh computation.
+			windowTotals.mu.Unlock()
+			<-cur.ready
+			return cur.rows, cur.err
+		}
+	}
+	// Drop finished entries that have aged out; all-time windows end
+	// relative to now, so their keys are rarely reused.
+	for k, old := range windowTotals.entries {
+		select {
+		case <-old.ready:
+			if time.Since(old.at) >= windowTotalsTTL {
+				delete(windowTotals.entries, k)
+			}
+		default:
+		}
+	}
+	e := &windowTotalsEntry{ready: make(chan struct{})}
+	windowTotals.entries[key] = e
+	windowTotals.mu.Unlock()
+
+	// The result is shared, so one caller going away must not cancel it.
+	e.rows, e.err = queryWindowWatchTotals(context.WithoutCancel(ctx), db, winStart, winEnd)
+	e.at = time.Now()
+	close(e.ready)
+	windowTotals.mu.Lock()
+	if (e.err != nil || e.stale) && windowTotals.entries[key] == e {
+		delete(windowTotals.entries, key)
+	}
+	windowTotals.mu.Unlock()
+	return e.rows, e.err
+}
+
+// windowWatchTotalsQuery groups the window by (user, item), Live TV excluded.
+const windowWatchTotalsQuery = `
+        SELECT
+            w.user_id,
+            w.item_id,
+            COALESCE(li.name, ''),
+            COALESCE(li.media_type, ''),
+            SUM(w.seconds)
+        FROM (` + windowWatchSeconds + `) w
+        JOIN library_item li ON li.id = w.item_id
+        WHERE COALESCE(li.media_type, 'Unknown') NOT IN ('TvChannel', 'LiveTv', 'Channel', 'TvProgram')
+        GROUP BY w.user_id, w.item_id
+        HAVING SUM(w.seconds) > 0;
     `
-	rows, err := db.QueryContext(ctx, query, winEnd, winStart, winEnd, winStart, limit)
+
+func queryWindowWatchTotals(ctx context.Context, db *sql.DB, winStart, winEnd int64) ([]watchTotal, error) {
+	stmt, err := dbutil.Prepared(db, windowWatchTotalsQuery)
+	if err != nil {
+		return nil, err
+	}
+	rows, err := stmt.QueryContext(ctx, windowWatchArgs(winStart, winEnd)...)
 	if err != nil {
 		return nil, err
 	}
 	defer rows.Close()
 
-	var out []TopUserRow
+	var out []watchTotal
 	for rows.Next() {
-		var r TopUserRow
-		if err := rows.Scan(&r.UserID, &r.Name, &r.ServerID, &r.Hours); err != nil {
+		var t watchTotal
+		if err := rows.Scan(&t.userID, &t.itemID, &t.name, &t.typ, &t.seconds); err != nil {
 			return nil, err
 		}
-		out = append(out, r)
+		out = append(out, t)
 	}
 	return out, rows.Err()
 }
 
-// TopItemsByWatchSeconds calculates top items based on interval overlap.
-func TopItemsByWatchSeconds(ctx context.Context, db *sql.DB, winStart, winEnd int64, limit int) ([]TopItemRow, error) {
-	// Sum overlapped duration across all intervals in the window
-	query := `
-        SELECT
-            l.item_id,
-            li.name,
-            li.media_type,
-            SUM(
-                MAX(
-                    0,
-                    MIN(
-                        MIN(l.end_ts, ?) - MAX(l.start_ts, ?),
-                        CASE WHEN l.duration_seconds IS NULL OR l.duration_seconds <= 0
-                             THEN (l.end_ts - l.start_ts)
-                             ELSE l.duration_seconds
-                        END
-                    )
-                )
-            ) / 3600.0 AS hours
-        FROM play_intervals l
-        JOIN library_item li ON li.id = l.item_id
-        WHERE
-            l.start_ts <= ? AND l.end_ts >= ?
-            AND COALESCE(li.media_type, 'Unknown') NOT IN ('TvChannel', 'LiveTv', 'Channel', 'TvProgram')
-        GROUP BY l.item_id, li.name, li.media_type
-        HAVING hours > 0
-        ORDER BY hours DESC
-        LIMIT ?;
-    `
-	rows, err := db.QueryContext(ctx, query, winEnd, winStart, winEnd, winStart, limit)
+// TopUsersByWatchSeconds calculates top users based on watch time in a time window.
+func TopUsersByWatchSeconds(ctx context.Context, db *sql.DB, winStart, winEnd int64, limit int) ([]TopUserRow, error) {
+	totals, err := windowWatchTotals(ctx, db, winStart, winEnd)
+	if err != nil {
+		return nil, err
+	}
+	seconds := make(map[string]float64)
+	for _, t := range totals {
+		seconds[t.userID] += t.seconds
+	}
+	if len(seconds) == 0 {
+		return []TopUserRow{}, nil
+	}
+
+	stmt, err := dbutil.Prepared(db, `SELECT id, name, server_id FROM emby_user WHERE deleted_at IS NULL`)
+	if err != nil {
+		return nil, err
+	}
+	rows, err := stmt.QueryContext(ctx)
 	if err != nil {
 		return nil, err
 	}
 	defer rows.Close()
 
-	var out []TopItemRow
+	out := make([]TopUserRow, 0, len(seconds))
 	for rows.Next() {
-		var r TopItemRow
-		if err := rows.Scan(&r.ItemID, &r.Name, &r.Type, &r.Hours); err != nil {
+		var r TopUserRow
+		var serverID sql.NullString
+		if err := rows.Scan(&r.UserID, &r.Name, &serverID); err != nil {
 			return nil, err
 		}
-		r.Display = r.Name // You can add your episode enrichment logic here later
+		secs, ok := seconds[r.UserID]
+		if !ok {
+			continue
+		}
+		r.ServerID = serverID.String
+		r.Hours = secs / 3600.0
 		out = append(out, r)
 	}
-	return out, rows.Err()
+	if err := rows.Err(); err != nil {
+		return nil, err
+	}
+	sort.Slice(out, func(i, j int) bool { return out[i].Hours > out[j].Hours })
+	if len(out) > limit {
+		out = out[:limit]
+	}
+	return out, nil
+}
+
+// TopItemsByWatchSeconds calculates top items based on watch time in a time window.
+func TopItemsByWatchSeconds(ctx context.Context, db *sql.DB, winStart, winEnd int64, limit int) ([]TopItemRow, error) {
+	totals, err := windowWatchTotals(ctx, db, winStart, winEnd)
+	if err != nil {
+		return nil, err
+	}
+	byItem := make(map[string]int)
+	out := make([]TopItemRow, 0, min(len(totals), 64))
+	for _, t := range totals {
+		if i, ok := byItem[t.itemID]; ok {
+			out[i].Hours += t.seconds / 3600.0
+			continue
+		}
+		byItem[t.itemID] = len(out)
+		out = append(out, TopItemRow{
+			ItemID:  t.itemID,
+			Name:    t.name,
+			Type:    t.typ,
+			Hours:   t.seconds / 3600.0,
+			Display: t.name, // You can add your episode enrichment logic here later
+		})
+	}
+	sort.Slice(out, func(i, j int) bool { return out[i].Hours > out[j].Hours })
+	if len(out) > limit {
+		out = out[:limit]
+	}
+	return out, nil
 }
@@ -0,0 +1,80 @@
+package queries
+
+import (
+	"context"
+	"database/sql"
+	"math"
+	"path/filepath"
+	"testing"
+
+	dbutil "emby-analytics/internal/db"
+)
+
+func openTestDB(t *testing.T) *sql.DB {
+	t.Helper()
+	path := filepath.Join(t.TempDir(), "test.db")
+	if err := dbutil.MigrateUp("sqlite://file:" + filepath.ToSlash(path) + "?mode=rwc"); err != nil {
+		t.Fatalf("migrate: %v", err)
+	}
+	db, err := dbutil.Open(path)
+	if err != nil {
+		t.Fatalf("open: %v", err)
+	}
+	t.Cleanup(func() { _ = db.Close() })
+	return db
+}
+
+func TestTopUsersByWatchSecondsWindowEdges(t *testing.T) {
+	const day = 86400
+	winEnd := int64(20000*day + 5*3600)
+	winStart := winEnd - 7*day
+
+	tests := []struct {
+		name      string
+		start     int64
+		end       int64
+		wantHours float64 // 0 means the user must not be listed
+	}{
+		{"inside whole days", winStart + 2*day, winStart + 2*day + 1800, 0.5},
+		{"starts on boundary day", winStart - 3600, winStart + 3600, 1},
+		{"long interval straddles start", winStart - 3*day, winStart + 3600, 1},
+		{"ends before window", winStart - 3*day, winStart - day, 0},
+	}
+
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			db := openTestDB(t)
+			ResetWindowTotals()
+			mustExec(t, db, `INSERT INTO emby_user (id, name) VALUES ('u1', 'Ann')`)
+			mustExec(t, db, `INSERT INTO library_item (id, server_id, item_id, name, media_type) VALUES ('i1', 's1', 'i1', 'Film', 'Movie')`)
+			mustExec(t, db, `INSERT INTO play_sessions (id, user_id, session_id, item_id, started_at) VALUES (1, 'u1', 'sess', 'i1', ?)`, tt.start)
+			mustExec(t, db, `
+                INSERT INTO play_intervals (session_fk, item_id, user_id, start_ts, end_ts, duration_seconds)
+                VALUES (1, 'i1', 'u1', ?, ?, ?)`, tt.start, tt.end, tt.end-tt.start)
+
+			rows, err := TopUsersByWatchSeconds(context.Background(), db, winStart, winEnd, 10)
+			if err != nil {
+				t.Fatalf("TopUsersByWatchSeconds: %v", err)
+			}
+			if tt.wantHours == 0 {
+				if len(rows) != 0 {
+					t.Fatalf("expected no users, got %+v", rows)
+				}
+				return
+			}
+			if len(rows) != 1 {
+				t.Fatalf("expected 1 user, got %+v", rows)
+			}
+			if math.Abs(rows[0].Hours-tt.wantHours) > 1e-9 {
+				t.Errorf("expected %.2f hours, got %.4f", tt.wantHours, rows[0].Hours)
+			}
+		})
+	}
+}
+
+func mustExec(t *testing.T, db *sql.DB, query string, args ...any) {
+	t.Helper()
+	if _, err := db.Exec(query, args...); err != nil {
+		t.Fatalf("exec %q: %v", query, err)
+	}
+}
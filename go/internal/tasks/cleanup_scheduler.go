@@ -7,6 +7,7 @@ import (
 
 	"emby-analytics/internal/audit"
 	"emby-analytics/internal/cleanup"
+	dbutil "emby-analytics/internal/db"
 	"emby-analytics/internal/emby"
 	"emby-analytics/internal/logging"
 )
@@ -40,10 +41,16 @@ func (s *CleanupScheduler) Start() {
 	weeklyTicker := time.NewTicker(6 * time.Hour)
 	// Start session timeout sweeper
 	timeoutTicker := time.NewTicker(1 * time.Minute)
+	// Keep query planner statistics current as play data grows
+	optimizeTicker := time.NewTicker(1 * time.Hour)
+	// Bound the on-disk WAL between autocheckpoints
+	checkpointTicker := time.NewTicker(5 * time.Minute)
 
 	go func() {
 		defer weeklyTicker.Stop()
 		defer timeoutTicker.Stop()
+		defer optimizeTicker.Stop()
+		defer checkpointTicker.Stop()
 
 		// Run initial cleanup check after 5 minutes (let system stabilize)
 		initialTimer := time.NewTimer(5 * time.Minute)
@@ -67,6 +74,17 @@ func (s *CleanupScheduler) Start() {
 				}
 			case <-timeoutTicker.C:
 				s.intervalizer.TickTimeoutSweep()
+			case <-optimizeTicker.C:
+				if err := dbutil.Optimize(s.db); err != nil {
+					logging.Debug("PRAGMA optimize failed", "error", err)
+				}
+			case <-checkpointTicker.C:
+				busy, logPages, checkpointed, err := dbutil.CheckpointWAL(s.db)
+				if err != nil {
+					logging.Debug("WAL checkpoint failed", "error", err)
+				} else {
+					logging.Debug("WAL checkpoint", "busy", busy, "log_pages", logPages, "checkpointed", checkpointed)
+				}
 			}
 		}
 	}()
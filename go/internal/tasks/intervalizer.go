@@ -415,6 +415,8 @@ func (iz *Intervalizer) closeInterval(s *liveState, start time.Time, end time.Ti
     `, start.Unix(), end.Unix(), startPos, endPos, dur, boolToInt(seeked), s.SessionFK)
 	if err != nil {
 		logging.Debug("failed to insert interval: %v", err)
+	} else {
+		notifyWatchDataChanged()
 	}
 	s.IsIntervalOpen = false
 	s.HadAnyInterval = true
@@ -72,6 +72,7 @@ func IngestLibraries(db *sql.DB, mgr *media.MultiServerManager, include map[stri
 
 	// Post-ingestion cleanup: remove series that no longer have any episodes/items
 	CleanupOrphanedSeries(db)
+	notifyLibraryChanged()
 }
 
 func ingestEmbyLibrary(db *sql.DB, sc media.ServerConfig, client *media.EmbyAdapter) error {
@@ -1,7 +1,10 @@
 package tasks
 
 import (
+	"context"
 	"database/sql"
+	"database/sql/driver"
+	"errors"
 	"log"
 	"sync"
 	"time"
@@ -19,6 +22,31 @@ type SessionProcessor struct {
 	trackedSessions map[string]*TrackedSession // Internal "live list"
 	mu              sync.Mutex
 	Intervalizer    *Intervalizer
+	// writeConn is a dedicated pool connection reused across ticks so the
+	// per-connection page cache survives between polls. The main pool is sized
+	// with one extra connection to cover it.
+	writeConn *sql.Conn
+	// tickOpen is set while a BEGIN IMMEDIATE transaction is open on writeConn.
+	tickOpen bool
+	inTick   bool
+	// intervalsDirty records that this tick wrote play_intervals, so stats
+	// caches are invalidated once the tick commits.
+	intervalsDirty bool
+	// tickSessions and tickIntervals record rows this tick created, so a
+	// failed commit can forget ids that no longer exist.
+	tickSessions  []*TrackedSession
+	tickIntervals []*TrackedSession
+	// tickFinalized records sessions this tick finalized. They are already gone
+	// from trackedSessions, so a failed commit moves them to pendingFinal and
+	// the next tick writes them again.
+	tickFinalized []finalizedSession
+	pendingFinal  []finalizedSession
+}
+
+// finalizedSession is a session that ended at endTime.
+type finalizedSession struct {
+	tracked *TrackedSession
+	endTime time.Time
 }
 
 // TrackedSession represents a session we're tracking internally
@@ -54,6 +82,146 @@ func NewSessionProcessor(db *sql.DB, multiServerMgr *media.MultiServerManager) *
 	}
 }
 
+// writerConn returns the long-lived connection used for tick writes, acquiring
+// it on first use. Falls back to the pool if a dedicated connection can't be had.
+// Callers must hold sp.mu.
+func (sp *SessionProcessor) writerConn() dbutil.Querier {
+	if sp.writeConn != nil {
+		return sp.writeConn
+	}
+	conn, err := sp.DB.Conn(context.Background())
+	if err != nil {
+		log.Printf("[session-processor] Failed to acquire writer connection: %v", err)
+		return sp.DB
+	}
+	sp.writeConn = conn
+	return conn
+}
+
+// writer returns the target for tick writes. While a tick is running, the
+// first write opens a transaction on the writer connection and every later
+// write in the same tick joins it, so a poll costs one commit rather than one
+// per statement. Without a dedicated connection, writes go to the pool
+// unbatched. Callers must hold sp.mu.
+func (sp *SessionProcessor) writer() dbutil.Querier {
+	conn := sp.writerConn()
+	if !sp.inTick || sp.writeConn == nil || sp.tickOpen {
+		return conn
+	}
+	// BEGIN IMMEDIATE takes the write lock before the tick's first read. A
+	// deferred BEGIN would start with a read snapshot, and a commit from another
+	// connection before our first write would fail it with SQLITE_BUSY_SNAPSHOT,
+	// which busy_timeout cannot wait out.
+	if _, err := sp.writeConn.ExecContext(context.Background(), "BEGIN IMMEDIATE"); err != nil {
+		sp.checkWriteErr(err)
+		log.Printf("[session-processor] Failed to begin tick transaction: %v", err)
+		if sp.writeConn == nil {
+			return sp.DB
+		}
+		return sp.writeConn
+	}
+	sp.tickOpen = true
+	return sp.writeConn
+}
+
+// endTick commits the tick transaction, if one was opened.
+func (sp *SessionProcessor) endTick() {
+	sp.inTick = false
+	finalized := sp.tickFinalized
+	sp.tickFinalized = nil
+	if !sp.tickOpen {
+		return
+	}
+	sp.tickOpen = false
+	dirty := sp.intervalsDirty
+	sp.intervalsDirty = false
+	newSessions, newIntervals := sp.tickSessions, sp.tickIntervals
+	sp.tickSessions, sp.tickIntervals = nil, nil
+	if _, err := sp.writeConn.ExecContext(context.Background(), "COMMIT"); err != nil {
+		_, _ = sp.writeConn.ExecContext(context.Background(), "ROLLBACK")
+		sp.checkWriteErr(err)
+		log.Printf("[session-processor] Failed to commit tick writes: %v", err)
+		sp.forgetTickRows(newSessions, newIntervals, finalized)
+		return
+	}
+	if dirty {
+		notifyWatchDataChanged()
+	}
+}
+
+// forgetTickRows undoes in-memory state that pointed at rows from a rolled
+// back tick. Sessions created in the tick are dropped so the next poll starts
+// them again; intervals created in the tick are re-inserted on the next write,
+// which still carries the full accumulated duration. Sessions finalized in the
+// tick are queued to be finalized again, unless their row was created in the
+// same tick and no longer exists.
+func (sp *SessionProcessor) forgetTickRows(newSessions, newIntervals []*TrackedSession, finalized []finalizedSession) {
+	for _, tracked := range newIntervals {
+		tracked.CurrentIntervalID = 0
+	}
+	created := make(map[*TrackedSession]bool, len(newSessions))
+	for _, tracked := range newSessions {
+		created[tracked] = true
+		key := tracked.ServerID + "|" + tracked.SessionID
+		if sp.trackedSessions[key] == tracked {
+			delete(sp.trackedSessions, key)
+		}
+	}
+	requeued := 0
+	for _, f := range finalized {
+		if !created[f.tracked] {
+			sp.pendingFinal = append(sp.pendingFinal, f)
+			requeued++
+		}
+	}
+	if len(newSessions)+len(newIntervals)+requeued > 0 {
+		log.Printf("[session-processor] Reset %d session(s) and %d interval(s) from the failed tick; %d finalize(s) will be retried",
+			len(newSessions), len(newIntervals), requeued)
+	}
+}
+
+// intervalWritten notes a play_intervals write: immediately outside a tick,
+// or at commit time inside one.
+func (sp *SessionProcessor) intervalWritten() {
+	if sp.inTick {
+		sp.intervalsDirty = true
+		return
+	}
+	notifyWatchDataChanged()
+}
+
+// checkWriteErr drops the writer connection when it has gone bad so the next
+// tick reconnects instead of failing forever.
+func (sp *SessionProcessor) checkWriteErr(err error) {
+	if err == nil || sp.writeConn == nil {
+		return
+	}
+	if errors.Is(err, sql.ErrConnDone) || errors.Is(err, driver.ErrBadConn) {
+		if sp.tickOpen {
+			_, _ = sp.writeConn.ExecContext(context.Background(), "ROLLBACK")
+			sp.tickOpen = false
+			sp.forgetTickRows(sp.tickSessions, sp.tickIntervals, sp.tickFinalized)
+			sp.tickSessions, sp.tickIntervals, sp.tickFinalized = nil, nil, nil
+		}
+		_ = sp.writeConn.Close()
+		sp.writeConn = nil
+	}
+}
+
+// Close releases the writer connection back to the pool.
+func (sp *SessionProcessor) Close() {
+	sp.mu.Lock()
+	defer sp.mu.Unlock()
+	if sp.writeConn != nil {
+		if sp.tickOpen {
+			_, _ = sp.writeConn.ExecContext(context.Background(), "ROLLBACK")
+			sp.tickOpen = false
+		}
+		_ = sp.writeConn.Close()
+		sp.writeConn = nil
+	}
+}
+
 // ProcessActiveSessions implements the core algorithm from playback_reporting plugin
 func (sp *SessionProcessor) ProcessActiveSessions() {
 	// Get sessions from all enabled servers
@@ -69,11 +237,22 @@ func (sp *SessionProcessor) ProcessActiveSessions() {
 	sp.mu.Lock()
 	defer sp.mu.Unlock()
 
+	sp.inTick = true
+	defer sp.endTick()
+
 	logging.Debug("Session processor running", "active_sessions", len(activeSessions), "tracked_sessions", len(sp.trackedSessions))
 
 	currentTime := time.Now().UTC()
 	activeSessionMap := make(map[string]bool)
 
+	// Finalizes lost to a failed tick go first, so a session that is playing
+	// again this poll is reactivated after its old row is closed.
+	retry := sp.pendingFinal
+	sp.pendingFinal = nil
+	for _, f := range retry {
+		sp.finalizeSession(f.tracked, f.endTime)
+	}
+
 	// Step B: Process Active Sessions
 	for _, session := range activeSessions {
 		// Composite key to avoid collisions across servers
@@ -154,7 +333,7 @@ func (sp *SessionProcessor) startNewSession(session media.Session, startTime tim
 
 	// Add to tracked sessions
 	key := session.ServerID + "|" + session.SessionID
-	sp.trackedSessions[key] = &TrackedSession{
+	tracked := &TrackedSession{
 		SessionFK:         sessionFK,
 		SessionID:         session.SessionID,
 		ServerID:          session.ServerID,
@@ -168,6 +347,10 @@ func (sp *SessionProcessor) startNewSession(session media.Session, startTime tim
 		LastPaused:        session.IsPaused,
 		CurrentIntervalID: 0,
 	}
+	sp.trackedSessions[key] = tracked
+	if sp.tickOpen {
+		sp.tickSessions = append(sp.tickSessions, tracked)
+	}
 
 	log.Printf("[session-processor] Started tracking session %s (FK: %d)", session.SessionID, sessionFK)
 
@@ -179,45 +362,53 @@ func (sp *SessionProcessor) startNewSession(session media.Session, startTime tim
 func (sp *SessionProcessor) updateSessionDuration(tracked *TrackedSession, currentTime time.Time) {
 	duration := tracked.AccumulatedSec
 
-	_, err := dbutil.ExecWithRetry(sp.DB, `
+	_, err := dbutil.ExecWithRetry(sp.writer(), `
         UPDATE play_sessions 
         SET ended_at = ?, is_active = true 
         WHERE id = ?
     `, currentTime.Unix(), tracked.SessionFK)
 
 	if err != nil {
+		sp.checkWriteErr(err)
 		log.Printf("[session-processor] Failed to update session duration: %v", err)
 		return
 	}
 
 	// Create/update play interval
-	sp.createOrUpdateInterval(tracked, currentTime, duration)
+	sp.createOrUpdateInterval(tracked, currentTime, duration, false)
 }
 
 // finalizeSession performs final database updates when a session ends
 func (sp *SessionProcessor) finalizeSession(tracked *TrackedSession, endTime time.Time) {
 	duration := tracked.AccumulatedSec
+	if sp.inTick {
+		sp.tickFinalized = append(sp.tickFinalized, finalizedSession{tracked, endTime})
+	}
 
 	// Update play_session as ended
-	_, err := dbutil.ExecWithRetry(sp.DB, `
+	_, err := dbutil.ExecWithRetry(sp.writer(), `
 		UPDATE play_sessions 
 		SET ended_at = ?, is_active = false 
 		WHERE id = ?
 	`, endTime.Unix(), tracked.SessionFK)
 
 	if err != nil {
+		sp.checkWriteErr(err)
 		log.Printf("[session-processor] Failed to finalize session: %v", err)
 		return
 	}
 
 	// Create final play interval
-	sp.createOrUpdateInterval(tracked, endTime, duration)
+	sp.createOrUpdateInterval(tracked, endTime, duration, true)
 
 	log.Printf("[session-processor] Finalized session %s (total duration: %d seconds)", tracked.SessionID, duration)
 }
 
-// createOrUpdateInterval creates or updates a play interval
-func (sp *SessionProcessor) createOrUpdateInterval(tracked *TrackedSession, endTime time.Time, duration int) {
+// createOrUpdateInterval creates or updates a play interval. Stats caches are
+// invalidated when an interval is created or closed; extending a running one
+// every poll is left to the cache TTL, or any active playback would keep the
+// caches permanently empty.
+func (sp *SessionProcessor) createOrUpdateInterval(tracked *TrackedSession, endTime time.Time, duration int, closing bool) {
 	if duration < 1 {
 		return // Skip very short intervals
 	}
@@ -226,18 +417,29 @@ func (sp *SessionProcessor) createOrUpdateInterval(tracked *TrackedSession, endT
 	// - If we have a current interval for this tracked segment, update it
 	// - Otherwise, insert a new interval and remember its id
 	if tracked.CurrentIntervalID != 0 {
-		_, uerr := dbutil.ExecWithRetry(sp.DB, `
+		res, uerr := dbutil.ExecWithRetry(sp.writer(), `
             UPDATE play_intervals
             SET end_ts = ?, duration_seconds = ?
             WHERE id = ?
         `, endTime.Unix(), duration, tracked.CurrentIntervalID)
 		if uerr != nil {
+			sp.checkWriteErr(uerr)
 			log.Printf("[session-processor] Failed to update interval: %v", uerr)
+			return
 		}
-		return
+		if n, err := res.RowsAffected(); err == nil && n > 0 {
+			if closing {
+				sp.intervalWritten()
+			}
+			return
+		}
+		// The interval row is gone (e.g. cleaned up underneath us); insert a
+		// fresh one rather than updating nothing on every tick.
+		log.Printf("[session-processor] Interval %d for session %s no longer exists; re-inserting", tracked.CurrentIntervalID, tracked.SessionID)
+		tracked.CurrentIntervalID = 0
 	}
 
-	res, ierr := dbutil.ExecWithRetry(sp.DB, `
+	res, ierr := dbutil.ExecWithRetry(sp.writer(), `
         INSERT INTO play_intervals 
         (session_fk, item_id, user_id, start_ts, end_ts, start_pos_ticks, end_pos_ticks, duration_seconds, seeked, server_id)
         SELECT id, item_id, user_id, ?, ?, 0, 0, ?, 0, server_id
@@ -245,18 +447,28 @@ func (sp *SessionProcessor) createOrUpdateInterval(tracked *TrackedSession, endT
         WHERE id = ?
     `, tracked.StartTime.Unix(), endTime.Unix(), duration, tracked.SessionFK)
 	if ierr != nil {
+		sp.checkWriteErr(ierr)
 		log.Printf("[session-processor] Failed to insert interval: %v", ierr)
 		return
 	}
+	if n, err := res.RowsAffected(); err != nil || n == 0 {
+		log.Printf("[session-processor] No interval inserted for session %s: play_session %d not found", tracked.SessionID, tracked.SessionFK)
+		return
+	}
 	newID, _ := res.LastInsertId()
 	tracked.CurrentIntervalID = newID
+	if sp.tickOpen {
+		sp.tickIntervals = append(sp.tickIntervals, tracked)
+	}
+	sp.intervalWritten()
 }
 
 // createPlaySession creates a new play_session record in the database
 func (sp *SessionProcessor) createPlaySession(session media.Session, startTime time.Time) (int64, error) {
 	// Check if a session already exists for this (server_id, session_id, item_id)
+	w := sp.writer()
 	var existingID int64
-	err := dbutil.QueryRowWithRetry(sp.DB,
+	err := dbutil.QueryRowWithRetry(w,
 		`SELECT id FROM play_sessions WHERE server_id=? AND session_id=? AND item_id=?`,
 		[]any{session.ServerID, session.SessionID, session.ItemID},
 		func(row *sql.Row) error { return row.Scan(&existingID) },
@@ -269,7 +481,7 @@ func (sp *SessionProcessor) createPlaySession(session media.Session, startTime t
 		videoTo := strings.ToUpper(session.TranscodeVideoCodec)
 		audioFrom := strings.ToUpper(session.AudioCodec)
 		audioTo := strings.ToUpper(session.TranscodeAudioCodec)
-		_, _ = dbutil.ExecWithRetry(sp.DB, `
+		_, _ = dbutil.ExecWithRetry(w, `
             UPDATE play_sessions 
             SET is_active = true, ended_at = NULL,
                 play_method = ?,
@@ -286,6 +498,7 @@ func (sp *SessionProcessor) createPlaySession(session media.Session, startTime t
 		return existingID, nil
 	}
 	if err != nil && err != sql.ErrNoRows {
+		sp.checkWriteErr(err)
 		return 0, err
 	}
 
@@ -294,7 +507,7 @@ func (sp *SessionProcessor) createPlaySession(session media.Session, startTime t
 	videoTo := strings.ToUpper(session.TranscodeVideoCodec)
 	audioFrom := strings.ToUpper(session.AudioCodec)
 	audioTo := strings.ToUpper(session.TranscodeAudioCodec)
-	res, ierr := dbutil.ExecWithRetry(sp.DB, `
+	res, ierr := dbutil.ExecWithRetry(w, `
         INSERT INTO play_sessions
         (user_id, user_name, session_id, device_id, client_name, item_id, item_name, item_type,
          play_method, started_at, is_active, transcode_reasons, remote_address,
@@ -308,6 +521,7 @@ func (sp *SessionProcessor) createPlaySession(session media.Session, startTime t
 		session.ServerID, string(session.ServerType))
 
 	if ierr != nil {
+		sp.checkWriteErr(ierr)
 		return 0, ierr
 	}
 
@@ -1,6 +1,7 @@
 package tasks
 
 import (
+	"context"
 	"database/sql"
 	"errors"
 	"fmt"
@@ -8,6 +9,7 @@ import (
 	"time"
 
 	"emby-analytics/internal/config"
+	dbutil "emby-analytics/internal/db"
 	"emby-analytics/internal/handlers/settings"
 	"emby-analytics/internal/logging"
 	"emby-analytics/internal/media"
@@ -72,7 +74,6 @@ func runSyncFiltered(db *sql.DB, mgr *media.MultiServerManager, cfg config.Confi
 	// Sync users first to ensure we have up-to-date user info and track deletions
 	runUserSync(db, mgr)
 
-	totalInserted := 0
 	totalAPICalls := 0
 	start := time.Now()
 
@@ -101,8 +102,7 @@ func runSyncFiltered(db *sql.DB, mgr *media.MultiServerManager, cfg config.Confi
 		logging.Debug("play sync started", "server", sc.Name, "server_id", sc.ID)
 		SetServerSyncStage(serverID, "Collecting playback history...")
 
-		inserted, apiCalls, err := syncServer(db, client, sc, cfg)
-		totalInserted += inserted
+		apiCalls, err := syncServer(db, client, sc, cfg)
 		totalAPICalls += apiCalls
 		switch {
 		case err == nil:
@@ -116,21 +116,21 @@ func runSyncFiltered(db *sql.DB, mgr *media.MultiServerManager, cfg config.Confi
 	}
 
 	dur := time.Since(start)
-	if totalInserted > 0 || totalAPICalls > 0 {
-		logging.Debug("play sync completed", "duration", dur.Round(time.Millisecond), "api_calls", totalAPICalls, "events", totalInserted)
+	if totalAPICalls > 0 {
+		logging.Debug("play sync completed", "duration", dur.Round(time.Millisecond), "api_calls", totalAPICalls)
 	}
+	notifyLibraryChanged()
 }
 
 func shouldSyncServer(db *sql.DB, sc media.ServerConfig) bool {
 	return settings.GetSyncEnabled(db, sc.ID, sc.Enabled)
 }
 
-func syncServer(db *sql.DB, client media.MediaServerClient, sc media.ServerConfig, cfg config.Config) (int, int, error) {
+func syncServer(db *sql.DB, client media.MediaServerClient, sc media.ServerConfig, cfg config.Config) (int, error) {
 	serverID := client.GetServerID()
 	serverType := client.GetServerType()
 	serverName := client.GetServerName()
 
-	insertedEvents := 0
 	apiCalls := 0
 
 	checkCancelled := func() bool {
@@ -146,7 +146,7 @@ func syncServer(db *sql.DB, client media.MediaServerClient, sc media.ServerConfi
 	}
 	if checkCancelled() {
 		CancelServerSyncProgress(serverID, "Sync cancelled by user")
-		return insertedEvents, apiCalls, ErrSyncCancelled
+		return apiCalls, ErrSyncCancelled
 	}
 
 	// Step 1: Active sessions snapshot
@@ -158,16 +158,9 @@ func syncServer(db *sql.DB, client media.MediaServerClient, sc media.ServerConfi
 		for idx, s := range sessions {
 			if idx%cancelCheckInterval == 0 && checkCancelled() {
 				CancelServerSyncProgress(serverID, "Sync cancelled by user")
-				return insertedEvents, apiCalls, ErrSyncCancelled
+				return apiCalls, ErrSyncCancelled
 			}
 			upsertUserAndItem(db, serverID, serverType, s.UserID, s.UserName, s.ItemID, s.ItemName, s.ItemType)
-
-			posMs := clampPositionMs(s.PositionMs, s.DurationMs)
-			storedUserID := storageUserID(serverID, s.UserID)
-			storedItemID := storageItemID(serverID, s.ItemID)
-			if insertPlayEvent(db, storedUserID, storedItemID, posMs) {
-				insertedEvents++
-			}
 		}
 	}
 
@@ -176,20 +169,19 @@ func syncServer(db *sql.DB, client media.MediaServerClient, sc media.ServerConfi
 	apiCalls++
 	if err != nil {
 		logging.Debug("play sync: failed to fetch users", "server", serverName, "error", err)
-		return insertedEvents, apiCalls, err
+		return apiCalls, err
 	}
 
 	for idx, user := range users {
 		if idx%cancelCheckInterval == 0 && checkCancelled() {
 			CancelServerSyncProgress(serverID, "Sync cancelled by user")
-			return insertedEvents, apiCalls, ErrSyncCancelled
+			return apiCalls, ErrSyncCancelled
 		}
 		remoteUserID := user.ID
 		if strings.TrimSpace(remoteUserID) == "" {
 			continue
 		}
 
-		storedUserID := storageUserID(serverID, remoteUserID)
 		upsertUserAndItem(db, serverID, serverType, remoteUserID, user.Name, "", "", "")
 
 		history, err := client.GetUserPlayHistory(remoteUserID, historyDays)
@@ -199,25 +191,21 @@ func syncServer(db *sql.DB, client media.MediaServerClient, sc media.ServerConfi
 			continue
 		}
 
-		for hIdx, h := range history {
-			if hIdx%cancelCheckInterval == 0 && checkCancelled() {
-				CancelServerSyncProgress(serverID, "Sync cancelled by user")
-				return insertedEvents, apiCalls, ErrSyncCancelled
-			}
-			if strings.TrimSpace(h.ID) == "" {
-				continue
-			}
-			upsertUserAndItem(db, serverID, serverType, remoteUserID, user.Name, h.ID, h.Name, h.Type)
-
-			storedItemID := storageItemID(serverID, h.ID)
-			eventTime := parseEventTime(h.DatePlayed)
-			posMs := h.PlaybackPos
-			if posMs < 0 {
-				posMs = 0
-			}
-			if insertPlayEventWithTimestamp(db, storedUserID, storedItemID, posMs, eventTime) {
-				insertedEvents++
+		// The user row was written above; the history only adds items, all
+		// in one transaction.
+		cancelled := false
+		inTx(db, func(ex dbutil.Execer) {
+			for hIdx, h := range history {
+				if hIdx%cancelCheckInterval == 0 && checkCancelled() {
+					cancelled = true
+					return
+				}
+				upsertItem(ex, serverID, serverType, h.ID, h.Name, h.Type)
 			}
+		})
+		if cancelled {
+			CancelServerSyncProgress(serverID, "Sync cancelled by user")
+			return apiCalls, ErrSyncCancelled
 		}
 	}
 
@@ -227,77 +215,63 @@ func syncServer(db *sql.DB, client media.MediaServerClient, sc media.ServerConfi
 		}
 	}
 
-	return insertedEvents, apiCalls, nil
+	return apiCalls, nil
 }
 
-func clampPositionMs(posMs, durationMs int64) int64 {
-	if posMs < 0 {
-		return 0
-	}
-	if durationMs > 0 && posMs > durationMs {
-		return durationMs
-	}
-	return posMs
+func upsertUserAndItem(ex dbutil.Execer, serverID string, serverType media.ServerType, userID, userName, itemID, itemName, itemType string) {
+	upsertUser(ex, serverID, serverType, userID, userName)
+	upsertItem(ex, serverID, serverType, itemID, itemName, itemType)
 }
 
-func parseEventTime(value string) int64 {
-	if strings.TrimSpace(value) == "" {
-		return time.Now().UnixMilli()
-	}
-	if t, err := time.Parse(time.RFC3339, value); err == nil {
-		return t.UnixMilli()
-	}
-	if t, err := time.Parse("2006-01-02T15:04:05", value); err == nil {
-		return t.UnixMilli()
+func upsertUser(ex dbutil.Execer, serverID string, serverType media.ServerType, userID, userName string) {
+	storedUserID := storageUserID(serverID, userID)
+	if strings.TrimSpace(storedUserID) == "" {
+		return
 	}
-	return time.Now().UnixMilli()
+	_, _ = ex.ExecContext(context.Background(), `
+		INSERT INTO emby_user (id, server_id, server_type, name)
+		VALUES (?, ?, ?, ?)
+		ON CONFLICT(id) DO UPDATE SET
+			name = excluded.name,
+			server_id = excluded.server_id,
+			server_type = excluded.server_type
+		WHERE emby_user.name IS NOT excluded.name
+			OR emby_user.server_id IS NOT excluded.server_id
+			OR emby_user.server_type IS NOT excluded.server_type
+	`, storedUserID, serverID, string(serverType), userName)
 }
 
-func insertPlayEvent(db *sql.DB, userID, itemID string, posMs int64) bool {
-	ts := time.Now().UnixMilli()
-	res, err := db.Exec(`INSERT INTO play_event (ts, user_id, item_id, pos_ms) VALUES (?, ?, ?, ?)`, ts, userID, itemID, posMs)
-	if err != nil {
-		return false
+func upsertItem(ex dbutil.Execer, serverID string, serverType media.ServerType, itemID, itemName, itemType string) {
+	storedItemID := storageItemID(serverID, itemID)
+	if strings.TrimSpace(storedItemID) == "" {
+		return
 	}
-	rows, _ := res.RowsAffected()
-	return rows > 0
+	_, _ = ex.ExecContext(context.Background(), `
+		INSERT INTO library_item (id, server_id, server_type, item_id, name, media_type, updated_at)
+		VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+		ON CONFLICT(id) DO UPDATE SET
+			server_id = excluded.server_id,
+			server_type = excluded.server_type,
+			item_id = excluded.item_id,
+			name = COALESCE(excluded.name, library_item.name),
+			media_type = COALESCE(excluded.media_type, library_item.media_type),
+			updated_at = CURRENT_TIMESTAMP
+	`, storedItemID, serverID, string(serverType), itemID, itemName, itemType)
 }
 
-func insertPlayEventWithTimestamp(db *sql.DB, userID, itemID string, posMs int64, timestamp int64) bool {
-	res, err := db.Exec(`INSERT OR IGNORE INTO play_event (ts, user_id, item_id, pos_ms) VALUES (?, ?, ?, ?)`, timestamp, userID, itemID, posMs)
+// inTx runs fn inside a single transaction so a batch of upserts costs one
+// commit instead of one per row. If no transaction can be opened the writes
+// go straight to db.
+func inTx(db *sql.DB, fn func(ex dbutil.Execer)) {
+	tx, err := db.Begin()
 	if err != nil {
-		return false
-	}
-	rows, _ := res.RowsAffected()
-	return rows > 0
-}
-
-func upsertUserAndItem(db *sql.DB, serverID string, serverType media.ServerType, userID, userName, itemID, itemName, itemType string) {
-	storedUserID := storageUserID(serverID, userID)
-	if strings.TrimSpace(storedUserID) != "" {
-		_, _ = db.Exec(`
-			INSERT INTO emby_user (id, server_id, server_type, name)
-			VALUES (?, ?, ?, ?)
-			ON CONFLICT(id) DO UPDATE SET
-				name = excluded.name,
-				server_id = excluded.server_id,
-				server_type = excluded.server_type
-		`, storedUserID, serverID, string(serverType), userName)
+		fn(db)
+		return
 	}
-
-	storedItemID := storageItemID(serverID, itemID)
-	if strings.TrimSpace(storedItemID) != "" {
-		_, _ = db.Exec(`
-			INSERT INTO library_item (id, server_id, server_type, item_id, name, media_type, updated_at)
-			VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-			ON CONFLICT(id) DO UPDATE SET
-				server_id = excluded.server_id,
-				server_type = excluded.server_type,
-				item_id = excluded.item_id,
-				name = COALESCE(excluded.name, library_item.name),
-				media_type = COALESCE(excluded.media_type, library_item.media_type),
-				updated_at = CURRENT_TIMESTAMP
-		`, storedItemID, serverID, string(serverType), itemID, itemName, itemType)
+	fn(tx)
+	if err := tx.Commit(); err != nil {
+		_ = tx.Rollback()
+		logging.Debug("sync: batch commit failed", "error", err)
 	}
 }
 
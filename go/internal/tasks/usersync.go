@@ -3,9 +3,11 @@ package tasks
 import (
 	"database/sql"
 	"strings"
+	"sync"
 	"time"
 
 	"emby-analytics/internal/config"
+	dbutil "emby-analytics/internal/db"
 	"emby-analytics/internal/handlers/settings"
 	"emby-analytics/internal/logging"
 	"emby-analytics/internal/media"
@@ -25,7 +27,11 @@ func StartUserSyncLoop(db *sql.DB, mgr *media.MultiServerManager, cfg config.Con
 		defer ticker.Stop()
 		for {
 			<-ticker.C
+			start := time.Now()
 			runUserSync(db, mgr)
+			if time.Since(start) >= interval {
+				ticker.Reset(interval)
+			}
 		}
 	}()
 }
@@ -64,8 +70,12 @@ func runUserSync(db *sql.DB, mgr *media.MultiServerManager) {
 	}
 
 	logging.Debug("user sync completed", "duration", time.Since(start).Round(time.Millisecond), "servers", len(clients), "users_processed", totalUsers)
+	notifyLibraryChanged()
 }
 
+// userSyncParallel bounds concurrent watch-data fetches per server.
+const userSyncParallel = 4
+
 func syncServerUsers(db *sql.DB, client media.MediaServerClient, sc media.ServerConfig) int {
 	users, err := client.GetUsers()
 	if err != nil {
@@ -73,7 +83,10 @@ func syncServerUsers(db *sql.DB, client media.MediaServerClient, sc media.Server
 		return 0
 	}
 
-	processed := 0
+	type pendingUser struct {
+		remoteID, storedID, name string
+	}
+	var pending []pendingUser
 	for _, u := range users {
 		remoteID := strings.TrimSpace(u.ID)
 		if remoteID == "" {
@@ -87,19 +100,55 @@ func syncServerUsers(db *sql.DB, client media.MediaServerClient, sc media.Server
 				name = excluded.name,
 				server_id = excluded.server_id,
 				server_type = excluded.server_type
+			WHERE emby_user.name IS NOT excluded.name
+				OR emby_user.server_id IS NOT excluded.server_id
+				OR emby_user.server_type IS NOT excluded.server_type
 		`, storedID, sc.ID, string(sc.Type), u.Name)
 		if err != nil {
 			logging.Debug("user sync: failed to upsert user", "server", sc.Name, "user", u.Name, "error", err)
 			continue
 		}
-		processed++
-		syncUserWatchData(db, client, sc, remoteID, storedID, u.Name)
+		pending = append(pending, pendingUser{remoteID: remoteID, storedID: storedID, name: u.Name})
+	}
+
+	// Watch data is fetched for several users at once since the media server
+	// round trips dominate; results are written back one user at a time.
+	type userWatchData struct {
+		pendingUser
+		items []media.UserDataItem
+		err   error
+	}
+	results := make(chan userWatchData)
+	sem := make(chan struct{}, userSyncParallel)
+	go func() {
+		var wg sync.WaitGroup
+		for _, p := range pending {
+			wg.Add(1)
+			sem <- struct{}{}
+			go func(p pendingUser) {
+				defer wg.Done()
+				defer func() { <-sem }()
+				items, err := client.GetUserData(p.remoteID)
+				results <- userWatchData{pendingUser: p, items: items, err: err}
+			}(p)
+		}
+		wg.Wait()
+		close(results)
+	}()
+
+	includeTrakt := settings.GetSettingBool(db, "include_trakt_items", false)
+	for r := range results {
+		if r.err != nil {
+			logging.Debug("user sync: failed to get watch data", "server", sc.Name, "user", r.name, "error", r.err)
+			continue
+		}
+		storeUserWatchData(db, sc, r.storedID, r.name, r.items, includeTrakt)
 	}
 
 	// Mark users that no longer exist on server as deleted
 	markDeletedUsers(db, sc.ID, users)
 
-	return processed
+	return len(pending)
 }
 
 // markDeletedUsers sets deleted_at for users in DB that are not in the server's user list
@@ -146,45 +195,41 @@ func markDeletedUsers(db *sql.DB, serverID string, liveUsers []media.User) {
 	}
 }
 
-func syncUserWatchData(db *sql.DB, client media.MediaServerClient, sc media.ServerConfig, remoteUserID, storedUserID, userName string) {
-	items, err := client.GetUserData(remoteUserID)
-	if err != nil {
-		logging.Debug("user sync: failed to get watch data", "server", sc.Name, "user", userName, "error", err)
-		return
-	}
-
-	includeTrakt := settings.GetSettingBool(db, "include_trakt_items", false)
-
+func storeUserWatchData(db *sql.DB, sc media.ServerConfig, storedUserID, userName string, items []media.UserDataItem, includeTrakt bool) {
 	var embyWatchMs, traktWatchMs, totalWatchMs int64
 	var traktItems, embyItems int
 
-	for _, item := range items {
-		if !item.Played || item.RuntimeMs <= 0 {
-			continue
-		}
-		// Detect Trakt-synced entries (no playback evidence)
-		hasLastPlayed := strings.TrimSpace(item.LastPlayed) != ""
-		hasPlaybackPosition := item.PlaybackPositionMs > 0
-		hasPlayCount := item.PlayCount > 0
-		isTrakt := !hasLastPlayed && !hasPlaybackPosition && !hasPlayCount
-
-		watchTimeMs := item.RuntimeMs
-
-		if isTrakt {
-			traktItems++
-			traktWatchMs += watchTimeMs
-			if includeTrakt {
+	// The user row is written by the caller; item metadata for the whole
+	// list goes in one transaction.
+	inTx(db, func(ex dbutil.Execer) {
+		for _, item := range items {
+			if !item.Played || item.RuntimeMs <= 0 {
+				continue
+			}
+			// Detect Trakt-synced entries (no playback evidence)
+			hasLastPlayed := strings.TrimSpace(item.LastPlayed) != ""
+			hasPlaybackPosition := item.PlaybackPositionMs > 0
+			hasPlayCount := item.PlayCount > 0
+			isTrakt := !hasLastPlayed && !hasPlaybackPosition && !hasPlayCount
+
+			watchTimeMs := item.RuntimeMs
+
+			if isTrakt {
+				traktItems++
+				traktWatchMs += watchTimeMs
+				if includeTrakt {
+					totalWatchMs += watchTimeMs
+				}
+			} else {
+				embyItems++
+				embyWatchMs += watchTimeMs
 				totalWatchMs += watchTimeMs
 			}
-		} else {
-			embyItems++
-			embyWatchMs += watchTimeMs
-			totalWatchMs += watchTimeMs
-		}
 
-		// Ensure library item metadata is present for aggregated stats
-		upsertUserAndItem(db, sc.ID, sc.Type, remoteUserID, userName, item.ID, item.Name, item.Type)
-	}
+			// Ensure library item metadata is present for aggregated stats
+			upsertItem(ex, sc.ID, sc.Type, item.ID, item.Name, item.Type)
+		}
+	})
 
 	if traktItems > 0 || embyItems > 0 {
 		logging.Debug("[usersync] processed user items",
@@ -195,7 +240,7 @@ func syncUserWatchData(db *sql.DB, client media.MediaServerClient, sc media.Serv
 			"include_trakt", includeTrakt)
 	}
 
-	_, err = db.Exec(`
+	_, err := db.Exec(`
 		INSERT INTO lifetime_watch (user_id, total_ms, emby_ms, trakt_ms)
 		VALUES (?, ?, ?, ?)
 		ON CONFLICT(user_id) DO UPDATE SET
@@ -0,0 +1,44 @@
+package tasks
+
+import "sync/atomic"
+
+// watchDataChanged is called after play_intervals rows are written, so
+// caches of watch-time aggregates can be dropped early. It is a hook rather
+// than a direct call because the stats handlers import this package.
+var watchDataChanged atomic.Pointer[func()]
+
+// SetWatchDataChangedHook registers fn to run whenever recorded watch time
+// changes. Passing nil removes the hook.
+func SetWatchDataChangedHook(fn func()) {
+	if fn == nil {
+		watchDataChanged.Store(nil)
+		return
+	}
+	watchDataChanged.Store(&fn)
+}
+
+func notifyWatchDataChanged() {
+	if fn := watchDataChanged.Load(); fn != nil {
+		(*fn)()
+	}
+}
+
+// libraryChanged is called after a sync or library ingest finishes, so
+// summary counts over users and items can be recomputed.
+var libraryChanged atomic.Pointer[func()]
+
+// SetLibraryChangedHook registers fn to run after user, play history or
+// library syncs complete. Passing nil removes the hook.
+func SetLibraryChangedHook(fn func()) {
+	if fn == nil {
+		libraryChanged.Store(nil)
+		return
+	}
+	libraryChanged.Store(&fn)
+}
+
+func notifyLibraryChanged() {
+	if fn := libraryChanged.Load(); fn != nil {
+		(*fn)()
+	}
+}